@@ -1,67 +1,24 @@
 import os
 import sys
-import pandas as pd
-import numpy as np
-import joblib
 from flask import Flask, render_template, request, jsonify
-from datetime import datetime
 
 # Add project root to path for imports
 project_root = os.path.dirname(os.path.abspath(__file__))
 if project_root not in sys.path:
     sys.path.append(project_root)
 
+# Model holder, encoding, scoring and response helpers (shared with asgi_app.py)
+from src.inference import (
+    model_holder, prediction_cache, single_row_model, preprocess_input, predict_proba, describe_prediction,
+    model_not_ready, parse_batch_body, score_batch, observe_drift, drift_monitors, process_info, MAX_BATCH_SIZE
+)
+from src.input_schema import InputValidationError
+from src.logger import logging_stats
+
 app = Flask(__name__, template_folder='template', static_folder='static')
 
-# Constants & Paths
-MODEL_PATH = "artifacts/model/model.joblib"
-
-# Mappings for categorical variables (Alphabetical order as per LabelEncoder)
-MAPPINGS = {
-    'type_of_meal': ['Meal Plan 1', 'Meal Plan 2', 'Meal Plan 3', 'Not Selected'],
-    'room_type': ['Room_Type 1', 'Room_Type 2', 'Room_Type 3', 'Room_Type 4', 'Room_Type 5', 'Room_Type 6', 'Room_Type 7'],
-    'market_segment_type': ['Aviation', 'Complementary', 'Corporate', 'Offline', 'Online']
-}
-
-def preprocess_input(data):
-    """
-    Transforms raw form data into model-ready features.
-    Matches the 10 features selected during training.
-    """
-    # Map form data to model features
-    features = {
-        'lead_time': int(data.get('lead time', 0)),
-        'average_price': float(data.get('average price', 0)),
-        'special_requests': int(data.get('special requests', 0)),
-        'number_of_week_nights': int(data.get('number of week nights', 0)),
-        'number_of_weekend_nights': int(data.get('number of weekend nights', 0)),
-        'market_segment_type': data.get('market segment type', 'Online'),
-        'room_type': data.get('room type', 'Room_Type 1'),
-        'number_of_adults': int(data.get('number of adults', 2)),
-        'type_of_meal': data.get('type of meal', 'Meal Plan 1'),
-        'car_parking_space': int(data.get('car parking space', 0))
-    }
-    
-    proc_df = pd.DataFrame([features])
-    
-    # Apply Label Encoding (Manual mapping to match LabelEncoder)
-    for col, classes in MAPPINGS.items():
-        if col in proc_df.columns:
-            try:
-                proc_df[col] = classes.index(proc_df[col])
-            except ValueError:
-                proc_df[col] = -1 # Handle unknown
-    
-    # Re-order columns to match the exact order expected by the model
-    # ['lead_time', 'average_price', 'special_requests', 'number_of_week_nights', 'number_of_weekend_nights', 'market_segment_type', 'room_type', 'number_of_adults', 'type_of_meal', 'car_parking_space']
-    feature_order = [
-        'lead_time', 'average_price', 'special_requests', 'number_of_week_nights',
-        'number_of_weekend_nights', 'market_segment_type', 'room_type',
-        'number_of_adults', 'type_of_meal', 'car_parking_space'
-    ]
-    proc_df = proc_df[feature_order]
-    
-    return proc_df
+def read_batch_records():
+    return parse_batch_body(request.get_data(cache=False), request.mimetype)
 
 @app.route('/')
 def index():
@@ -70,44 +27,67 @@ def index():
 @app.route('/predict', methods=['POST'])
 def predict():
     try:
-        if not os.path.exists(MODEL_PATH):
-            return jsonify({
-                'success': False,
-                'error': 'Model file not found. Please run the training pipeline first.'
-            })
+        # Batches stay on the LightGBM booster, which is faster for many rows
+        model, encoder, model_meta = single_row_model()
+        error = model_not_ready(model, encoder)
+        if error:
+            return jsonify({'success': False, 'error': error})
 
         data = request.json
-        processed_data = preprocess_input(data)
-        
-        # Load model
-        model = joblib.load(MODEL_PATH)
-        
-        # Prediction
-        prediction = model.predict(processed_data)[0]
-        
-        # Get Probabilities
-        if hasattr(model, 'predict_proba'):
-            probs = model.predict_proba(processed_data)[0]
-            # Mapping depends on internal class order: 0: Not_Canceled, 1: Canceled
-            prob_not_canceled = probs[0]
-            prob_canceled = probs[1]
-        else:
-            prob_not_canceled = 0.9 if prediction == 0 else 0.1
-            prob_canceled = 1 - prob_not_canceled
+        processed_data = preprocess_input(data, encoder)
+        cache_key = prediction_cache.key(processed_data[0])
+        probs = prediction_cache.get(model_meta['version'], cache_key)
+        if probs is None:
+            probs = predict_proba(model, processed_data)[0]
+            prediction_cache.put(model_meta['version'], cache_key, probs)
+        observe_drift(model, encoder, model_meta, [data], probs)
 
         result = {
             'success': True,
-            'prediction': 'Canceled' if prediction == 1 else 'Not_Canceled',
-            'probabilities': {
-                'not_canceled': float(prob_not_canceled),
-                'canceled': float(prob_canceled)
-            }
+            **describe_prediction(model, encoder, probs, model_meta),
+            'model_version': model_meta['version']
         }
         return jsonify(result)
 
+    except InputValidationError as e:
+        return jsonify({'success': False, 'error': str(e), 'errors': e.errors})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    try:
+        model, encoder, model_meta = model_holder.get()
+        error = model_not_ready(model, encoder)
+        if error:
+            return jsonify({'success': False, 'error': error})
+
+        records = read_batch_records()
+        if len(records) > MAX_BATCH_SIZE:
+            return jsonify({
+                'success': False,
+                'error': f'Batch too large, at most {MAX_BATCH_SIZE} records per request'
+            }), 413
+
+        return jsonify(score_batch(model, encoder, model_meta, records))
+
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/model_info', methods=['GET'])
+def model_info():
+    return jsonify({
+        **model_holder.info(),
+        'prediction_cache': prediction_cache.stats(),
+        'logging': logging_stats(),
+        'process': process_info()
+    })
+
+@app.route('/drift', methods=['GET'])
+def drift():
+    # Drift scores of the process that answers; each worker monitors its own traffic
+    return jsonify(drift_monitors.report())
+
 if __name__ == '__main__':
     # Use port 5000 as requested
     app.run(debug=True, port=5000)
@@ -0,0 +1,118 @@
+import os
+import sys
+from contextlib import asynccontextmanager
+import numpy as np
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+# Add project root to path for imports
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Same model holder, encoding and response helpers as the Flask app, without importing Flask
+from src.inference import (
+    model_holder, prediction_cache, single_row_model, preprocess_input, predict_proba, describe_prediction, model_not_ready,
+    parse_batch_body, score_batch, observe_drift, drift_monitors, process_info, MAX_BATCH_SIZE
+)
+from src.input_schema import InputValidationError
+from src.logger import logging_stats
+from src.micro_batcher import MicroBatcher
+
+MICRO_BATCH_SIZE = 64
+MICRO_BATCH_WAIT_MS = 2  # longest a /predict row waits for others to share its batch
+
+def score_rows(items):
+    """Scores (model, feature row) pairs with one predict_proba per model in the batch."""
+    by_model = {}
+    for i, (model, row) in enumerate(items):
+        by_model.setdefault(id(model), (model, []))[1].append(i)
+    results = [None] * len(items)
+    for model, positions in by_model.values():
+        probs = predict_proba(model, np.vstack([items[i][1] for i in positions]))
+        for row, i in enumerate(positions):
+            results[i] = probs[row]
+    return results
+
+batcher = MicroBatcher(score_rows, max_batch_size=MICRO_BATCH_SIZE, max_wait_ms=MICRO_BATCH_WAIT_MS)
+
+async def predict(request):
+    try:
+        # Batches stay on the LightGBM booster, which is faster for many rows
+        model, encoder, model_meta = single_row_model()
+        error = model_not_ready(model, encoder)
+        if error:
+            return JSONResponse({'success': False, 'error': error})
+
+        data = await request.json()
+        features = preprocess_input(data, encoder)[0]
+        cache_key = prediction_cache.key(features)
+        probs = prediction_cache.get(model_meta['version'], cache_key)
+        if probs is None:
+            probs = await batcher.submit((model, features))
+            prediction_cache.put(model_meta['version'], cache_key, probs)
+        observe_drift(model, encoder, model_meta, [data], probs)
+
+        return JSONResponse({
+            'success': True,
+            **describe_prediction(model, encoder, probs, model_meta),
+            'model_version': model_meta['version']
+        })
+    except InputValidationError as e:
+        return JSONResponse({'success': False, 'error': str(e), 'errors': e.errors})
+    except Exception as e:
+        return JSONResponse({'success': False, 'error': str(e)})
+
+async def predict_batch(request):
+    try:
+        model, encoder, model_meta = model_holder.get()
+        error = model_not_ready(model, encoder)
+        if error:
+            return JSONResponse({'success': False, 'error': error})
+
+        mimetype = request.headers.get('content-type', '').split(';')[0].strip()
+        records = parse_batch_body(await request.body(), mimetype)
+        if len(records) > MAX_BATCH_SIZE:
+            return JSONResponse({
+                'success': False,
+                'error': f'Batch too large, at most {MAX_BATCH_SIZE} records per request'
+            }, status_code=413)
+
+        # Already one vectorized call, keep it off the event loop
+        return JSONResponse(await run_in_threadpool(score_batch, model, encoder, model_meta, records))
+    except Exception as e:
+        return JSONResponse({'success': False, 'error': str(e)})
+
+async def model_info(request):
+    return JSONResponse({
+        **model_holder.info(),
+        'prediction_cache': prediction_cache.stats(),
+        'micro_batching': batcher.info(),
+        'logging': logging_stats(),
+        'process': process_info()
+    })
+
+async def drift(request):
+    return JSONResponse(drift_monitors.report())
+
+@asynccontextmanager
+async def lifespan(app):
+    batcher.start()
+    yield
+    await batcher.stop()
+
+app = Starlette(
+    routes=[
+        Route('/predict', predict, methods=['POST']),
+        Route('/predict_batch', predict_batch, methods=['POST']),
+        Route('/model_info', model_info, methods=['GET']),
+        Route('/drift', drift, methods=['GET'])
+    ],
+    lifespan=lifespan
+)
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, port=8000)
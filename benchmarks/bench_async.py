@@ -0,0 +1,96 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import http.client
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from benchmarks.bench_serving import load_records
+
+SERVERS = {
+    "flask": [sys.executable, "-c", "import app; app.app.run(port={port}, threaded=True)"],
+    "asgi": [sys.executable, "-m", "uvicorn", "asgi_app:app", "--port", "{port}", "--log-level", "warning"]
+}
+
+def start_server(name, port, timeout=60):
+    command = [part.format(port=port) for part in SERVERS[name]]
+    process = subprocess.Popen(command, cwd=project_root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/model_info")
+            if json.loads(conn.getresponse().read()).get("loaded"):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{name} server did not come up on port {port}")
+
+def post_all(port, records):
+    latencies = []
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    for record in records:
+        body = json.dumps(record)
+        start = time.perf_counter()
+        try:
+            conn.request("POST", "/predict", body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+        except (http.client.HTTPException, OSError):
+            # Servers that close the connection after each response
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+            conn.request("POST", "/predict", body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+        payload = json.loads(response.read())
+        if response.getheader("Connection", "").lower() == "close":
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+        latencies.append(time.perf_counter() - start)
+        if not payload.get("success"):
+            raise RuntimeError(payload.get("error"))
+    conn.close()
+    return latencies
+
+def bench_concurrent(port, records, concurrency):
+    chunks = [records[i::concurrency] for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = np.concatenate([lat for lat in pool.map(lambda chunk: post_all(port, chunk), chunks)])
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(records),
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests_per_sec": len(records) / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent /predict load: threaded Flask vs ASGI micro-batching")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    records = load_records(args.requests)
+    results = {}
+    for name in SERVERS:
+        process = start_server(name, args.port)
+        try:
+            results[name] = bench_concurrent(args.port, records, args.concurrency)
+        finally:
+            process.terminate()
+            process.wait()
+        print(f"{name}: {json.dumps(results[name])}")
+    print(f"ASGI / Flask throughput: {results['asgi']['requests_per_sec'] / results['flask']['requests_per_sec']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.logger import configure_logging, stop_logging, logging_stats
+
+MODES = {
+    "sync_text": {"mode": "sync", "format": "text"},
+    "async_text": {"mode": "async", "format": "text"},
+    "async_json": {"mode": "async", "format": "json"},
+    # The record is dropped by sampling before it is formatted or queued
+    "async_sampled_out": {"mode": "async", "format": "json", "sample_rates": {"bench": 0.0}}
+}
+
+def time_calls(logger, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        logger.info("Scored booking %d", i, extra={"model_version": "abc123", "latency_ms": 1.5})
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Caller-side cost of one logger.info per logging mode")
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, mode in MODES.items():
+            log_file = os.path.join(tmp, f"{name}.log")
+            configure_logging({**mode, "console": False, "file": log_file, "queue_size": args.calls + 1})
+            if mode["mode"] == "sync":
+                # Point the per-process file handler at the temp dir
+                root = logging.getLogger()
+                handler = root.handlers[0]
+                root.removeHandler(handler)
+                handler.close()
+                sink = logging.FileHandler(log_file)
+                sink.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s: %(message)s"))
+                root.addHandler(sink)
+
+            caller_s = time_calls(logger, args.calls)
+            stats = logging_stats()
+            start = time.perf_counter()
+            stop_logging()
+            drain_s = time.perf_counter() - start
+            results[name] = {
+                "caller_us_per_call": caller_s / args.calls * 1e6,
+                "writer_drain_s": drain_s,
+                "dropped_sampled": sum(stats["dropped_sampled"].values()),
+                "lines_written": sum(1 for _ in open(log_file)) if os.path.exists(log_file) else 0
+            }
+        configure_logging({"mode": "sync", "console": True})
+
+    print(json.dumps({"calls": args.calls, "results": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
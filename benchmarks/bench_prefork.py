@@ -0,0 +1,65 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from serve import process_memory
+from benchmarks.bench_async import bench_concurrent
+from benchmarks.bench_serving import load_records
+
+def child_pids(pid):
+    with open(f"/proc/{pid}/task/{pid}/children", "r") as f:
+        return [int(child) for child in f.read().split()]
+
+def wait_for_workers(master, workers, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if master.poll() is not None:
+            raise RuntimeError("serve.py exited during startup")
+        if len(child_pids(master.pid)) == workers:
+            return
+        time.sleep(0.2)
+    raise RuntimeError("Workers did not start in time")
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker RSS/PSS of the pre-fork server after serving traffic")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    master = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", str(args.workers), "--port", str(args.port)],
+        cwd=project_root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_workers(master, args.workers)
+        time.sleep(1)
+        load = bench_concurrent(args.port, load_records(args.requests), args.concurrency)
+        memory = {"master": process_memory(master.pid)}
+        for pid in child_pids(master.pid):
+            memory[f"worker_{pid}"] = process_memory(pid)
+    finally:
+        master.terminate()
+        master.wait()
+
+    workers = [m for name, m in memory.items() if name != "master"]
+    summary = {
+        "load": load,
+        "processes": memory,
+        "worker_rss_mb_total": sum(m["rss_mb"] for m in workers),
+        "worker_pss_mb_total": sum(m["pss_mb"] for m in workers),
+        "worker_private_mb_mean": sum(m["private_mb"] for m in workers) / len(workers),
+        "worker_shared_fraction_mean": sum(m["shared_mb"] / m["rss_mb"] for m in workers) / len(workers)
+    }
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
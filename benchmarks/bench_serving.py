@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+import time
+import argparse
+import pandas as pd
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from app import app
+from config.input_schema import INPUT_SCHEMA
+
+SAMPLE_DATA_PATH = "archive (1)/booking.csv"
+
+def load_records(n):
+    fields = list(INPUT_SCHEMA)
+    df = pd.read_csv(SAMPLE_DATA_PATH, usecols=fields, nrows=n)
+    return df.to_dict(orient="records")
+
+def bench_single(client, records):
+    start = time.perf_counter()
+    for record in records:
+        client.post("/predict", json=record)
+    elapsed = time.perf_counter() - start
+    return {"rows": len(records), "seconds": elapsed, "rows_per_sec": len(records) / elapsed}
+
+def bench_batch(client, records, batch_size, ndjson=False):
+    start = time.perf_counter()
+    for i in range(0, len(records), batch_size):
+        chunk = records[i:i + batch_size]
+        if ndjson:
+            body = "\n".join(json.dumps(r) for r in chunk)
+            client.post("/predict_batch", data=body, content_type="application/x-ndjson")
+        else:
+            client.post("/predict_batch", json=chunk)
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": len(records),
+        "batch_size": batch_size,
+        "ndjson": ndjson,
+        "seconds": elapsed,
+        "rows_per_sec": len(records) / elapsed
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-row vs batch prediction throughput")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--output", default=None, help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    client = app.test_client()
+    if not client.get("/model_info").json.get("loaded"):
+        raise SystemExit("No model loaded, run the training pipeline first")
+
+    records = load_records(args.rows)
+    results = {"single": bench_single(client, records), "batch": []}
+    for batch_size in args.batch_sizes:
+        results["batch"].append(bench_batch(client, records, batch_size))
+        results["batch"].append(bench_batch(client, records, batch_size, ndjson=True))
+
+    print(f"/predict       : {results['single']['rows_per_sec']:>10.0f} rows/s")
+    for res in results["batch"]:
+        label = f"/predict_batch ({res['batch_size']}{', ndjson' if res['ndjson'] else ''})"
+        print(f"{label:<30}: {res['rows_per_sec']:>10.0f} rows/s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
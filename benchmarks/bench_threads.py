@@ -0,0 +1,65 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import lightgbm as lgb
+from sklearn.model_selection import RandomizedSearchCV
+from benchmarks.run_benchmarks import dataset_path
+from benchmarks.synthetic_data import parse_rows
+from config.model_params import LIGHTGBM_PARAMS, RANDOM_SEARCH_PARAMS
+from config.path_config import CONFIG_PATH
+from src.feature_encoder import FeatureEncoder
+from src.thread_budget import ThreadBudget, available_cores
+from utils.common_functions import read_yaml, load_data
+
+def feature_matrix(rows):
+    config = read_yaml(os.path.join(project_root, CONFIG_PATH))["data_processing"]
+    df = load_data(dataset_path(rows)).drop(columns=["Booking_ID", "date of reservation"])
+    encoder = FeatureEncoder(config["categorical_cols"], config["numerical_cols"], config["skew_threshold"])
+    df = encoder.fit(df).transform(df)
+    return df.drop(columns=["booking status"]), df["booking status"]
+
+def time_search(X, y, workers, threads):
+    search = RandomizedSearchCV(
+        estimator=lgb.LGBMClassifier(random_state=42, verbose=-1, n_jobs=threads),
+        param_distributions=LIGHTGBM_PARAMS,
+        **{**RANDOM_SEARCH_PARAMS, "n_jobs": workers, "refit": False}
+    )
+    start = time.perf_counter()
+    search.fit(X, y)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Random search with nested n_jobs=-1 versus the thread budget")
+    parser.add_argument("--rows", default="100k")
+    parser.add_argument("--total-cores", type=int, default=None)
+    parser.add_argument("--search-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    X, y = feature_matrix(parse_rows(args.rows))
+    budget = ThreadBudget({"total_cores": args.total_cores, "search_workers": args.search_workers})
+    workers, threads = budget.split(RANDOM_SEARCH_PARAMS["n_iter"] * RANDOM_SEARCH_PARAMS["cv"])
+
+    default_s = time_search(X, y, -1, -1)
+    budget_s = time_search(X, y, workers, threads)
+    result = {
+        "rows": len(X),
+        "cores": budget.total_cores,
+        "available_cores": available_cores(),
+        "default_nested_all_cores_s": default_s,
+        "budget": {"workers": workers, "threads": threads, "seconds": budget_s},
+        "default_over_budget": default_s / budget_s
+    }
+    if result["available_cores"] < 2:
+        # Both runs use the one core; only a multi-core host shows what sharing saves
+        result["note"] = "single core: no speedup can be measured here"
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
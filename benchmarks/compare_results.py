@@ -0,0 +1,68 @@
+import sys
+import json
+import argparse
+
+# Metric paths compared between runs and whether higher is better
+TRACKED = {
+    "pipeline.end_to_end_s": False,
+    "serving.preprocess_input_us_per_row": False,
+    "serving.predict.rows_per_sec": True,
+    "serving.predict_batch.rows_per_sec": True
+}
+STAGE_KEYS = {"wall_time_s": False, "peak_rss_mb": False}
+
+def lookup(run, path):
+    value = run
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+def metrics(run):
+    values = {path: lookup(run, path) for path in TRACKED}
+    directions = dict(TRACKED)
+    for stage, record in run.get("pipeline", {}).get("stages", {}).items():
+        for key, higher_is_better in STAGE_KEYS.items():
+            path = f"stage.{stage}.{key}"
+            values[path] = record.get(key)
+            directions[path] = higher_is_better
+    return values, directions
+
+def compare(baseline_file, candidate_file, threshold):
+    with open(baseline_file) as f:
+        baseline = {run["rows"]: run for run in json.load(f)["runs"]}
+    with open(candidate_file) as f:
+        candidate = {run["rows"]: run for run in json.load(f)["runs"]}
+
+    regressions = []
+    for rows in sorted(set(baseline) & set(candidate)):
+        base_values, directions = metrics(baseline[rows])
+        cand_values, _ = metrics(candidate[rows])
+        print(f"== {rows} rows")
+        for path, base in base_values.items():
+            cand = cand_values.get(path)
+            if not base or cand is None:
+                continue
+            change = (cand - base) / base
+            worse = -change if directions[path] else change
+            flag = "REGRESSION" if worse > threshold else ""
+            print(f"{path:<50} {base:>14.4f} {cand:>14.4f} {change:>+8.1%} {flag}")
+            if flag:
+                regressions.append((rows, path, change))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    regressions = compare(args.baseline, args.candidate, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+import pandas as pd
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from benchmarks.synthetic_data import generate, parse_rows
+from src import stage_metrics
+from config.path_config import CONFIG_PATH
+
+RESULTS_DIR = os.path.join(project_root, "benchmarks", "results")
+DATA_DIR = os.path.join(project_root, "benchmarks", "data")
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=project_root, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def environment():
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+def dataset_path(rows):
+    path = os.path.join(DATA_DIR, f"booking_{rows}.csv")
+    if not os.path.exists(path):
+        print(f"Generating {rows} synthetic rows at {path}")
+        generate(rows, path)
+    return path
+
+def bench_pipeline(config, data_path):
+    """Runs every stage in the current (scratch) directory and returns stage metrics."""
+    from src.data_ingestion import DataIngestion
+    from src.data_profiler import DataProfiler
+    from src.data_preprocessing import DataPreprocessing
+    from src.model_training import ModelTraining
+
+    stage_metrics.reset()
+    stage_metrics.configure({"enabled": True, "cprofile": False})
+    start = time.perf_counter()
+
+    ingestion = DataIngestion(config)
+    ingestion.local_data_path = data_path
+    ingestion.run()
+    DataProfiler(config).run()
+    DataPreprocessing(config).run()
+    with stage_metrics.track_stage("model_training_run"):
+        ModelTraining(config).run()
+
+    total = time.perf_counter() - start
+    records = stage_metrics.get_records()
+    stage_metrics.reset()
+    return {"end_to_end_s": total, "stages": records}
+
+def bench_serving(data_path, n_requests, batch_size):
+    # Imported here so the app picks up the model trained in the scratch directory
+    import app as serving
+    from benchmarks.bench_serving import bench_single, bench_batch
+
+    from src.tree_export import CompiledTrees, single_row_latency
+
+    serving.model_holder.load()
+    model, encoder, _ = serving.model_holder.get()
+    records = pd.read_csv(data_path, nrows=n_requests).to_dict(orient="records")
+
+    start = time.perf_counter()
+    features = [serving.preprocess_input(record, encoder)[0] for record in records]
+    encode_s = time.perf_counter() - start
+    X = pd.DataFrame(features, columns=encoder.features)
+
+    client = serving.app.test_client()
+    return {
+        "preprocess_input_us_per_row": encode_s / n_requests * 1e6,
+        "single_row_scoring_us": single_row_latency(model, CompiledTrees.from_model(model), X),
+        "predict": bench_single(client, records),
+        "predict_batch": bench_batch(client, records, batch_size)
+    }
+
+def run(rows, n_requests, batch_size, keep_workdir=False):
+    from utils.common_functions import read_yaml
+
+    config = read_yaml(os.path.join(project_root, CONFIG_PATH))
+    # Measure the real work, not the stage cache
+    config.setdefault("pipeline", {})["cache"] = False
+    data_path = dataset_path(rows)
+
+    workdir = tempfile.mkdtemp(prefix="apex_bench_")
+    cwd = os.getcwd()
+    try:
+        shutil.copytree(os.path.join(project_root, "config"), os.path.join(workdir, "config"))
+        os.chdir(workdir)
+        results = {"rows": rows, "environment": environment()}
+        results["pipeline"] = bench_pipeline(config, data_path)
+        results["serving"] = bench_serving(data_path, n_requests, batch_size)
+        return results
+    finally:
+        os.chdir(cwd)
+        if not keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the APEX-FORGE benchmark suite")
+    parser.add_argument("--rows", nargs="+", default=["100k"], help="Dataset sizes, e.g. 100k 1M 10M")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests for the serving benchmarks")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--output", default=None, help="Result file (default: benchmarks/results/<commit>_<time>.json)")
+    parser.add_argument("--keep-workdir", action="store_true")
+    args = parser.parse_args()
+
+    results = []
+    for rows in args.rows:
+        print(f"Benchmarking with {rows} rows")
+        results.append(run(parse_rows(rows), args.requests, args.batch_size, args.keep_workdir))
+
+    env = environment()
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{env['commit']}_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"environment": env, "runs": results}, f, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
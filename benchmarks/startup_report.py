@@ -0,0 +1,88 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from collections import defaultdict
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point module and extra environment per serving variant
+TARGETS = {
+    "flask": ("app", {}),
+    "flask_slim": ("app", {"SLIM_SERVING": "1"}),
+    "asgi": ("asgi_app", {}),
+    "asgi_slim": ("asgi_app", {"SLIM_SERVING": "1"})
+}
+
+# Imports the entry point (which loads the model) and reports what it cost
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+ready_s = time.perf_counter() - start
+from src.inference import model_holder, process_info
+print(json.dumps({{"ready_s": ready_s, "model_loaded": model_holder.info().get("loaded"), **process_info()}}))
+"""
+
+def run_probe(module, env, importtime=False):
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", PROBE.format(module=module)]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=project_root, env={**os.environ, **env}, capture_output=True, text=True)
+    wall_s = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return wall_s, json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+def import_breakdown(stderr, top):
+    """Self import time per top-level package, from `python -X importtime` output."""
+    per_package = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        per_package[name.strip().split(".")[0]] += int(self_us)
+    ranked = sorted(per_package.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "total_ms": sum(per_package.values()) / 1000,
+        "top_packages_ms": {name: us / 1000 for name, us in ranked[:top]}
+    }
+
+def report(targets, repeat, top):
+    results = {}
+    for name in targets:
+        module, env = TARGETS[name]
+        runs = [run_probe(module, env) for _ in range(repeat)]
+        _, info, stderr = run_probe(module, env, importtime=True)
+        results[name] = {
+            "module": module,
+            "env": env,
+            # Interpreter start to model loaded, median over the runs
+            "cold_start_s": statistics.median(wall for wall, _, _ in runs),
+            "import_and_load_s": statistics.median(run[1]["ready_s"] for run in runs),
+            "peak_rss_mb": statistics.median(run[1].get("peak_rss_mb", 0) for run in runs),
+            "model_loaded": info["model_loaded"],
+            "heavy_modules_loaded": info["heavy_modules_loaded"],
+            "imports": import_breakdown(stderr, top)
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start time, baseline memory and import-time breakdown per serving entry point")
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Packages listed in the import breakdown")
+    parser.add_argument("--output", default=None, help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    results = report(args.targets, args.repeat, args.top)
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import os
+import sys
+import json
+import argparse
+import numpy as np
+import pandas as pd
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+SAMPLE_DATA_PATH = os.path.join(project_root, "archive (1)", "booking.csv")
+TARGET_COL = "booking status"
+ID_COL = "Booking_ID"
+QUANTILES = 1001
+
+def fit_profile(df):
+    """
+    Per-class marginals of every column: value frequencies for text and
+    low-cardinality integer columns, a quantile grid for the rest.
+    Sampling from it reproduces column distributions and class balance
+    (columns are drawn independently given the class).
+    """
+    profile = {"columns": list(df.columns), "classes": {}}
+    class_freq = df[TARGET_COL].value_counts(normalize=True)
+    for label, freq in class_freq.items():
+        part = df[df[TARGET_COL] == label]
+        columns = {}
+        for col in df.columns:
+            if col in (ID_COL, TARGET_COL):
+                continue
+            series = part[col]
+            is_integer = pd.api.types.is_integer_dtype(series)
+            if not pd.api.types.is_numeric_dtype(series) or (is_integer and series.nunique() <= 50):
+                counts = series.value_counts(normalize=True)
+                columns[col] = {
+                    "kind": "categorical",
+                    "values": counts.index.tolist(),
+                    "probs": counts.to_numpy().tolist()
+                }
+            else:
+                grid = np.quantile(series.to_numpy(dtype=float), np.linspace(0, 1, QUANTILES))
+                columns[col] = {"kind": "numeric", "integer": bool(is_integer), "quantiles": grid.tolist()}
+        profile["classes"][str(label)] = {"freq": float(freq), "columns": columns}
+    return profile
+
+def sample(profile, n_rows, rng, id_offset=0):
+    labels = list(profile["classes"])
+    probs = np.array([profile["classes"][label]["freq"] for label in labels])
+    y = rng.choice(len(labels), size=n_rows, p=probs / probs.sum())
+
+    data = {col: np.empty(n_rows, dtype=object) for col in profile["columns"]}
+    for class_idx, label in enumerate(labels):
+        rows = np.flatnonzero(y == class_idx)
+        if len(rows) == 0:
+            continue
+        for col, spec in profile["classes"][label]["columns"].items():
+            if spec["kind"] == "categorical":
+                values = np.array(spec["values"], dtype=object)
+                data[col][rows] = values[rng.choice(len(values), size=len(rows), p=spec["probs"])]
+            else:
+                # Inverse-CDF sampling on the stored quantile grid
+                grid = np.array(spec["quantiles"])
+                drawn = np.interp(rng.random(len(rows)), np.linspace(0, 1, len(grid)), grid)
+                data[col][rows] = np.round(drawn).astype(np.int64) if spec["integer"] else np.round(drawn, 2)
+        data[TARGET_COL][rows] = label
+
+    data[ID_COL] = np.array([f"SYN{i:09d}" for i in range(id_offset, id_offset + n_rows)], dtype=object)
+    df = pd.DataFrame(data, columns=profile["columns"])
+    return df.infer_objects()
+
+def generate(n_rows, output_path, source_path=SAMPLE_DATA_PATH, chunk_size=1_000_000, seed=42):
+    """Writes n_rows synthetic bookings to output_path (CSV) in bounded-memory chunks."""
+    profile = fit_profile(pd.read_csv(source_path))
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    written = 0
+    while written < n_rows:
+        n = min(chunk_size, n_rows - written)
+        chunk = sample(profile, n, rng, id_offset=written)
+        chunk.to_csv(output_path, mode="w" if written == 0 else "a", header=written == 0, index=False)
+        written += n
+    return output_path
+
+def parse_rows(value):
+    value = value.lower()
+    for suffix, scale in (("k", 1_000), ("m", 1_000_000)):
+        if value.endswith(suffix):
+            return int(float(value[:-1]) * scale)
+    return int(value)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic booking data shaped like booking.csv")
+    parser.add_argument("--rows", default="100k", help="Number of rows, e.g. 100k, 1M, 10M")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--profile-only", action="store_true", help="Print the fitted profile and exit")
+    args = parser.parse_args()
+
+    if args.profile_only:
+        print(json.dumps(fit_profile(pd.read_csv(SAMPLE_DATA_PATH)), indent=2))
+        return
+
+    n_rows = parse_rows(args.rows)
+    output = args.output or os.path.join("benchmarks", "data", f"booking_{args.rows}.csv")
+    generate(n_rows, output, seed=args.seed)
+    print(f"Wrote {n_rows} rows to {output}")
+
+if __name__ == "__main__":
+    main()
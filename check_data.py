@@ -1,82 +1,115 @@
-import pandas as pd
+# Data checks read from the data profile instead of loading the CSV:
+#   python check_data.py                          # train + test profiles from the pipeline
+#   python check_data.py --split train
+#   python check_data.py --files a.csv b.csv --workers 2 --save profile.json
+#   python check_data.py --plot artifacts/data_profile/histograms.png
+import sys
+import json
+import argparse
+from src.data_profiler import DataProfile, DataProfiler
+from config.path_config import *
+from utils.common_functions import read_yaml
 
-# Load your data
-dataset = pd.read_csv(r"D:\mlops_hotel_booking_pred\archive (1)\booking.csv")
-df_copy = dataset.copy()
+def load_profile(args, config):
+    if args.files:
+        profile = DataProfiler(config).profile_files(args.files, workers=args.workers)
+        if args.save:
+            profile.save(args.save)
+        return profile
+    paths = {"train": [TRAIN_DATA_PROFILE_PATH], "test": [TEST_DATA_PROFILE_PATH],
+             "all": [TRAIN_DATA_PROFILE_PATH, TEST_DATA_PROFILE_PATH]}[args.split]
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        sys.exit(f"Missing {missing}, run the pipeline (data_profile stage) or pass --files")
+    profile = DataProfile()
+    for path in paths:
+        profile.merge(DataProfile.load(path))
+    return profile
 
-# Print column names
-print("=" * 80)
-print("COLUMN NAMES IN YOUR DATASET")
-print("=" * 80)
-for i, col in enumerate(df_copy.columns):
-    print(f"{i+1}. '{col}'")
+def check(profile, config):
+    """Problems worth a look before training: missing columns, nulls, unparseable numbers, skew."""
+    processing = config["data_processing"]
+    target = config["data_ingestion"].get("target_col", "booking status")
+    problems = []
+    for col in dict.fromkeys(processing["numerical_cols"] + processing["categorical_cols"] + [target]):
+        if col not in profile:
+            problems.append(f"'{col}' not found")
+            continue
+        column = profile[col]
+        if column.nulls:
+            problems.append(f"'{col}': {column.nulls} nulls")
+        if col in processing["numerical_cols"]:
+            if column.kind != "numeric":
+                problems.append(f"'{col}' is not numeric")
+            elif column.invalid:
+                problems.append(f"'{col}': {column.invalid} values are not numbers")
+            elif column.skew is not None and column.skew > processing["skew_threshold"]:
+                problems.append(f"'{col}': skew {column.skew:.2f} > {processing['skew_threshold']} (log1p)")
+    return problems
 
-# Check target column
-print("\n" + "=" * 80)
-print("TARGET COLUMN CHECK")
-print("=" * 80)
-if 'booking_status' in df_copy.columns:
-    target = 'booking_status'
-    print(f"✓ Found '{target}'")
-elif 'booking status' in df_copy.columns:
-    target = 'booking status'
-    print(f"✓ Found '{target}'")
-else:
-    print("✗ No booking status column found!")
-    target = None
+def print_report(profile, config):
+    target = config["data_ingestion"].get("target_col", "booking status")
+    print(f"{profile.rows} rows, {len(profile.columns)} columns from {', '.join(profile.sources)}")
+    print(f"\n{'column':<28}{'kind':<13}{'count':>8}{'nulls':>7}{'distinct':>10}  stats")
+    for name, column in profile.columns.items():
+        summary = column.summary()
+        distinct = summary["distinct"] if summary["distinct"] is not None else "many"
+        if column.kind == "numeric":
+            q = summary["quantiles"]
+            stats = (f"min {summary['min']:g} p50 {q['0.5']:g} p99 {q['0.99']:g} max {summary['max']:g} "
+                     f"mean {summary['mean']:.3g} skew {summary['skew'] if summary['skew'] is not None else float('nan'):.2f}"
+                     if column.count else "")
+        else:
+            stats = ", ".join(f"{key}: {n}" for key, n in list(summary["top"].items())[:3])
+        print(f"{name:<28}{column.kind:<13}{column.count:>8}{column.nulls:>7}{distinct:>10}  {stats}")
 
-if target:
-    print(f"\nUnique values in {target}:")
-    print(df_copy[target].value_counts())
+    if target in profile:
+        print(f"\nTarget '{target}':")
+        counts = profile[target].category_counts() or {}
+        for label, n in sorted(counts.items(), key=lambda item: item[1], reverse=True):
+            print(f"  {label}: {n} ({n / max(profile[target].count, 1):.1%})")
 
-# Define and check numerical columns
-numerical_cols = ['number of adults', 'number of children', 'number of weekend nights', 
-                  'number of week nights', 'lead time', 'repeated', 'P-C', 'P-not-C', 
-                  'average price', 'special requests']
+    problems = check(profile, config)
+    print("\nChecks:" if problems else "\nChecks: no problems found")
+    for problem in problems:
+        print(f"  - {problem}")
 
-print("\n" + "=" * 80)
-print("NUMERICAL COLUMNS CHECK")
-print("=" * 80)
-for col in numerical_cols:
-    if col in df_copy.columns:
-        print(f"✓ '{col}' exists - Type: {df_copy[col].dtype}")
-    else:
-        print(f"✗ '{col}' NOT FOUND")
-
-# Convert to numeric
-print("\n" + "=" * 80)
-print("CONVERTING TO NUMERIC")
-print("=" * 80)
-for col in numerical_cols:
-    if col in df_copy.columns:
-        df_copy[col] = pd.to_numeric(df_copy[col], errors='coerce')
-        print(f"✓ {col}: {df_copy[col].dtype}")
-
-# Sample data
-print("\n" + "=" * 80)
-print("SAMPLE DATA")
-print("=" * 80)
-print(df_copy[numerical_cols + ([target] if target else [])].head())
+def plot_histograms(profile, file_path):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    numeric = [name for name, column in profile.columns.items() if column.kind == "numeric" and column.count]
+    rows = (len(numeric) + 1) // 2
+    fig, axes = plt.subplots(rows, 2, figsize=(15, rows * 4), squeeze=False)
+    axes = axes.flatten()
+    for ax, name in zip(axes, numeric):
+        column = profile[name]
+        ax.hist(column.values, bins=min(50, len(column.values)), weights=column.weights, color="steelblue")
+        ax.set_title(f"{name} (skew {column.skew:.2f})" if column.skew is not None else name)
+    for ax in axes[len(numeric):]:
+        ax.set_visible(False)
+    fig.tight_layout()
+    fig.savefig(file_path)
+    print(f"\nHistograms saved to {file_path}")
 
-print("\n" + "=" * 80)
-print("THE FIX FOR YOUR NOTEBOOK")
-print("=" * 80)
-print("""
-Replace your plot_bivariate_num function with this:
+def main():
+    parser = argparse.ArgumentParser(description="Data checks from the streaming data profile")
+    parser.add_argument("--split", choices=["train", "test", "all"], default="all")
+    parser.add_argument("--files", nargs="+", default=None, help="Profile these data files (chunks of one dataset) instead")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for --files")
+    parser.add_argument("--save", default=None, help="Write the --files profile to this JSON file")
+    parser.add_argument("--plot", default=None, help="Save histograms of the numeric columns to this image")
+    parser.add_argument("--json", action="store_true", help="Print the column summaries as JSON")
+    args = parser.parse_args()
 
-def plot_bivariate_num(df_copy, target, numerical_cols):
-    num_plots = len(numerical_cols)
-    num_rows = (num_plots + 1) // 2
-    
-    fig, axes = plt.subplots(num_rows, 2, figsize=(15, num_rows*5))
-    axes = axes.flatten()
-    
-    for i, column in enumerate(numerical_cols):
-        sns.boxplot(data=df_copy, x=target, y=column, palette="Blues", ax=axes[i])
-        axes[i].set_title(f"{column} vs {target}")
-    
-    plt.tight_layout()
-    plt.show()
+    config = read_yaml(CONFIG_PATH)
+    profile = load_profile(args, config)
+    if args.json:
+        print(json.dumps({"rows": profile.rows, "columns": profile.summary(), "problems": check(profile, config)}, indent=2))
+    else:
+        print_report(profile, config)
+    if args.plot:
+        plot_histograms(profile, args.plot)
 
-KEY POINT: The line must have ax=axes[i] at the end!
-""")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+# Fields as the booking form and API clients send them (names with spaces).
+# HTML forms send numbers as strings, so numeric strings are accepted.
+# Fields with a default may be left out of a request.
+INPUT_SCHEMA = {
+    "number of adults": {"type": "int", "min": 0, "max": 20, "default": 2},
+    "number of children": {"type": "int", "min": 0, "max": 20},
+    "number of weekend nights": {"type": "int", "min": 0, "max": 30, "default": 0},
+    "number of week nights": {"type": "int", "min": 0, "max": 60, "default": 0},
+    "type of meal": {
+        "type": "category",
+        "values": ["Meal Plan 1", "Meal Plan 2", "Meal Plan 3", "Not Selected"],
+        "default": "Meal Plan 1"
+    },
+    "car parking space": {"type": "int", "min": 0, "max": 1, "default": 0},
+    "room type": {
+        "type": "category",
+        "values": [f"Room_Type {i}" for i in range(1, 8)],
+        "default": "Room_Type 1"
+    },
+    "lead time": {"type": "int", "min": 0, "max": 1000, "default": 0},
+    "market segment type": {
+        "type": "category",
+        "values": ["Aviation", "Complementary", "Corporate", "Offline", "Online"],
+        "default": "Online"
+    },
+    "repeated": {"type": "int", "min": 0, "max": 1},
+    "P-C": {"type": "int", "min": 0, "max": 100},
+    "P-not-C": {"type": "int", "min": 0, "max": 500},
+    "average price": {"type": "float", "min": 0, "max": 10000, "default": 0},
+    "special requests": {"type": "int", "min": 0, "max": 10, "default": 0}
+}
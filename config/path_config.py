@@ -1,4 +1,27 @@
 import os
+import yaml
+
+CONFIG_PATH = "config/config.yaml"
+
+# ================================================================================================================================
+# Artifact Format
+# ================================================================================================================================
+
+# Extension of the intermediate train/test artifacts. "npy" artifacts are directories
+# holding one memory-mappable .npy file per column.
+ARTIFACT_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather", "npy": ".npy"}
+
+def _read_artifact_format():
+    if os.path.exists(CONFIG_PATH):
+        with open(CONFIG_PATH, "r") as file:
+            config = yaml.safe_load(file) or {}
+        return config.get("artifacts", {}).get("format", "csv")
+    return "csv"
+
+ARTIFACT_FORMAT = os.environ.get("ARTIFACT_FORMAT", _read_artifact_format())
+if ARTIFACT_FORMAT not in ARTIFACT_EXTENSIONS:
+    raise ValueError(f"Unsupported artifact format '{ARTIFACT_FORMAT}', expected one of {list(ARTIFACT_EXTENSIONS)}")
+ARTIFACT_EXT = ARTIFACT_EXTENSIONS[ARTIFACT_FORMAT]
 
 
 # ================================================================================================================================
@@ -7,10 +30,28 @@ import os
 
 RAW_DIR = "artifacts/raw"
 RAW_FILE_PATH = os.path.join(RAW_DIR, "raw.csv")
-TRAIN_FILE_PATH = os.path.join(RAW_DIR, "train.csv")
-TEST_FILE_PATH = os.path.join(RAW_DIR, "test.csv")
+TRAIN_FILE_PATH = os.path.join(RAW_DIR, f"train{ARTIFACT_EXT}")
+TEST_FILE_PATH = os.path.join(RAW_DIR, f"test{ARTIFACT_EXT}")
 
-CONFIG_PATH = "config/config.yaml"
+# ================================================================================================================================
+# Booking Store Path
+# ================================================================================================================================
+
+# Append-only, date-partitioned booking history (data_ingestion.mode: store)
+STORE_DIR = "artifacts/store"
+STORE_PROFILE_DIR = os.path.join(STORE_DIR, "profiles")
+# Train/test rows of each store partition (store_split/train/<partition>, store_split/test/<partition>)
+STORE_SPLIT_DIR = os.path.join(RAW_DIR, "store_split")
+# Store batch the train/test splits were last written from
+STORE_SPLIT_PATH = os.path.join(RAW_DIR, "store_split.json")
+
+# ================================================================================================================================
+# Data Profile Path
+# ================================================================================================================================
+
+DATA_PROFILE_DIR = "artifacts/data_profile"
+TRAIN_DATA_PROFILE_PATH = os.path.join(DATA_PROFILE_DIR, "train.json")
+TEST_DATA_PROFILE_PATH = os.path.join(DATA_PROFILE_DIR, "test.json")
 
 
 # ================================================================================================================================
@@ -18,12 +59,40 @@ CONFIG_PATH = "config/config.yaml"
 # ================================================================================================================================
 
 PROCESSED_DIR = "artifacts/processed"
-PROCESSED_TRAIN_PATH = os.path.join(PROCESSED_DIR, "train.csv")
-PROCESSED_TEST_PATH = os.path.join(PROCESSED_DIR, "test.csv")
+PROCESSED_TRAIN_PATH = os.path.join(PROCESSED_DIR, f"train{ARTIFACT_EXT}")
+PROCESSED_TEST_PATH = os.path.join(PROCESSED_DIR, f"test{ARTIFACT_EXT}")
+PROCESSED_VALIDATION_PATH = os.path.join(PROCESSED_DIR, f"validation{ARTIFACT_EXT}")
+# Unencoded rows of the processed validation/test data, row for row (evaluation cost weights)
+VALIDATION_ROWS_PATH = os.path.join(PROCESSED_DIR, f"validation_rows{ARTIFACT_EXT}")
+TEST_ROWS_PATH = os.path.join(PROCESSED_DIR, f"test_rows{ARTIFACT_EXT}")
+ENCODER_PATH = os.path.join(PROCESSED_DIR, "encoder.json")
+FEATURE_SELECTION_REPORT_PATH = os.path.join(PROCESSED_DIR, "feature_selection.json")
+BALANCING_REPORT_PATH = os.path.join(PROCESSED_DIR, "balancing.json")
+FEATURE_IMPORTANCE_CACHE_PATH = os.path.join(PROCESSED_DIR, "feature_importance_cache.json")
 
 # ================================================================================================================================
 # Model Path
 # ================================================================================================================================
 
 MODEL_DIR = "artifacts/model"
-MODEL_PATH = os.path.join(MODEL_DIR, "model.joblib")
\ No newline at end of file
+MODEL_PATH = os.path.join(MODEL_DIR, "model.joblib")
+MODEL_ENCODER_PATH = os.path.join(MODEL_DIR, "encoder.json")
+MODEL_META_PATH = os.path.join(MODEL_DIR, "model_meta.json")
+MODEL_TREES_PATH = os.path.join(MODEL_DIR, "model_trees.npz")
+SEEN_ROWS_PATH = os.path.join(MODEL_DIR, "seen_rows.npy")
+EVALUATION_DIR = os.path.join(MODEL_DIR, "evaluation")
+DRIFT_REFERENCE_PATH = os.path.join(MODEL_DIR, "drift_reference.json")
+
+# ================================================================================================================================
+# Leaderboard Path
+# ================================================================================================================================
+
+LEADERBOARD_DIR = "artifacts/leaderboard"
+LEADERBOARD_PATH = os.path.join(LEADERBOARD_DIR, "leaderboard.csv")
+
+# ================================================================================================================================
+# Pipeline Cache Path
+# ================================================================================================================================
+
+CACHE_DIR = "artifacts/cache"
+PROFILE_DIR = "artifacts/profiles"
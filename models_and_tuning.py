@@ -8,13 +8,19 @@ from sklearn.svm import SVC
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.naive_bayes import GaussianNB
 from sklearn.neighbors import KNeighborsClassifier
-from xgboost import XGBClassifier
+from sklearn.base import clone
 from lightgbm import LGBMClassifier
-from sklearn.metrics import accuracy_score, confusion_matrix, classification_report, precision_score, recall_score, f1_score
 import numpy as np
 import pandas as pd
+from src.model_leaderboard import evaluate_candidates
+from src.thread_budget import ThreadBudget
 
-# 2. Model Evaluation Function
+try:
+    from xgboost import XGBClassifier
+except ImportError:  # optional, like in the leaderboard stage
+    XGBClassifier = None
+
+# 2. Candidate Models and Leaderboard
 models = {
     "Logistic Regression": LogisticRegression(max_iter=1000),
     "Decision Tree": DecisionTreeClassifier(),
@@ -24,23 +30,31 @@ models = {
     "SVC": SVC(),
     "Gaussian NB": GaussianNB(),
     "K-Nearest Neighbors": KNeighborsClassifier(),
-    "XGBoost": XGBClassifier(use_label_encoder=False, eval_metric='logloss'),
-    "LightGBM": LGBMClassifier()
 }
+if XGBClassifier is not None:
+    models["XGBoost"] = XGBClassifier(eval_metric='logloss')
+models["LightGBM"] = LGBMClassifier()
+
+# Leaderboard metric names as this function has always returned them
+COLUMN_NAMES = {"accuracy": "Accuracy", "precision": "Precision", "recall": "Recall", "f1": "F1-Score"}
 
-def evaluate_models(models, X_train, X_test, y_train, y_test):
-    results = {}
+def evaluate_models(models, X_train, X_test, y_train, y_test, workers=None):
+    """
+    Scores the given models, fit in parallel processes on copies (the
+    models passed in are left untouched). One row per model, in the given
+    order: Accuracy, Precision, Recall, F1-Score (weighted) as before, then
+    roc_auc, fit_time_s, batch_us_per_row, single_row_us and model_size_kb,
+    plus an error column when a model failed. The pipeline version is the
+    leaderboard stage (src/model_leaderboard.py, leaderboard in config.yaml).
+    """
+    workers, threads = ThreadBudget({"search_workers": workers}).split(len(models))
+    candidates = {}
     for name, model in models.items():
-        model.fit(X_train, y_train)
-        y_pred = model.predict(X_test)
-        results[name] = {
-            "Accuracy": accuracy_score(y_test, y_pred),
-            "Precision": precision_score(y_test, y_pred, average='weighted'),
-            "Recall": recall_score(y_test, y_pred, average='weighted'),
-            "F1-Score": f1_score(y_test, y_pred, average='weighted')
-        }
-        print(f"--- {name} ---\n{classification_report(y_test, y_pred)}\n")
-    return pd.DataFrame(results).T
+        candidates[name] = clone(model)
+        if "n_jobs" in candidates[name].get_params():
+            candidates[name].set_params(n_jobs=threads)
+    rows = evaluate_candidates(candidates, X_train, y_train, X_test, y_test, workers=workers)
+    return pd.DataFrame(rows).set_index("model").reindex(list(models)).rename(columns=COLUMN_NAMES)
 
 # 3. Hyperparameter Tuning for Random Forest
 rf_param_dist = {
@@ -1,12 +1,17 @@
 import os
 import sys
+import argparse
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.append(project_root)
 
 from src.data_ingestion import DataIngestion
+from src.data_profiler import DataProfiler
 from src.data_preprocessing import DataPreprocessing
 from src.model_training import ModelTraining
+from src.model_leaderboard import ModelLeaderboard
+from src.stage_cache import StageCache
+from src import stage_metrics
 from config.path_config import *
 from utils.common_functions import read_yaml
 from src.logger import get_logger
@@ -14,39 +19,113 @@ from src.custom_exception import CustomException
 
 logger = get_logger("training_pipeline")
 
-def run_training_pipeline():
+SHARED_CODE = ["utils/common_functions.py", "config/path_config.py"]
+
+# Inputs, config sections, code and outputs that define each stage's cache key.
+# code lists every repo module the stage imports, directly or not (logging and
+# exception helpers aside), so editing any of them reruns the stage
+STAGES = {
+    "ingestion": {
+        "component": DataIngestion,
+        "inputs": DataIngestion.input_paths,
+        "config": ["data_ingestion", "artifacts"],
+        "code": ["src/data_ingestion.py", "src/booking_store.py", "src/stage_metrics.py"],
+        "outputs": [RAW_FILE_PATH, TRAIN_FILE_PATH, TEST_FILE_PATH, STORE_SPLIT_DIR, STORE_SPLIT_PATH]
+    },
+    "data_profile": {
+        "component": DataProfiler,
+        "inputs": [TRAIN_FILE_PATH, TEST_FILE_PATH, STORE_SPLIT_DIR],
+        "config": ["data_profile", "data_ingestion", "compute", "artifacts"],
+        "code": ["src/data_profiler.py", "src/booking_store.py", "src/thread_budget.py", "src/stage_metrics.py"],
+        "outputs": [TRAIN_DATA_PROFILE_PATH, TEST_DATA_PROFILE_PATH]
+    },
+    "preprocessing": {
+        "component": DataPreprocessing,
+        "inputs": [TRAIN_FILE_PATH, TEST_FILE_PATH, STORE_SPLIT_DIR, TRAIN_DATA_PROFILE_PATH],
+        "config": ["data_processing", "data_ingestion", "compute", "artifacts"],
+        "code": ["src/data_preprocessing.py", "src/data_ingestion.py", "src/booking_store.py", "src/feature_encoder.py",
+                 "src/data_profiler.py", "src/feature_selection.py", "src/class_balancing.py", "src/thread_budget.py",
+                 "src/stage_metrics.py"],
+        "outputs": [PROCESSED_TRAIN_PATH, PROCESSED_TEST_PATH, PROCESSED_VALIDATION_PATH, VALIDATION_ROWS_PATH,
+                    TEST_ROWS_PATH, ENCODER_PATH, FEATURE_SELECTION_REPORT_PATH, BALANCING_REPORT_PATH]
+    },
+    "training": {
+        "component": ModelTraining,
+        "inputs": [PROCESSED_TRAIN_PATH, PROCESSED_TEST_PATH, PROCESSED_VALIDATION_PATH, VALIDATION_ROWS_PATH,
+                   TEST_ROWS_PATH, ENCODER_PATH, BALANCING_REPORT_PATH, TRAIN_DATA_PROFILE_PATH],
+        "config": ["model_training", "compute", "artifacts"],
+        "code": ["src/model_training.py", "src/hyperparameter_search.py", "src/tree_export.py", "src/model_evaluation.py",
+                 "src/drift_monitor.py", "src/stage_metrics.py", "src/thread_budget.py", "src/class_balancing.py",
+                 "src/feature_encoder.py", "src/data_profiler.py", "src/booking_store.py", "config/model_params.py"],
+        "outputs": [MODEL_ENCODER_PATH, DRIFT_REFERENCE_PATH, MODEL_META_PATH, SEEN_ROWS_PATH, MODEL_TREES_PATH,
+                    EVALUATION_DIR, MODEL_PATH]
+    },
+    "leaderboard": {
+        "component": ModelLeaderboard,
+        "inputs": [PROCESSED_TRAIN_PATH, PROCESSED_TEST_PATH],
+        "config": ["leaderboard", "compute", "artifacts"],
+        "code": ["src/model_leaderboard.py", "src/thread_budget.py"],
+        "outputs": [LEADERBOARD_PATH]
+    }
+}
+
+def run_stage(name, config, cache, force):
+    stage = STAGES[name]
+    if cache is not None:
+        # A callable works out its inputs from the config
+        inputs = stage["inputs"](config) if callable(stage["inputs"]) else stage["inputs"]
+        fingerprint = cache.fingerprint(
+            name,
+            inputs,
+            {section: config.get(section) for section in stage["config"]},
+            stage["code"] + SHARED_CODE
+        )
+        if not force and cache.restore(name, fingerprint, stage["outputs"]):
+            logger.info(f"Stage {name} is up to date (fingerprint {fingerprint}), skipping")
+            print(f"DEBUG: {name} unchanged, reused cached outputs.")
+            return
+
+    print(f"DEBUG: Starting {name}...")
+    stage["component"](config).run()
+    print(f"DEBUG: {name} completed.")
+
+    if cache is not None:
+        cache.store(name, fingerprint, stage["outputs"])
+
+def run_training_pipeline(force=False, from_stage=None):
     try:
         print("DEBUG: Starting training pipeline...")
         logger.info("Starting the training pipeline")
         config = read_yaml(CONFIG_PATH)
         print("DEBUG: Config read successfully.")
-        
-        # 1. Data Ingestion
-        print("DEBUG: Starting Data Ingestion...")
-        data_ingestion = DataIngestion(config)
-        data_ingestion.run()
-        print("DEBUG: Data Ingestion completed.")
-        
-        # 2. Data Preprocessing
-        print("DEBUG: Starting Data Preprocessing...")
-        data_preprocessing = DataPreprocessing(config)
-        data_preprocessing.run()
-        print("DEBUG: Data Preprocessing completed.")
-        
-        # 3. Model Training
-        print("DEBUG: Starting Model Training...")
-        model_training = ModelTraining(config)
-        model_training.run()
-        print("DEBUG: Model Training completed.")
-        
+        stage_metrics.configure(config.get("profiling"), PROFILE_DIR)
+        stage_metrics.reset()
+
+        pipeline_config = config.get("pipeline", {})
+        cache = None
+        if pipeline_config.get("cache", False):
+            cache = StageCache(CACHE_DIR, pipeline_config.get("max_cache_entries_per_stage", 3))
+
+        if from_stage is not None and from_stage not in STAGES:
+            raise ValueError(f"Unknown stage '{from_stage}', expected one of {list(STAGES)}")
+
+        # Stages from --from-stage onwards always run
+        forced = force
+        for name in STAGES:
+            forced = forced or name == from_stage
+            run_stage(name, config, cache, forced)
+
         logger.info("Training pipeline completed successfully")
         print("DEBUG: Training pipeline finished successfully!")
     except Exception as e:
         print(f"DEBUG ERROR: {e}")
         logger.error(f"Error while running the training pipeline: {e}")
         raise CustomException(e, sys)
-        logger.error(f"Error while running the training pipeline: {e}")
-        raise CustomException(e, sys)
 
 if __name__ == "__main__":
-    run_training_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the training pipeline")
+    parser.add_argument("--force", action="store_true", help="Ignore the stage cache and rerun every stage")
+    parser.add_argument("--from-stage", choices=list(STAGES), default=None,
+                        help="Rerun this stage and every stage after it")
+    args = parser.parse_args()
+    run_training_pipeline(force=args.force, from_stage=args.from_stage)
@@ -0,0 +1,221 @@
+import os
+import sys
+import gc
+import time
+import random
+import signal
+import socket
+import argparse
+
+# Add project root to path for imports
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Workers share one rotating log file written off the request path
+os.environ.setdefault("LOG_MODE", "async")
+
+from src.logger import get_logger, stop_logging
+
+logger = get_logger("serve")
+
+def process_memory(pid):
+    """RSS, PSS and shared/private memory of a process in MB, from /proc/<pid>/smaps_rollup (Linux)."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_mb": fields.get("Rss", 0) / 1024,
+        "pss_mb": fields.get("Pss", 0) / 1024,
+        "shared_mb": (fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)) / 1024,
+        "private_mb": (fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)) / 1024
+    }
+
+class PreforkServer:
+    """
+    Loads the model once in the master, then forks workers that all accept on
+    one listening socket. The model pages stay shared copy-on-write between
+    the workers (gc.freeze keeps the collector from touching them).
+
+    - Each worker exits after max_requests (+ jitter) requests and is replaced.
+    - When the master sees a new model artifact, it loads it once and replaces
+      the workers one at a time, so capacity never drops to zero.
+    - SIGHUP forces the same rolling restart, SIGTERM/SIGINT stop everything
+      after in-flight requests finish.
+    """
+    def __init__(self, flask_app, model_holder, host="0.0.0.0", port=5000, workers=2,
+                 max_requests=10000, max_requests_jitter=1000, poll_interval=5.0, graceful_timeout=30.0):
+        self.flask_app = flask_app
+        self.model_holder = model_holder
+        self.host = host
+        self.port = port
+        self.num_workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.poll_interval = poll_interval
+        self.graceful_timeout = graceful_timeout
+        self.workers = {}
+        self.sock = None
+        self._running = False
+        self._roll_requested = False
+
+    def _listen(self):
+        sock = socket.create_server((self.host, self.port), backlog=2048)
+        # Workers race for connections; the losers must not block in accept()
+        sock.setblocking(False)
+        sock.set_inheritable(True)
+        return sock
+
+    def _freeze(self):
+        # Objects alive now move to the permanent generation, so collections
+        # in the workers do not write to (and un-share) their pages
+        gc.collect()
+        gc.freeze()
+
+    def _spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._worker_loop()
+            except Exception as e:
+                logger.error(f"Worker {os.getpid()} crashed: {e}")
+                code = 1
+            finally:
+                # os._exit skips atexit, flush the queued records first
+                stop_logging()
+                os._exit(code)
+        self.workers[pid] = time.time()
+        logger.info(f"Started worker {pid}")
+        return pid
+
+    def _worker_loop(self):
+        from werkzeug.serving import make_server
+
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+        server = make_server(self.host, self.port, self.flask_app, fd=self.sock.fileno())
+        server.timeout = 0.5
+        # Only connections this worker accepted count; handle_request() also
+        # returns after a timeout or an accept lost to another worker
+        handled = [0]
+        process_request = server.process_request
+
+        def counted_process_request(request, client_address):
+            handled[0] += 1
+            process_request(request, client_address)
+        server.process_request = counted_process_request
+
+        limit = self.max_requests + random.randint(0, self.max_requests_jitter) if self.max_requests else None
+        while not stopping and (limit is None or handled[0] < limit):
+            server.handle_request()
+        server.socket.close()
+
+    def _stop_worker(self, pid):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        deadline = time.time() + self.graceful_timeout
+        while time.time() < deadline:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+            if done:
+                break
+            time.sleep(0.05)
+        else:
+            logger.warning(f"Worker {pid} did not stop in {self.graceful_timeout}s, killing it")
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.workers.pop(pid, None)
+
+    def _roll_workers(self):
+        self._freeze()
+        for pid in list(self.workers):
+            # New worker first, so there is always someone accepting
+            self._spawn()
+            self._stop_worker(pid)
+        logger.info(f"Replaced all workers, serving model {self.model_holder.info().get('version')}")
+
+    def _reap(self):
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if self.workers.pop(pid, None) is not None and self._running:
+                logger.info(f"Worker {pid} exited ({os.waitstatus_to_exitcode(status)}), replacing it")
+                self._spawn()
+
+    def _request_stop(self, signum, frame):
+        self._running = False
+
+    def _request_roll(self, signum, frame):
+        self._roll_requested = True
+
+    def run(self):
+        # The master polls for new artifacts itself and forks from the reloaded state
+        self.model_holder.stop()
+        if self.model_holder.info().get("loaded") is not True:
+            self.model_holder.load()
+        self.sock = self._listen()
+        self._freeze()
+        self._running = True
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGHUP, self._request_roll)
+
+        for _ in range(self.num_workers):
+            self._spawn()
+        logger.info(f"Serving on {self.host}:{self.port} with {self.num_workers} workers (master {os.getpid()})")
+
+        next_poll = time.time() + self.poll_interval
+        while self._running:
+            time.sleep(0.2)
+            self._reap()
+            reload = False
+            if self.poll_interval and time.time() >= next_poll:
+                next_poll = time.time() + self.poll_interval
+                try:
+                    reload = self.model_holder.maybe_reload()
+                except Exception as e:
+                    # Keep the current workers, try again on the next poll
+                    logger.error(f"Model reload failed: {e}")
+            if reload or self._roll_requested:
+                self._roll_requested = False
+                self._roll_workers()
+
+        logger.info("Shutting down workers")
+        for pid in list(self.workers):
+            self._stop_worker(pid)
+        self.sock.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-fork production server for app.py")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-requests", type=int, default=10000,
+                        help="Recycle a worker after this many requests (0 = never)")
+    parser.add_argument("--max-requests-jitter", type=int, default=1000)
+    parser.add_argument("--poll-interval", type=float, default=5.0,
+                        help="Seconds between checks for a new model artifact")
+    parser.add_argument("--graceful-timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    import app as serving
+    PreforkServer(
+        serving.app, serving.model_holder, host=args.host, port=args.port, workers=args.workers,
+        max_requests=args.max_requests, max_requests_jitter=args.max_requests_jitter,
+        poll_interval=args.poll_interval, graceful_timeout=args.graceful_timeout
+    ).run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import os
+import sys
+import json
+import glob
+from datetime import datetime
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from config.path_config import *
+from utils.common_functions import ChunkedDataWriter, iter_data_chunks
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, one writer at a time is assumed
+    fcntl = None
+
+logger = get_logger(__name__)
+
+PARTITION_FORMATS = {"day": "%Y-%m-%d", "month": "%Y-%m", "year": "%Y"}
+# Partition for rows whose date is missing or unparseable
+UNKNOWN_PARTITION = "unknown"
+
+def key_hashes(keys):
+    # Same stable 64-bit hash the streaming split uses
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+def train_mask(keys, train_ratio):
+    """Rows whose key hash falls in the first train_ratio of the hash space, so each booking keeps its side."""
+    threshold = int(train_ratio * 2 ** 64)
+    if threshold >= 2 ** 64:
+        return np.ones(len(keys), dtype=bool)
+    return key_hashes(keys) < np.uint64(threshold)
+
+class BookingStore:
+    """
+    Append-only booking history. Every append writes one columnar file per
+    reservation-date partition it touches, records the new keys' hashes as a
+    sorted index run and then commits by rewriting the manifest, so a failed
+    append leaves nothing visible. Dedup looks keys up in the memory-mapped
+    index runs (binary search), never in the stored data. Runs are merged
+    size-tiered: the small ones together, the large one only once the rest
+    outgrow it.
+    """
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, config, key="Booking_ID", root=STORE_DIR):
+        self.root = root
+        self.key = key
+        self.date_col = config.get("date_col", "date of reservation")
+        self.date_format = config.get("date_format", "%m/%d/%Y")
+        self.partition_by = config.get("partition_by", "month")
+        if self.partition_by not in PARTITION_FORMATS:
+            raise ValueError(f"Unsupported partition_by '{self.partition_by}', expected one of {list(PARTITION_FORMATS)}")
+        self.max_index_runs = config.get("max_index_runs", 8)
+        self.manifest_path = os.path.join(root, self.MANIFEST_FILE)
+        self.manifest = self._load_manifest()
+        if self.manifest["partition_by"] != self.partition_by:
+            # Existing partitions keep their layout
+            logger.warning(f"Store at {root} is partitioned by {self.manifest['partition_by']}, ignoring partition_by {self.partition_by}")
+            self.partition_by = self.manifest["partition_by"]
+
+    def _load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        return {"next_seq": 1, "partition_by": self.partition_by, "partitions": {}, "index_runs": [], "sources": {}, "batches": []}
+
+    def _save_manifest(self):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    @contextmanager
+    def _writer_lock(self):
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, ".lock"), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Another writer may have committed while we waited
+                self.manifest = self._load_manifest()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @property
+    def last_seq(self):
+        """Sequence number of the last committed append (0 when empty)."""
+        return self.manifest["next_seq"] - 1
+
+    @property
+    def rows(self):
+        return sum(entry["rows"] for entry in self.manifest["partitions"].values())
+
+    def _index_runs(self):
+        return [np.load(os.path.join(self.root, run), mmap_mode="r") for run in self.manifest["index_runs"]]
+
+    @staticmethod
+    def _in_sorted(sorted_hashes, hashes):
+        if len(sorted_hashes) == 0:
+            return np.zeros(len(hashes), dtype=bool)
+        positions = np.minimum(np.searchsorted(sorted_hashes, hashes), len(sorted_hashes) - 1)
+        return sorted_hashes[positions] == hashes
+
+    def contains(self, keys):
+        """True for keys that are already stored."""
+        hashes = key_hashes(keys)
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._index_runs():
+            found |= self._in_sorted(run, hashes)
+        return found
+
+    def partition_labels(self, df):
+        dates = pd.to_datetime(df[self.date_col], format=self.date_format, errors="coerce")
+        return dates.dt.strftime(PARTITION_FORMATS[self.partition_by]).fillna(UNKNOWN_PARTITION).to_numpy()
+
+    def _partition_dir(self, label):
+        return os.path.join("data", f"{self.partition_by}={label}")
+
+    def is_ingested(self, file_path):
+        st = os.stat(file_path)
+        return self.manifest["sources"].get(os.path.abspath(file_path)) == [st.st_size, st.st_mtime_ns]
+
+    def append(self, chunks, source=None):
+        """
+        Appends the bookings (a DataFrame or an iterable of chunks) whose key
+        is not stored yet, as one committed batch. Returns the batch summary.
+        """
+        if isinstance(chunks, pd.DataFrame):
+            chunks = [chunks]
+        try:
+            with self._writer_lock():
+                seq = self.manifest["next_seq"]
+                runs = self._index_runs()
+                writers = {}
+                batch_hashes = []
+                rows_in = 0
+                try:
+                    for chunk in chunks:
+                        rows_in += len(chunk)
+                        hashes = key_hashes(chunk[self.key])
+                        new = ~pd.Series(hashes).duplicated().to_numpy()
+                        for run in runs:
+                            new &= ~self._in_sorted(run, hashes)
+                        if batch_hashes:
+                            new &= ~self._in_sorted(np.sort(np.concatenate(batch_hashes)), hashes)
+                        if not new.any():
+                            continue
+                        batch_hashes.append(hashes[new])
+                        chunk = chunk[new]
+                        labels = self.partition_labels(chunk)
+                        for label, idx in pd.Series(labels).groupby(labels).indices.items():
+                            if label not in writers:
+                                file_name = os.path.join(self._partition_dir(label), f"part-{seq:06d}{ARTIFACT_EXT}")
+                                writers[label] = (file_name, ChunkedDataWriter(os.path.join(self.root, file_name)))
+                            writers[label][1].write(chunk.iloc[idx])
+                finally:
+                    for _, writer in writers.values():
+                        writer.close()
+
+                added = {}
+                for label, (file_name, writer) in sorted(writers.items()):
+                    entry = self.manifest["partitions"].setdefault(label, {"files": [], "rows": 0, "last_seq": 0})
+                    entry["files"].append(file_name)
+                    entry["rows"] += writer.rows
+                    entry["last_seq"] = seq
+                    added[label] = writer.rows
+                if batch_hashes:
+                    run_name = os.path.join("index", f"run-{seq:06d}.npy")
+                    os.makedirs(os.path.join(self.root, "index"), exist_ok=True)
+                    np.save(os.path.join(self.root, run_name), np.sort(np.concatenate(batch_hashes)))
+                    self.manifest["index_runs"].append(run_name)
+                obsolete_runs = self._merge_index_runs(seq)
+
+                summary = {
+                    "seq": seq,
+                    "source": source,
+                    "ingested_at": datetime.now().isoformat(timespec="seconds"),
+                    "rows_in": rows_in,
+                    "rows_added": sum(added.values()),
+                    "duplicates": rows_in - sum(added.values()),
+                    "partitions": added
+                }
+                self.manifest["batches"].append(summary)
+                if source is not None and os.path.exists(source):
+                    st = os.stat(source)
+                    self.manifest["sources"][os.path.abspath(source)] = [st.st_size, st.st_mtime_ns]
+                self.manifest["next_seq"] = seq + 1
+                self._save_manifest()
+                # Merged runs are only dropped once the manifest no longer lists them
+                for run in obsolete_runs:
+                    os.remove(os.path.join(self.root, run))
+                logger.info(
+                    f"Store batch {seq}: {summary['rows_added']} of {rows_in} bookings added to "
+                    f"{len(added)} partitions, {summary['duplicates']} duplicates skipped"
+                )
+                return summary
+        except Exception as e:
+            logger.error(f"Error while appending to the booking store: {e}")
+            raise CustomException(e, sys)
+
+    def _merge_index_runs(self, seq):
+        runs = self.manifest["index_runs"]
+        if len(runs) <= self.max_index_runs:
+            return []
+        loaded = sorted(((run, np.load(os.path.join(self.root, run), mmap_mode="r")) for run in runs),
+                        key=lambda item: len(item[1]), reverse=True)
+        largest, rest = loaded[0], loaded[1:]
+        merged = np.concatenate([values for _, values in rest])
+        if len(merged) >= len(largest[1]):
+            merged, kept = np.concatenate([merged, largest[1]]), []
+        else:
+            kept = [largest[0]]
+        merged_name = os.path.join("index", f"run-{seq:06d}-merged.npy")
+        np.save(os.path.join(self.root, merged_name), np.sort(merged))
+        self.manifest["index_runs"] = kept + [merged_name]
+        return [run for run in runs if run not in kept]
+
+    def partitions(self, since_seq=0):
+        """Partitions with rows appended after batch since_seq (all of them by default)."""
+        return sorted(label for label, entry in self.manifest["partitions"].items() if entry["last_seq"] > since_seq)
+
+    def iter_partition(self, label, chunk_size=100000, columns=None):
+        for file_name in self.manifest["partitions"][label]["files"]:
+            yield from iter_data_chunks(os.path.join(self.root, file_name), chunk_size, columns=columns)
+
+    def read(self, partitions=None, columns=None):
+        labels = self.partitions() if partitions is None else partitions
+        frames = [chunk for label in labels for chunk in self.iter_partition(label, columns=columns)]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    def incoming_files(self, incoming):
+        """Batch CSVs under incoming (a file, directory or glob) that have not been ingested yet."""
+        pattern = os.path.join(incoming, "*.csv") if os.path.isdir(incoming) else incoming
+        return [path for path in sorted(glob.glob(pattern)) if not self.is_ingested(path)]
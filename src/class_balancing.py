@@ -0,0 +1,127 @@
+import sys
+import json
+import time
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+from src.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+TARGET_COL = "booking status"
+
+class ClassBalancer:
+    """
+    Balances the training frame with one of several strategies:
+
+    - smote: exact imblearn SMOTE on the full frame (the original behaviour)
+    - chunked_smote: SMOTE inside random, class-mixed chunks, so neighbour
+      search and its memory are bounded by chunk_size
+    - random_over / random_under: resample row indices, no neighbour search
+    - class_weight: no resampling, training uses class_weight="balanced"
+    """
+    STRATEGIES = ("smote", "chunked_smote", "random_over", "random_under", "class_weight")
+
+    def __init__(self, config):
+        self.strategy = config.get("strategy", "smote")
+        if self.strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown balancing strategy '{self.strategy}', expected one of {self.STRATEGIES}")
+        self.k_neighbors = config.get("k_neighbors", 5)
+        self.chunk_size = config.get("chunk_size", 50000)
+        self.random_state = config.get("random_state", 42)
+        self.report = {}
+
+    @property
+    def class_weight(self):
+        return "balanced" if self.strategy == "class_weight" else None
+
+    def _smote(self, X, y, random_state):
+        from imblearn.over_sampling import SMOTE
+        smote = SMOTE(random_state=random_state, k_neighbors=self.k_neighbors)
+        X_resampled, y_resampled = smote.fit_resample(X, y)
+        balanced_df = pd.DataFrame(X_resampled, columns=X.columns)
+        balanced_df[TARGET_COL] = np.asarray(y_resampled)
+        return balanced_df
+
+    def _random_over(self, df, rng):
+        counts = df[TARGET_COL].value_counts()
+        parts = [np.arange(len(df))]
+        labels = df[TARGET_COL].to_numpy()
+        for label, count in counts.items():
+            missing = counts.max() - count
+            if missing > 0:
+                parts.append(rng.choice(np.flatnonzero(labels == label), size=missing, replace=True))
+        return df.iloc[np.concatenate(parts)].reset_index(drop=True)
+
+    def _random_under(self, df, rng):
+        counts = df[TARGET_COL].value_counts()
+        labels = df[TARGET_COL].to_numpy()
+        keep = [
+            rng.choice(np.flatnonzero(labels == label), size=counts.min(), replace=False)
+            for label in counts.index
+        ]
+        return df.iloc[np.sort(np.concatenate(keep))].reset_index(drop=True)
+
+    def _chunked_smote(self, df, rng):
+        order = rng.permutation(len(df))
+        n_chunks = max(1, int(np.ceil(len(df) / self.chunk_size)))
+        parts = []
+        for i, idx in enumerate(np.array_split(order, n_chunks)):
+            chunk = df.iloc[np.sort(idx)]
+            counts = chunk[TARGET_COL].value_counts()
+            if len(counts) < 2 or counts.min() <= self.k_neighbors:
+                # Too few minority rows for neighbours in this chunk
+                parts.append(self._random_over(chunk, rng))
+                continue
+            X = chunk.drop(columns=[TARGET_COL])
+            parts.append(self._smote(X, chunk[TARGET_COL], self.random_state + i))
+        return pd.concat(parts, ignore_index=True)
+
+    def balance(self, df):
+        try:
+            start = time.perf_counter()
+            rows_before = len(df)
+            rng = np.random.default_rng(self.random_state)
+
+            if self.strategy == "smote":
+                balanced_df = self._smote(df.drop(columns=[TARGET_COL]), df[TARGET_COL], self.random_state)
+            elif self.strategy == "chunked_smote":
+                balanced_df = self._chunked_smote(df, rng)
+            elif self.strategy == "random_over":
+                balanced_df = self._random_over(df, rng)
+            elif self.strategy == "random_under":
+                balanced_df = self._random_under(df, rng)
+            else:
+                balanced_df = df
+
+            elapsed = time.perf_counter() - start
+            self.report = {
+                "strategy": self.strategy,
+                "class_weight": self.class_weight,
+                "time_s": elapsed,
+                "rows_before": rows_before,
+                "rows_after": len(balanced_df),
+                "memory_mb_before": df.memory_usage(deep=True).sum() / (1024 * 1024),
+                "memory_mb_after": balanced_df.memory_usage(deep=True).sum() / (1024 * 1024),
+                "class_counts": {str(k): int(v) for k, v in balanced_df[TARGET_COL].value_counts().items()}
+            }
+            logger.info(
+                f"Balancing with {self.strategy}: {rows_before} -> {len(balanced_df)} rows in {elapsed:.3f}s, "
+                f"{self.report['memory_mb_after']:.1f} MB"
+            )
+            return balanced_df
+        except Exception as e:
+            logger.error(f"Error while balancing with {self.strategy}: {e}")
+            raise CustomException(e, sys)
+
+    def save_report(self, file_path):
+        with open(file_path, "w") as f:
+            json.dump(self.report, f, indent=2)
+
+def load_class_weight(report_path):
+    """Class weight the trainer should use, as decided by the balancing stage."""
+    try:
+        with open(report_path, "r") as f:
+            return json.load(f).get("class_weight")
+    except FileNotFoundError:
+        return None
@@ -1,25 +1,50 @@
 import os
 import sys
+import json
+import glob
 import pandas as pd
 import shutil
+import numpy as np
 from sklearn.model_selection import train_test_split
 from src.logger import get_logger
 from src.custom_exception import CustomException
-from utils.common_functions import read_yaml
+from src.stage_metrics import profile_stage
+from src.booking_store import BookingStore, train_mask
+from utils.common_functions import read_yaml, save_data, ChunkedDataWriter
 from config.path_config import *
 
 logger = get_logger(__name__)
 
+HASH_BITS = 64
+BIN_BITS = 16
+
 class DataIngestion:
+    # In this local setup, we look for data in archive (1)/booking.csv
+    LOCAL_DATA_PATH = "archive (1)/booking.csv"
+
     def __init__(self, config):
         self.config = config["data_ingestion"]
         self.train_ratio = self.config["train_ratio"]
-        # In this local setup, we look for data in archive (1)/booking.csv
-        self.local_data_path = "archive (1)/booking.csv"
+        self.mode = self.config.get("mode", "memory")
+        self.chunk_size = self.config.get("chunk_size", 100000)
+        self.split_key = self.config.get("split_key", "Booking_ID")
+        self.target_col = self.config.get("target_col", "booking status")
+        self.stratify = self.config.get("stratify", True)
+        self.local_data_path = self.LOCAL_DATA_PATH
+        self.store_config = self.config.get("store", {})
+        self.rows_ingested = 0
         
         os.makedirs(os.path.dirname(RAW_FILE_PATH), exist_ok=True)
         logger.info("Data Ingestion Initialized")
          
+    @classmethod
+    def input_paths(cls, config):
+        """What the pipeline cache fingerprints for this stage: the batch directory in store mode."""
+        ingestion_config = config.get("data_ingestion", {})
+        if ingestion_config.get("mode") == "store":
+            return [ingestion_config.get("store", {}).get("incoming", os.path.dirname(cls.LOCAL_DATA_PATH))]
+        return [cls.LOCAL_DATA_PATH]
+
     def ingest_local_data(self):
         try:
             if os.path.exists(self.local_data_path):
@@ -38,18 +63,199 @@ class DataIngestion:
             df = pd.read_csv(RAW_FILE_PATH)
             
             train_df, test_df = train_test_split(df, test_size=1-self.train_ratio, random_state=42)
+            self.rows_ingested = len(df)
             
-            train_df.to_csv(TRAIN_FILE_PATH, index=False)
-            test_df.to_csv(TEST_FILE_PATH, index=False)
+            save_data(train_df, TRAIN_FILE_PATH)
+            save_data(test_df, TEST_FILE_PATH)
             logger.info(f"Data split saved to {TRAIN_FILE_PATH} and {TEST_FILE_PATH}")
         except Exception as e:
             logger.error(f"Error while splitting data: {e}")
             raise CustomException(e, sys)
     
+    def _read_chunks(self, usecols=None):
+        return pd.read_csv(RAW_FILE_PATH, chunksize=self.chunk_size, usecols=usecols)
+
+    def _row_hashes(self, chunk):
+        # Stable 64-bit hash of the key, so a row always lands on the same side
+        return pd.util.hash_pandas_object(chunk[self.split_key], index=False).to_numpy()
+
+    def _train_thresholds(self):
+        """
+        Per-class hash thresholds: rows whose hash is below their class
+        threshold go to train. Without stratification this is just
+        train_ratio of the hash space. With it, each class gets exactly
+        round(train_ratio * count) train rows, found with a histogram of the
+        top hash bits and a second pass over the one boundary bin per class,
+        so memory stays bounded whatever the data size.
+        """
+        default = int(self.train_ratio * 2 ** HASH_BITS)
+        if not self.stratify:
+            return {}, default
+
+        n_bins = 1 << BIN_BITS
+        shift = np.uint64(HASH_BITS - BIN_BITS)
+        histograms = {}
+        for chunk in self._read_chunks(usecols=[self.split_key, self.target_col]):
+            bins = (self._row_hashes(chunk) >> shift).astype(np.int64)
+            for label, idx in chunk.groupby(self.target_col).indices.items():
+                if label not in histograms:
+                    histograms[label] = np.zeros(n_bins, dtype=np.int64)
+                histograms[label] += np.bincount(bins[idx], minlength=n_bins)
+
+        boundaries = {}
+        for label, counts in histograms.items():
+            quota = int(round(self.train_ratio * counts.sum()))
+            cumulative = np.cumsum(counts)
+            boundary_bin = int(np.searchsorted(cumulative, quota, side="left"))
+            before = int(cumulative[boundary_bin - 1]) if boundary_bin > 0 else 0
+            boundaries[label] = (boundary_bin, quota - before)
+
+        in_boundary = {label: [] for label in boundaries}
+        for chunk in self._read_chunks(usecols=[self.split_key, self.target_col]):
+            hashes = self._row_hashes(chunk)
+            bins = (hashes >> shift).astype(np.int64)
+            for label, idx in chunk.groupby(self.target_col).indices.items():
+                boundary_bin = boundaries[label][0]
+                in_boundary[label].append(hashes[idx][bins[idx] == boundary_bin])
+
+        thresholds = {}
+        for label, (boundary_bin, needed) in boundaries.items():
+            values = np.sort(np.concatenate(in_boundary[label]))
+            if needed < len(values):
+                thresholds[label] = int(values[needed])
+            else:
+                thresholds[label] = (boundary_bin + 1) << (HASH_BITS - BIN_BITS)
+        return thresholds, default
+
+    @staticmethod
+    def _below(hashes, threshold):
+        if threshold >= 2 ** HASH_BITS:
+            return np.ones(len(hashes), dtype=bool)
+        return hashes < np.uint64(threshold)
+
+    def split_data_streaming(self):
+        try:
+            logger.info(f"Streaming split of {RAW_FILE_PATH} in chunks of {self.chunk_size} rows")
+            thresholds, default = self._train_thresholds()
+
+            with ChunkedDataWriter(TRAIN_FILE_PATH) as train_writer, ChunkedDataWriter(TEST_FILE_PATH) as test_writer:
+                for chunk in self._read_chunks():
+                    hashes = self._row_hashes(chunk)
+                    is_train = self._below(hashes, default)
+                    if thresholds:
+                        labels = chunk[self.target_col].to_numpy()
+                        for label, threshold in thresholds.items():
+                            rows = labels == label
+                            is_train[rows] = self._below(hashes[rows], threshold)
+                    train_writer.write(chunk[is_train])
+                    test_writer.write(chunk[~is_train])
+
+            self.rows_ingested = train_writer.rows + test_writer.rows
+            logger.info(f"Streaming split wrote {train_writer.rows} train and {test_writer.rows} test rows")
+        except Exception as e:
+            logger.error(f"Error while splitting data in streaming mode: {e}")
+            raise CustomException(e, sys)
+
+    def ingest_to_store(self):
+        """Appends every batch file not ingested yet; returns the store and the number of rows added."""
+        try:
+            store = BookingStore(self.store_config, key=self.split_key)
+            incoming = self.store_config.get("incoming", os.path.dirname(self.local_data_path))
+            rows_added = 0
+            for path in store.incoming_files(incoming):
+                logger.info(f"Appending {path} to the booking store in chunks of {self.chunk_size} rows")
+                summary = store.append(pd.read_csv(path, chunksize=self.chunk_size), source=path)
+                rows_added += summary["rows_added"]
+            logger.info(f"Booking store holds {store.rows} bookings in {len(store.partitions())} partitions")
+            return store, rows_added
+        except Exception as e:
+            logger.error(f"Error while ingesting into the booking store: {e}")
+            raise CustomException(e, sys)
+
+    def split_from_store(self, store, since_seq=0):
+        """
+        Writes the train/test rows of every store partition appended to after
+        batch since_seq, one file per partition and side, so a new batch only
+        rewrites the partitions it touched. The side of each booking is fixed
+        by its key hash, so earlier bookings never move between train and test
+        as new batches arrive (no stratification).
+        """
+        try:
+            if since_seq == 0 and os.path.exists(STORE_SPLIT_DIR):
+                shutil.rmtree(STORE_SPLIT_DIR)
+            labels = store.partitions(since_seq)
+            train_rows = test_rows = 0
+            for label in labels:
+                with ChunkedDataWriter(self._store_split_file("train", label)) as train_writer, \
+                        ChunkedDataWriter(self._store_split_file("test", label)) as test_writer:
+                    for chunk in store.iter_partition(label, self.chunk_size):
+                        is_train = train_mask(chunk[self.split_key], self.train_ratio)
+                        # Small partitions can fall entirely on one side
+                        if is_train.any():
+                            train_writer.write(chunk[is_train])
+                        if not is_train.all():
+                            test_writer.write(chunk[~is_train])
+                train_rows += train_writer.rows
+                test_rows += test_writer.rows
+            self.rows_ingested = train_rows + test_rows
+            with open(STORE_SPLIT_PATH, "w") as f:
+                json.dump(self._store_split_state(store), f)
+            logger.info(
+                f"Store split wrote {train_rows} train and {test_rows} test rows "
+                f"from {len(labels)} of {len(store.partitions())} partitions"
+            )
+        except Exception as e:
+            logger.error(f"Error while splitting the booking store: {e}")
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def _store_split_file(side, label):
+        return os.path.join(STORE_SPLIT_DIR, side, f"{label}{ARTIFACT_EXT}")
+
+    @staticmethod
+    def split_paths(config):
+        """Train and test files this stage writes: one per store partition in store mode."""
+        if config.get("data_ingestion", {}).get("mode") == "store":
+            return tuple(sorted(glob.glob(os.path.join(STORE_SPLIT_DIR, side, f"*{ARTIFACT_EXT}"))) for side in ("train", "test"))
+        return [TRAIN_FILE_PATH], [TEST_FILE_PATH]
+
+    def _store_split_state(self, store):
+        return {"store_seq": store.last_seq, "train_ratio": self.train_ratio, "split_key": self.split_key}
+
+    def run_store(self):
+        store, _ = self.ingest_to_store()
+        # The splits record the store batch they were written from; with the
+        # same ratio and key only partitions appended to since then are split
+        since_seq = 0
+        if os.path.exists(STORE_SPLIT_PATH) and os.path.isdir(STORE_SPLIT_DIR):
+            with open(STORE_SPLIT_PATH, "r") as f:
+                state = json.load(f)
+            current = self._store_split_state(store)
+            if state == current:
+                logger.info("No new bookings, keeping the existing train/test splits")
+                return
+            if {**state, "store_seq": current["store_seq"]} == current and state["store_seq"] < current["store_seq"]:
+                since_seq = state["store_seq"]
+        # Removed first, so a split that fails part way is redone in full
+        if os.path.exists(STORE_SPLIT_PATH):
+            os.remove(STORE_SPLIT_PATH)
+        self.split_from_store(store, since_seq)
+
+    @profile_stage("data_ingestion", rows_attr="rows_ingested")
     def run(self):
         try:
+            if self.mode == "store":
+                self.run_store()
+                logger.info("Data Ingestion run completed")
+                return
             self.ingest_local_data()
-            self.split_data()
+            # The splits below no longer match the store
+            if os.path.exists(STORE_SPLIT_PATH):
+                os.remove(STORE_SPLIT_PATH)
+            if self.mode == "streaming":
+                self.split_data_streaming()
+            else:
+                self.split_data()
             logger.info("Data Ingestion run completed")
         except Exception as e:
             logger.error("Error in data ingestion run")
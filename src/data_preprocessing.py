@@ -2,13 +2,18 @@ import os
 import sys
 import pandas as pd
 import numpy as np 
-from sklearn.preprocessing import LabelEncoder
-from sklearn.ensemble import RandomForestClassifier
-from imblearn.over_sampling import SMOTE
+from sklearn.model_selection import train_test_split
 from src.logger import get_logger
+from src.data_ingestion import DataIngestion
+from src.feature_encoder import FeatureEncoder
+from src.data_profiler import DataProfile
+from src.feature_selection import FeatureSelector
+from src.class_balancing import ClassBalancer
+from src.thread_budget import ThreadBudget
+from src.stage_metrics import profile_stage
 from config.path_config import *
 from src.custom_exception import CustomException
-from utils.common_functions import load_data, read_yaml
+from utils.common_functions import load_data, save_data, read_yaml
 
 logger = get_logger(__name__)
 
@@ -19,10 +24,20 @@ class DataPreprocessing:
         self.num_cols = self.config["data_processing"]["numerical_cols"]
         self.skew_threshold = self.config["data_processing"]["skew_threshold"]
         self.num_features_to_select = self.config["data_processing"]["num_features_to_select"]
+        self.validation_fraction = self.config["data_processing"].get("validation_fraction", 0.2)
+        self.encoder = FeatureEncoder(self.cat_cols, self.num_cols, self.skew_threshold)
+        self.balancer = ClassBalancer(self.config["data_processing"].get("balancing", {}))
+        self.selector = FeatureSelector(
+            self.config["data_processing"].get("feature_selection", {}),
+            self.num_features_to_select,
+            cache_path=FEATURE_IMPORTANCE_CACHE_PATH,
+            categorical_cols=self.cat_cols,
+            thread_budget=ThreadBudget(self.config.get("compute"))
+        )
         
-    def preprocess_df(self, df):
+    @profile_stage("clean_df")
+    def clean_df(self, df):
         try:
-            logger.info("Preprocessing dataframe")
             df = df.copy()
             
             # Drop unnecessary columns
@@ -34,51 +49,56 @@ class DataPreprocessing:
             
             # Fill missing values if any
             df.fillna(method='ffill', inplace=True)
+            return df.reset_index(drop=True)
+        except Exception as e:
+            logger.error(f"Error while cleaning dataframe: {e}")
+            raise CustomException(e, sys)
 
-            # Label Encoding
-            le = LabelEncoder()
-            for col in self.cat_cols:
-                if col in df.columns:
-                    df[col] = le.fit_transform(df[col].astype(str))
-            
-            # Skewness Handling
-            for col in self.num_cols:
-                if col in df.columns:
-                    if df[col].skew() > self.skew_threshold:
-                        df[col] = np.log1p(df[col])
+    def split_validation(self, df):
+        """
+        Holds out validation_fraction of the cleaned train rows (stratified)
+        before balancing, so the operating threshold is picked on real class
+        proportions and never on the test set.
+        """
+        if not self.validation_fraction:
+            return df, df.iloc[:0]
+        train, validation = train_test_split(
+            df, test_size=self.validation_fraction, random_state=42, stratify=df["booking status"]
+        )
+        logger.info(f"Held out {len(validation)} of {len(df)} train rows for validation")
+        return train.reset_index(drop=True), validation.reset_index(drop=True)
+
+    @profile_stage("preprocess_df")
+    def preprocess_df(self, df, fit=False, profile=None):
+        """Encodes a cleaned dataframe (clean_df)."""
+        try:
+            logger.info("Preprocessing dataframe")
+
+            # Label Encoding + Skewness Handling, learned on train only and
+            # reused for test and serving
+            if fit:
+                self.encoder.fit(df, profile=profile)
+            df = self.encoder.transform(df)
             
             return df
         except Exception as e:
             logger.error(f"Error while preprocessing dataframe: {e}")
             raise CustomException(e, sys)
     
+    @profile_stage("balance_data")
     def balance_data(self, df):
         try:
-            logger.info("Balancing the data using SMOTE")
-            X = df.drop(columns=["booking status"])
-            y = df["booking status"]
-            
-            smote = SMOTE(random_state=42)
-            X_resampled, y_resampled = smote.fit_resample(X, y)
-            
-            balanced_df = pd.DataFrame(X_resampled, columns=X.columns)
-            balanced_df["booking status"] = y_resampled
-            return balanced_df
+            logger.info(f"Balancing the data using {self.balancer.strategy}")
+            return self.balancer.balance(df)
         except Exception as e:
             logger.error(f"Error while balancing data: {e}")
             raise CustomException(e, sys) 
             
+    @profile_stage("feature_selection")
     def feature_selection(self, df):
         try:
-            logger.info("Performing feature selection using RandomForest")
-            X = df.drop(columns=["booking status"])
-            y = df["booking status"]
-            
-            model = RandomForestClassifier(random_state=42)
-            model.fit(X, y)
-            
-            feature_importance = pd.Series(model.feature_importances_, index=X.columns)
-            top_features = feature_importance.nlargest(self.num_features_to_select).index.tolist()
+            logger.info(f"Performing feature selection using {self.selector.method}")
+            top_features = self.selector.select(df)
             
             logger.info(f"Top {self.num_features_to_select} features selected: {top_features}")
             return df[top_features + ["booking status"]]
@@ -89,12 +109,24 @@ class DataPreprocessing:
     def run(self):
         try:
             logger.info("Data preprocessing started")
-            # Load raw train/test split from ingestion
-            train = load_data(TRAIN_FILE_PATH)
-            test = load_data(TEST_FILE_PATH)
-            
-            # Preprocess
-            train = self.preprocess_df(train)
+            # Load raw train/test split from ingestion (one file per partition in store mode)
+            train_paths, test_paths = DataIngestion.split_paths(self.config)
+            train = pd.concat([load_data(path) for path in train_paths], ignore_index=True)
+            test = pd.concat([load_data(path) for path in test_paths], ignore_index=True)
+
+            # Skew decisions come from the train profile instead of rescanning the columns
+            profile = None
+            if os.path.exists(TRAIN_DATA_PROFILE_PATH):
+                profile = DataProfile.load(TRAIN_DATA_PROFILE_PATH)
+            else:
+                logger.warning(f"No data profile at {TRAIN_DATA_PROFILE_PATH}, measuring skew on the train data")
+            
+            # Clean, hold out validation rows and encode
+            train, validation = self.split_validation(self.clean_df(train))
+            test = self.clean_df(test)
+            validation_rows, test_rows = validation, test
+            train = self.preprocess_df(train, fit=True, profile=profile)
+            validation = self.preprocess_df(validation)
             test = self.preprocess_df(test)
             
             # Balance (only train usually, but following original logic for now)
@@ -106,11 +138,19 @@ class DataPreprocessing:
             # Match test columns to train selected columns
             columns_to_keep = train_selected.columns.tolist()
             test_selected = test[columns_to_keep]
+            validation_selected = validation[columns_to_keep]
+            self.encoder.set_features([col for col in columns_to_keep if col != "booking status"])
             
             # Save
             os.makedirs(PROCESSED_DIR, exist_ok=True)
-            train_selected.to_csv(PROCESSED_TRAIN_PATH, index=False)
-            test_selected.to_csv(PROCESSED_TEST_PATH, index=False)
+            save_data(train_selected, PROCESSED_TRAIN_PATH)
+            save_data(test_selected, PROCESSED_TEST_PATH)
+            save_data(validation_selected, PROCESSED_VALIDATION_PATH)
+            save_data(validation_rows, VALIDATION_ROWS_PATH)
+            save_data(test_rows, TEST_ROWS_PATH)
+            self.encoder.save(ENCODER_PATH)
+            self.selector.save_report(FEATURE_SELECTION_REPORT_PATH)
+            self.balancer.save_report(BALANCING_REPORT_PATH)
             
             logger.info("Data preprocessing completed and saved")
         except Exception as e:
@@ -0,0 +1,460 @@
+import os
+import sys
+import json
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.thread_budget import ThreadBudget
+from src.stage_metrics import profile_stage
+from src.booking_store import BookingStore, train_mask
+from config.path_config import *
+from utils.common_functions import iter_data_chunks
+
+logger = get_logger(__name__)
+
+QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+def _category_key(value):
+    # Same keys FeatureEncoder gets from astype(str) on an integer column
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+class ColumnProfile:
+    """
+    Mergeable summary of one column. Numeric columns keep the count, central
+    moments (mean, variance, skew), min/max and at most quantile_bins
+    (value, count) centroids for quantiles; these stay exact while the column
+    has no more distinct values than that. Text columns keep value
+    frequencies, only the max_categories most frequent ones past that.
+    """
+    def __init__(self, kind, quantile_bins=1024, max_categories=1000):
+        self.kind = kind
+        self.quantile_bins = quantile_bins
+        self.max_categories = max_categories
+        self.count = 0
+        self.nulls = 0
+        # Non-null values of a numeric column that are not numbers
+        self.invalid = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.min = None
+        self.max = None
+        self.values = np.empty(0)
+        self.weights = np.empty(0, dtype=np.int64)
+        self.exact = True
+        self.frequencies = {}
+        # Rows in categories dropped once there were more than max_categories
+        self.other = 0
+
+    @classmethod
+    def from_series(cls, series, kind, quantile_bins=1024, max_categories=1000):
+        column = cls(kind, quantile_bins, max_categories)
+        if kind == "numeric":
+            values = pd.to_numeric(series, errors="coerce")
+            column.nulls = int(series.isna().sum())
+            column.invalid = int(values.isna().sum()) - column.nulls
+            values, weights = np.unique(values.dropna().to_numpy(dtype=float), return_counts=True)
+            column._add_weighted(values, weights)
+        else:
+            column.nulls = int(series.isna().sum())
+            values = series.dropna()
+            if pd.api.types.is_float_dtype(values.dtype) and (values % 1 == 0).all():
+                values = values.astype(np.int64)
+            counts = values.astype(str).value_counts()
+            column.count = int(counts.sum())
+            column.frequencies = {key: int(n) for key, n in counts.items()}
+            column._cap_categories()
+        return column
+
+    def _add_weighted(self, values, weights):
+        n = int(weights.sum())
+        if n == 0:
+            return
+        mean = float(np.dot(weights, values) / n)
+        deviations = values - mean
+        m2 = float(np.dot(weights, deviations ** 2))
+        m3 = float(np.dot(weights, deviations ** 3))
+        self._merge_moments(n, mean, m2, m3)
+        self.min = float(values.min()) if self.min is None else min(self.min, float(values.min()))
+        self.max = float(values.max()) if self.max is None else max(self.max, float(values.max()))
+        self._merge_bins(values, weights, exact=True)
+
+    def _merge_moments(self, n_b, mean_b, m2_b, m3_b):
+        # Pairwise update of the central moments (Chan et al. / Pebay), so
+        # chunk summaries combine in any order to the full-data moments
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.m3 = (self.m3 + m3_b + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2
+                   + 3 * delta * (n_a * m2_b - n_b * self.m2) / n)
+        self.m2 = self.m2 + m2_b + delta ** 2 * n_a * n_b / n
+        self.mean = self.mean + delta * n_b / n
+        self.count = n
+
+    def _merge_bins(self, values, weights, exact):
+        values = np.concatenate([self.values, values])
+        weights = np.concatenate([self.weights, weights])
+        values, inverse = np.unique(values, return_inverse=True)
+        weights = np.bincount(inverse, weights=weights).astype(np.int64)
+        self.exact = self.exact and exact
+        if len(values) > self.quantile_bins:
+            # Equal-count centroids: sorted values are grouped by rank into
+            # quantile_bins groups, each replaced by its weighted mean
+            starts = np.cumsum(weights) - weights
+            groups = (starts * self.quantile_bins // weights.sum()).astype(np.int64)
+            grouped = np.bincount(groups, weights=weights)
+            keep = grouped > 0
+            values = (np.bincount(groups, weights=weights * values)[keep] / grouped[keep])
+            weights = grouped[keep].astype(np.int64)
+            self.exact = False
+        self.values = values
+        self.weights = weights
+
+    def _cap_categories(self):
+        if len(self.frequencies) <= self.max_categories:
+            return
+        ranked = sorted(self.frequencies.items(), key=lambda item: item[1], reverse=True)
+        self.other += sum(n for _, n in ranked[self.max_categories:])
+        self.frequencies = dict(ranked[:self.max_categories])
+
+    def as_numeric(self):
+        """Numeric version of a text summary, e.g. a numeric column one CSV chunk read as text."""
+        if self.kind == "numeric":
+            return self
+        column = ColumnProfile("numeric", self.quantile_bins, self.max_categories)
+        column.nulls = self.nulls
+        column.invalid = self.other
+        values, weights = [], []
+        for key, n in self.frequencies.items():
+            try:
+                values.append(float(key))
+                weights.append(n)
+            except ValueError:
+                column.invalid += n
+        if values:
+            values, weights = np.array(values), np.array(weights, dtype=np.int64)
+            order = np.argsort(values)
+            column._add_weighted(values[order], weights[order])
+            column.exact = self.other == 0
+        return column
+
+    def merge(self, other):
+        """Merges other into this summary and returns the result (numeric wins over text)."""
+        if self.kind != other.kind:
+            return self.as_numeric().merge(other.as_numeric())
+        self.nulls += other.nulls
+        self.invalid += other.invalid
+        if self.kind == "numeric":
+            if other.count:
+                self._merge_moments(other.count, other.mean, other.m2, other.m3)
+                self.min = other.min if self.min is None else min(self.min, other.min)
+                self.max = other.max if self.max is None else max(self.max, other.max)
+                self._merge_bins(other.values, other.weights, other.exact)
+        else:
+            self.count += other.count
+            self.other += other.other
+            for key, n in other.frequencies.items():
+                self.frequencies[key] = self.frequencies.get(key, 0) + n
+            self._cap_categories()
+        return self
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else None
+
+    @property
+    def skew(self):
+        """Adjusted Fisher-Pearson skewness, as pandas Series.skew computes it."""
+        if self.kind != "numeric" or self.count < 3:
+            return None
+        if self.m2 <= 1e-14 * self.count * max(1.0, self.mean ** 2):
+            return 0.0
+        n = self.count
+        return math.sqrt(n * (n - 1)) / (n - 2) * (self.m3 / n) / (self.m2 / n) ** 1.5
+
+    def quantile(self, q):
+        """Linear-interpolated quantile, exact while the histogram is exact."""
+        if self.kind != "numeric" or self.count == 0:
+            return None
+        cumulative = np.cumsum(self.weights)
+        rank = q * (self.count - 1)
+        lower = self.values[np.searchsorted(cumulative, math.floor(rank), side="right")]
+        upper = self.values[np.searchsorted(cumulative, math.ceil(rank), side="right")]
+        value = lower + (upper - lower) * (rank - math.floor(rank))
+        return float(min(max(value, self.min), self.max))
+
+    def category_counts(self):
+        """{category: rows} with the keys astype(str) gives, or None when not known exactly."""
+        if self.kind == "numeric":
+            if not self.exact or self.invalid:
+                return None
+            return {_category_key(float(v)): int(n) for v, n in zip(self.values, self.weights)}
+        return None if self.other else dict(self.frequencies)
+
+    def code_skew(self, classes):
+        """Skew of the column after label encoding with the given category order (unknown -> -1)."""
+        counts = self.category_counts()
+        if counts is None:
+            return None
+        codes = {cls: code for code, cls in enumerate(classes)}
+        column = ColumnProfile("numeric")
+        values = np.array([codes.get(key, -1) for key in counts], dtype=float)
+        weights = np.array(list(counts.values()), dtype=np.int64)
+        order = np.argsort(values, kind="stable")
+        column._add_weighted(values[order], weights[order])
+        return column.skew
+
+    def summary(self):
+        summary = {"kind": self.kind, "count": self.count, "nulls": self.nulls}
+        if self.kind == "numeric":
+            summary.update({
+                "invalid": self.invalid,
+                "min": self.min,
+                "max": self.max,
+                "mean": self.mean if self.count else None,
+                "std": self.std,
+                "skew": self.skew,
+                "distinct": len(self.values) if self.exact else None,
+                "quantiles": {str(q): self.quantile(q) for q in QUANTILES}
+            })
+        else:
+            top = sorted(self.frequencies.items(), key=lambda item: item[1], reverse=True)[:10]
+            summary.update({
+                "distinct": len(self.frequencies) if not self.other else None,
+                "top": dict(top)
+            })
+        return summary
+
+    def to_dict(self):
+        state = {
+            "kind": self.kind,
+            "quantile_bins": self.quantile_bins,
+            "max_categories": self.max_categories,
+            "count": self.count,
+            "nulls": self.nulls,
+            "invalid": self.invalid,
+            "summary": self.summary()
+        }
+        if self.kind == "numeric":
+            state.update({
+                "mean": self.mean, "m2": self.m2, "m3": self.m3, "min": self.min, "max": self.max,
+                "exact": self.exact, "values": self.values.tolist(), "weights": self.weights.tolist()
+            })
+        else:
+            state.update({"frequencies": self.frequencies, "other": self.other})
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        column = cls(state["kind"], state["quantile_bins"], state["max_categories"])
+        column.count = state["count"]
+        column.nulls = state["nulls"]
+        column.invalid = state["invalid"]
+        if column.kind == "numeric":
+            column.mean, column.m2, column.m3 = state["mean"], state["m2"], state["m3"]
+            column.min, column.max = state["min"], state["max"]
+            column.exact = state["exact"]
+            column.values = np.array(state["values"], dtype=float)
+            column.weights = np.array(state["weights"], dtype=np.int64)
+        else:
+            column.frequencies = state["frequencies"]
+            column.other = state["other"]
+        return column
+
+class DataProfile:
+    """Per-column summaries of a dataset; profiles of disjoint chunks merge into the profile of their union."""
+    def __init__(self, columns=None, rows=0, sources=None):
+        self.columns = columns or {}
+        self.rows = rows
+        self.sources = list(sources or [])
+
+    def merge(self, other):
+        for name, column in other.columns.items():
+            if name in self.columns:
+                self.columns[name] = self.columns[name].merge(column)
+            else:
+                self.columns[name] = column
+        self.rows += other.rows
+        self.sources.extend(other.sources)
+        return self
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def summary(self):
+        return {name: column.summary() for name, column in self.columns.items()}
+
+    def to_dict(self):
+        return {
+            "rows": self.rows,
+            "sources": self.sources,
+            "columns": {name: column.to_dict() for name, column in self.columns.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        columns = {name: ColumnProfile.from_dict(column) for name, column in state["columns"].items()}
+        return cls(columns, state["rows"], state.get("sources"))
+
+    def save(self, file_path):
+        try:
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            tmp_path = f"{file_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.to_dict(), f)
+            os.replace(tmp_path, file_path)
+            logger.info(f"Data profile saved to {file_path}")
+        except Exception as e:
+            logger.error(f"Error while saving data profile: {e}")
+            raise CustomException(e, sys)
+
+    @classmethod
+    def load(cls, file_path):
+        try:
+            with open(file_path, "r") as f:
+                return cls.from_dict(json.load(f))
+        except Exception as e:
+            logger.error(f"Error while loading data profile from {file_path}: {e}")
+            raise CustomException(e, sys)
+
+def _profile_file_in_worker(config, file_path):
+    return DataProfiler(config).profile_file(file_path).to_dict()
+
+class DataProfiler:
+    """
+    Builds DataProfiles in one streaming pass over chunked data. Each chunk
+    is summarized independently and merged, so memory is bounded by the
+    chunk size and separate files can be profiled in parallel processes.
+    """
+    def __init__(self, config):
+        self.full_config = config
+        self.config = config.get("data_profile", {})
+        self.chunk_size = self.config.get("chunk_size", 100000)
+        self.quantile_bins = self.config.get("quantile_bins", 1024)
+        self.max_categories = self.config.get("max_categories", 1000)
+        # Read as numbers even when a chunk infers text; other columns go by dtype
+        self.numeric_cols = set(self.config.get("numeric_cols") or [])
+        self.workers = self.config.get("workers")
+        self.rows_profiled = 0
+
+    def _kind(self, name, series):
+        if name in self.numeric_cols:
+            return "numeric"
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            return "numeric"
+        return "categorical"
+
+    def profile_chunk(self, df, source=None):
+        columns = {
+            name: ColumnProfile.from_series(df[name], self._kind(name, df[name]), self.quantile_bins, self.max_categories)
+            for name in df.columns
+        }
+        return DataProfile(columns, len(df), [source] if source else None)
+
+    def profile_chunks(self, chunks, source=None):
+        profile = DataProfile(sources=[source] if source else None)
+        for chunk in chunks:
+            profile.merge(self.profile_chunk(chunk))
+        return profile
+
+    def profile_frame(self, df, source=None):
+        chunks = (df.iloc[start:start + self.chunk_size] for start in range(0, len(df), self.chunk_size))
+        return self.profile_chunks(chunks, source)
+
+    def profile_file(self, file_path):
+        try:
+            logger.info(f"Profiling {file_path} in chunks of {self.chunk_size} rows")
+            return self.profile_chunks(iter_data_chunks(file_path, self.chunk_size), source=file_path)
+        except Exception as e:
+            logger.error(f"Error while profiling {file_path}: {e}")
+            raise CustomException(e, sys)
+
+    def profile_each(self, file_paths, workers=None):
+        """One profile per file, the files spread over worker processes."""
+        try:
+            if workers is None:
+                workers, _ = ThreadBudget({**(self.full_config.get("compute") or {}), "search_workers": self.workers}).split(len(file_paths))
+            if workers <= 1 or len(file_paths) <= 1:
+                return [self.profile_file(path) for path in file_paths]
+            config = {"data_profile": self.config}
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                states = list(pool.map(_profile_file_in_worker, [config] * len(file_paths), file_paths))
+            return [DataProfile.from_dict(state) for state in states]
+        except Exception as e:
+            logger.error(f"Error while profiling files: {e}")
+            raise CustomException(e, sys)
+
+    def profile_files(self, file_paths, workers=None):
+        """Profile of the concatenation of the files (e.g. the chunk files of one dataset)."""
+        profile = DataProfile()
+        for file_profile in self.profile_each(file_paths, workers):
+            profile.merge(file_profile)
+        return profile
+
+    def profile_store(self, store, key, train_ratio):
+        """
+        Train/test profiles of the booking store, merged from per-partition
+        profiles. Only partitions appended to since their profile was cached
+        are read again.
+        """
+        try:
+            settings = {"train_ratio": train_ratio, "quantile_bins": self.quantile_bins,
+                        "max_categories": self.max_categories, "numeric_cols": sorted(self.numeric_cols)}
+            train_profile = DataProfile(sources=[os.path.join(STORE_SPLIT_DIR, "train")])
+            test_profile = DataProfile(sources=[os.path.join(STORE_SPLIT_DIR, "test")])
+            refreshed = 0
+            for label in store.partitions():
+                last_seq = store.manifest["partitions"][label]["last_seq"]
+                cache_path = os.path.join(STORE_PROFILE_DIR, f"{label}.json")
+                cached = None
+                if os.path.exists(cache_path):
+                    with open(cache_path, "r") as f:
+                        cached = json.load(f)
+                if cached is None or cached["last_seq"] != last_seq or cached["settings"] != settings:
+                    train_part, test_part = DataProfile(), DataProfile()
+                    for chunk in store.iter_partition(label, self.chunk_size):
+                        is_train = train_mask(chunk[key], train_ratio)
+                        train_part.merge(self.profile_chunk(chunk[is_train]))
+                        test_part.merge(self.profile_chunk(chunk[~is_train]))
+                    cached = {"last_seq": last_seq, "settings": settings,
+                              "train": train_part.to_dict(), "test": test_part.to_dict()}
+                    os.makedirs(STORE_PROFILE_DIR, exist_ok=True)
+                    with open(f"{cache_path}.tmp", "w") as f:
+                        json.dump(cached, f)
+                    os.replace(f"{cache_path}.tmp", cache_path)
+                    refreshed += 1
+                train_profile.merge(DataProfile.from_dict(cached["train"]))
+                test_profile.merge(DataProfile.from_dict(cached["test"]))
+            logger.info(f"Profiled {refreshed} changed of {len(store.partitions())} store partitions")
+            return train_profile, test_profile
+        except Exception as e:
+            logger.error(f"Error while profiling the booking store: {e}")
+            raise CustomException(e, sys)
+
+    @profile_stage("data_profile", rows_attr="rows_profiled")
+    def run(self):
+        try:
+            ingestion_config = self.full_config.get("data_ingestion", {})
+            if ingestion_config.get("mode") == "store":
+                store = BookingStore(ingestion_config.get("store", {}), key=ingestion_config.get("split_key", "Booking_ID"))
+                train_profile, test_profile = self.profile_store(
+                    store, store.key, ingestion_config.get("train_ratio", 0.8)
+                )
+            else:
+                train_profile, test_profile = self.profile_each([TRAIN_FILE_PATH, TEST_FILE_PATH])
+            train_profile.save(TRAIN_DATA_PROFILE_PATH)
+            test_profile.save(TEST_DATA_PROFILE_PATH)
+            self.rows_profiled = train_profile.rows + test_profile.rows
+            logger.info(f"Profiled {train_profile.rows} train and {test_profile.rows} test rows")
+        except Exception as e:
+            logger.error(f"Error in data profiling run: {e}")
+            raise CustomException(e, sys)
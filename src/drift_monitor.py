@@ -0,0 +1,269 @@
+# Online drift monitoring for served traffic. Training saves a reference with
+# fixed bins per monitored feature (from the train data profile) and for the
+# predicted probability (from the test set). Each serving process counts its
+# requests into the same bins and scores every window against the reference
+# with PSI and a binned KS statistic. Only NumPy and the standard library are
+# used so slim serving can load it.
+import os
+import json
+import time
+import bisect
+import threading
+import numpy as np
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROBABILITY_EDGES = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+# Floor for empty bins so PSI stays finite
+EPSILON = 1e-4
+
+def _category_key(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+def _proportions(counts):
+    counts = np.asarray(counts, dtype=float)
+    total = counts.sum()
+    return counts / total if total else counts
+
+def build_drift_reference(profile, features, scores, bins=10, max_categories=50):
+    """
+    Reference for DriftMonitor from the train DataProfile and the test-set
+    probabilities of the positive label. Numeric features get one bin per
+    value when they have at most `bins` distinct values, otherwise bins
+    between their quantiles. Categorical features keep their
+    max_categories most frequent values plus an "other" bin.
+    """
+    reference = {"features": {}, "created_at": time.time()}
+    for name in features:
+        if name not in profile:
+            continue
+        column = profile[name]
+        if column.kind == "numeric":
+            if column.exact and len(column.values) <= bins:
+                edges = ((column.values[1:] + column.values[:-1]) / 2).tolist()
+            else:
+                edges = sorted({column.quantile(i / bins) for i in range(1, bins)})
+            # Bin i holds values in (edges[i-1], edges[i]], as bisect_left assigns them
+            index = np.searchsorted(np.asarray(edges), column.values, side="left")
+            counts = np.bincount(index, weights=column.weights, minlength=len(edges) + 1)
+            reference["features"][name] = {
+                "type": "numeric", "edges": edges, "expected": _proportions(counts).tolist()
+            }
+        else:
+            ranked = sorted(column.frequencies.items(), key=lambda item: item[1], reverse=True)
+            categories = [key for key, _ in ranked[:max_categories]]
+            other = sum(n for _, n in ranked[max_categories:]) + column.other
+            counts = [n for _, n in ranked[:max_categories]] + [other]
+            reference["features"][name] = {
+                "type": "categorical", "categories": categories, "expected": _proportions(counts).tolist()
+            }
+    index = np.searchsorted(np.asarray(PROBABILITY_EDGES), np.asarray(scores), side="left")
+    reference["prediction"] = {
+        "type": "numeric",
+        "edges": PROBABILITY_EDGES,
+        "expected": _proportions(np.bincount(index, minlength=len(PROBABILITY_EDGES) + 1)).tolist()
+    }
+    return reference
+
+def write_json(state, file_path):
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, file_path)
+
+def drift_scores(observed, expected, numeric):
+    """PSI of the observed bin counts against the expected proportions, plus the binned KS distance for numeric bins."""
+    n = int(sum(observed))
+    if n == 0:
+        return {"n": 0, "psi": None, "ks": None}
+    p = np.maximum(_proportions(observed), EPSILON)
+    q = np.maximum(np.asarray(expected, dtype=float), EPSILON)
+    scores = {"n": n, "psi": float(np.sum((p - q) * np.log(p / q))), "ks": None}
+    if numeric:
+        scores["ks"] = float(np.max(np.abs(np.cumsum(_proportions(observed)) - np.cumsum(expected))))
+    return scores
+
+class DriftMonitor:
+    """
+    Drift state of one serving process for one model version. Requests are
+    counted into the reference bins in tumbling windows of window_size
+    requests (or max_window_seconds once min_samples have arrived), so
+    memory is fixed by the number of bins. A request takes the lock once,
+    to bump a few integers; scoring happens when a window closes or the
+    report is requested.
+    """
+    def __init__(self, reference, config=None, version=None):
+        config = config or {}
+        self.version = version
+        self.window_size = config.get("window_size", 1000)
+        self.min_samples = config.get("min_samples", 100)
+        self.max_window_seconds = config.get("max_window_seconds", 3600)
+        self.psi_warn = config.get("psi_warn", 0.1)
+        self.psi_alert = config.get("psi_alert", 0.25)
+        self.signal_config = config.get("retrain_signal") or {}
+
+        # One flat counter list; every monitored value owns a slice of it
+        self._monitored = []
+        offset = 0
+        for name, spec in list(reference["features"].items()) + [(None, reference["prediction"])]:
+            if spec["type"] == "numeric":
+                size = len(spec["edges"]) + 1
+            else:
+                size = len(spec["categories"]) + 1
+                spec = {**spec, "lookup": {key: i for i, key in enumerate(spec["categories"])}}
+            self._monitored.append((name, spec, offset, size))
+            offset += size
+        self._size = offset
+        self._lock = threading.Lock()
+        self._counts = [0] * self._size
+        self._n = 0
+        self._window_start = time.time()
+        self.windows_completed = 0
+        self.last_window = None
+        self.alert_streak = 0
+        self.signalled = False
+
+    @classmethod
+    def load(cls, file_path, config=None, version=None):
+        with open(file_path, "r") as f:
+            return cls(json.load(f), config, version)
+
+    def _bin_indices(self, record, score, defaults):
+        indices = []
+        for name, spec, offset, size in self._monitored:
+            if name is None:
+                value = score
+            else:
+                value = record.get(name, defaults.get(name))
+                if value is None:
+                    continue
+            if spec["type"] == "numeric":
+                indices.append(offset + bisect.bisect_left(spec["edges"], float(value)))
+            else:
+                indices.append(offset + spec["lookup"].get(_category_key(value), size - 1))
+        return indices
+
+    def observe(self, records, scores, defaults=None):
+        """Counts validated raw records and their positive-label probabilities."""
+        defaults = defaults or {}
+        indices = [i for record, score in zip(records, scores) for i in self._bin_indices(record, float(score), defaults)]
+        with self._lock:
+            counts = self._counts
+            for i in indices:
+                counts[i] += 1
+            self._n += len(records)
+            closed = self._close_window_if_due()
+        if closed is not None:
+            self._finish_window(*closed)
+
+    def _close_window_if_due(self):
+        now = time.time()
+        if self._n >= self.window_size or (self._n >= self.min_samples and now - self._window_start >= self.max_window_seconds):
+            closed = (self._counts, self._n, self._window_start, now)
+            self._counts = [0] * self._size
+            self._n = 0
+            self._window_start = now
+            return closed
+        return None
+
+    def _score(self, counts, n, start, end):
+        features = {}
+        for name, spec, offset, size in self._monitored:
+            scores = drift_scores(counts[offset:offset + size], spec["expected"], spec["type"] == "numeric")
+            if scores["psi"] is not None:
+                scores["status"] = "alert" if scores["psi"] >= self.psi_alert else "warn" if scores["psi"] >= self.psi_warn else "ok"
+            features["prediction" if name is None else name] = scores
+        alerts = [name for name, scores in features.items() if scores.get("status") == "alert"]
+        return {
+            "requests": n,
+            "start": start,
+            "end": end,
+            "max_psi": max((s["psi"] for s in features.values() if s["psi"] is not None), default=None),
+            "alerts": alerts,
+            "scores": features
+        }
+
+    def _finish_window(self, counts, n, start, end):
+        window = self._score(counts, n, start, end)
+        self.last_window = window
+        self.windows_completed += 1
+        self.alert_streak = self.alert_streak + 1 if window["alerts"] else 0
+        if window["alerts"]:
+            logger.warning(f"Drift alert for model {self.version} on {window['alerts']} (max PSI {window['max_psi']:.3f})")
+        if (self.signal_config.get("enabled") and not self.signalled
+                and self.alert_streak >= self.signal_config.get("alert_windows", 2)):
+            self.write_retrain_signal(window)
+
+    def write_retrain_signal(self, window):
+        # Picked up by whatever schedules the training pipeline; written once per model version
+        path = self.signal_config.get("path", "artifacts/monitoring/retrain_signal.json")
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            signal = {
+                "model_version": self.version,
+                "reason": f"PSI >= {self.psi_alert} on {window['alerts']} for {self.alert_streak} consecutive windows",
+                "created_at": time.time(),
+                "pid": os.getpid(),
+                "window": window
+            }
+            write_json(signal, path)
+            self.signalled = True
+            logger.warning(f"Retrain signal written to {path}: {signal['reason']}")
+        except OSError as e:
+            logger.error(f"Error while writing retrain signal: {e}")
+
+    def report(self):
+        with self._lock:
+            counts, n, start = list(self._counts), self._n, self._window_start
+        return {
+            "model_version": self.version,
+            "pid": os.getpid(),
+            "window_size": self.window_size,
+            "windows_completed": self.windows_completed,
+            "alert_streak": self.alert_streak,
+            "retrain_signalled": self.signalled,
+            "last_window": self.last_window,
+            # Scored on demand; small windows are noisy, hence min_samples
+            "current_window": self._score(counts, n, start, time.time()) if n >= self.min_samples else {"requests": n}
+        }
+
+class DriftMonitors:
+    """The monitor for the model version being served, rebuilt from the reference file when the version changes."""
+    def __init__(self, reference_path, config=None):
+        self.reference_path = reference_path
+        self.config = config or {}
+        self.enabled = self.config.get("enabled", True)
+        # (model version, its monitor or None when there is no reference)
+        self._current = (None, None)
+        self._lock = threading.Lock()
+
+    def get(self, version):
+        current_version, monitor = self._current
+        if current_version == version or not self.enabled:
+            return monitor
+        with self._lock:
+            if self._current[0] != version:
+                monitor = None
+                if os.path.exists(self.reference_path):
+                    try:
+                        monitor = DriftMonitor.load(self.reference_path, self.config, version)
+                    except (OSError, ValueError, KeyError) as e:
+                        logger.error(f"Error while loading drift reference {self.reference_path}: {e}")
+                self._current = (version, monitor)
+            return self._current[1]
+
+    def observe(self, version, records, scores, defaults=None):
+        monitor = self.get(version)
+        if monitor is not None:
+            monitor.observe(records, scores, defaults)
+
+    def report(self):
+        if not self.enabled:
+            return {"enabled": False}
+        monitor = self._current[1]
+        if monitor is None:
+            return {"enabled": True, "monitoring": False, "reason": f"No drift reference at {self.reference_path} or no requests yet"}
+        return {"enabled": True, "monitoring": True, **monitor.report()}
@@ -0,0 +1,177 @@
+import os
+import sys
+import json
+import math
+import numpy as np
+from src.logger import get_logger
+from src.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+class FeatureEncoder:
+    """
+    Fitted encoding state shared by training and serving: category -> code
+    tables (same codes LabelEncoder would give), the columns that get log1p
+    because of skew, and the selected feature order.
+    """
+    def __init__(self, categorical_cols=None, numerical_cols=None, skew_threshold=None,
+                 target_col="booking status"):
+        self.categorical_cols = list(categorical_cols or [])
+        self.numerical_cols = list(numerical_cols or [])
+        self.skew_threshold = skew_threshold
+        self.target_col = target_col
+        self.categories = {}
+        self.log1p_cols = []
+        self.features = []
+        self._compiled = None
+
+    def fit(self, df, profile=None):
+        """
+        profile: optional DataProfile of the training split; skew is then
+        read from its summaries instead of being measured on df.
+        """
+        try:
+            self.categories = {
+                col: sorted(df[col].astype(str).unique().tolist())
+                for col in self.categorical_cols if col in df.columns
+            }
+            columns = [col for col in self.numerical_cols if col in df.columns]
+            if profile is not None:
+                skews = {col: self._profile_skew(profile, col) for col in columns}
+            else:
+                # Skew is measured after label encoding, as preprocessing always did
+                encoded = self._encode_categories(df[columns])
+                skews = {col: encoded[col].skew() for col in columns}
+            self.log1p_cols = [
+                col for col in columns
+                if skews[col] is not None and skews[col] > self.skew_threshold
+            ]
+            self._compiled = None
+            logger.info(f"Feature encoder fitted, log1p columns: {self.log1p_cols}")
+            return self
+        except Exception as e:
+            logger.error(f"Error while fitting feature encoder: {e}")
+            raise CustomException(e, sys)
+
+    def _profile_skew(self, profile, col):
+        if col not in profile:
+            return None
+        column = profile[col]
+        # Columns that are also categorical are skewed as label codes, like the
+        # rescanning path; fall back to the raw values if their counts are not exact
+        if col in self.categories:
+            skew = column.code_skew(self.categories[col])
+            if skew is not None:
+                return skew
+        return column.skew
+
+    def _encode_categories(self, df):
+        df = df.copy()
+        for col, classes in self.categories.items():
+            if col in df.columns:
+                codes = {cls: code for code, cls in enumerate(classes)}
+                df[col] = df[col].astype(str).map(codes).fillna(-1).astype(int)
+        return df
+
+    def transform(self, df):
+        try:
+            df = self._encode_categories(df)
+            for col in self.log1p_cols:
+                if col in df.columns:
+                    df[col] = np.log1p(df[col])
+            return df
+        except Exception as e:
+            logger.error(f"Error while applying feature encoder: {e}")
+            raise CustomException(e, sys)
+
+    def set_features(self, features):
+        self.features = list(features)
+        self._compiled = None
+
+    @property
+    def target_classes(self):
+        return self.categories.get(self.target_col, [])
+
+    def target_label(self, code):
+        return self.target_classes[int(code)]
+
+    def compiled_plan(self):
+        """
+        One (field, code table, log1p) entry per model feature, in model
+        order. The code table maps category_key(value) to the category code
+        and is None for columns that are not categorical; log1p applies
+        after the code lookup, as in transform().
+        """
+        if self._compiled is None:
+            plan = []
+            for col in self.features:
+                classes = self.categories.get(col)
+                table = {cls: code for code, cls in enumerate(classes)} if classes is not None else None
+                plan.append((col, table, col in self.log1p_cols))
+            self._compiled = plan
+        return self._compiled
+
+    @staticmethod
+    def category_key(value):
+        """Key of a raw value in the code tables (the astype(str) of an integer column)."""
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value)
+
+    def encode_record(self, record, defaults=None):
+        """
+        Encodes one raw record (keys are the original column names) into a
+        list of floats in model feature order, using plain dict lookups.
+        """
+        defaults = defaults or {}
+        row = []
+        for col, table, log1p in self.compiled_plan():
+            value = record.get(col, defaults.get(col))
+            if value is None:
+                raise ValueError(f"Missing value for '{col}'")
+            if table is not None:
+                value = table.get(self.category_key(value), -1) # Handle unknown
+            value = float(value)
+            if log1p:
+                value = math.log1p(value)
+            row.append(value)
+        return row
+
+    def to_dict(self):
+        return {
+            "target_col": self.target_col,
+            "skew_threshold": self.skew_threshold,
+            "categories": self.categories,
+            "log1p_cols": self.log1p_cols,
+            "features": self.features
+        }
+
+    def save(self, file_path):
+        try:
+            tmp_path = f"{file_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.to_dict(), f, indent=2)
+            os.replace(tmp_path, file_path)
+            logger.info(f"Feature encoder saved to {file_path}")
+        except Exception as e:
+            logger.error(f"Error while saving feature encoder: {e}")
+            raise CustomException(e, sys)
+
+    @classmethod
+    def from_dict(cls, state):
+        encoder = cls(target_col=state["target_col"])
+        encoder.skew_threshold = state.get("skew_threshold")
+        encoder.categories = state["categories"]
+        encoder.categorical_cols = list(encoder.categories)
+        encoder.log1p_cols = state["log1p_cols"]
+        encoder.features = state["features"]
+        return encoder
+
+    @classmethod
+    def load(cls, file_path):
+        try:
+            with open(file_path, "r") as f:
+                return cls.from_dict(json.load(f))
+        except Exception as e:
+            logger.error(f"Error while loading feature encoder from {file_path}: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,147 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from src.logger import get_logger
+from src.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+TARGET_COL = "booking status"
+MAX_CACHED_RANKINGS = 10
+
+class FeatureSelector:
+    """
+    Ranks features with a configurable engine and keeps the top-k.
+
+    - random_forest: the original RandomForest ranking, optionally on a row
+      sample and with n_jobs
+    - lightgbm: LightGBM gain importance
+    - mutual_info: sklearn mutual information
+    Rankings are cached by data fingerprint, so an unchanged training set
+    never pays for a refit.
+    """
+    METHODS = ("random_forest", "lightgbm", "mutual_info")
+
+    def __init__(self, config, num_features, cache_path=None, categorical_cols=None, thread_budget=None):
+        self.method = config.get("method", "random_forest")
+        if self.method not in self.METHODS:
+            raise ValueError(f"Unknown feature selection method '{self.method}', expected one of {self.METHODS}")
+        self.sample_size = config.get("sample_size")
+        self.n_estimators = config.get("n_estimators", 100)
+        self.n_jobs = config.get("n_jobs", -1)
+        if thread_budget is not None:
+            self.n_jobs = thread_budget.resolve(self.n_jobs)
+        self.use_cache = config.get("cache", True)
+        self.compare_to_baseline = config.get("compare_to_baseline", False)
+        self.num_features = num_features
+        self.cache_path = cache_path
+        self.categorical_cols = set(categorical_cols or [])
+        self.report = {}
+
+    @staticmethod
+    def data_fingerprint(df):
+        digest = hashlib.sha256()
+        digest.update(json.dumps(list(df.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return digest.hexdigest()[:16]
+
+    def _load_cache(self):
+        if self.use_cache and self.cache_path and os.path.exists(self.cache_path):
+            with open(self.cache_path, "r") as f:
+                return json.load(f)
+        return {}
+
+    def _save_cache(self, cache):
+        if not (self.use_cache and self.cache_path):
+            return
+        # Keep only the most recent rankings
+        keys = sorted(cache, key=lambda k: cache[k]["created_at"])[-MAX_CACHED_RANKINGS:]
+        cache = {k: cache[k] for k in keys}
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        with open(self.cache_path, "w") as f:
+            json.dump(cache, f, indent=2)
+
+    def _sample(self, X, y):
+        if self.sample_size and len(X) > self.sample_size:
+            X = X.sample(n=self.sample_size, random_state=42)
+            y = y.loc[X.index]
+        return X, y
+
+    def _importances(self, method, X, y):
+        if method == "baseline":
+            # What preprocessing always did: default 100-tree forest on every row
+            model = RandomForestClassifier(random_state=42)
+            model.fit(X, y)
+            return model.feature_importances_
+
+        X, y = self._sample(X, y)
+        if method == "random_forest":
+            model = RandomForestClassifier(n_estimators=self.n_estimators, random_state=42, n_jobs=self.n_jobs)
+            model.fit(X, y)
+            return model.feature_importances_
+        if method == "lightgbm":
+            import lightgbm as lgb
+            model = lgb.LGBMClassifier(
+                n_estimators=self.n_estimators, importance_type="gain",
+                random_state=42, n_jobs=self.n_jobs, verbose=-1
+            )
+            model.fit(X, y)
+            return model.feature_importances_
+        from sklearn.feature_selection import mutual_info_classif
+        discrete = [col in self.categorical_cols for col in X.columns]
+        return mutual_info_classif(X, y, discrete_features=discrete, random_state=42)
+
+    def _ranking(self, method, X, y, fingerprint, cache):
+        key = f"{fingerprint}:{method}:{self.sample_size}:{self.n_estimators}"
+        if key in cache:
+            return pd.Series(cache[key]["importances"]), True
+        importances = pd.Series(self._importances(method, X, y), index=X.columns)
+        cache[key] = {"created_at": time.time(), "importances": importances.to_dict()}
+        return importances, False
+
+    def select(self, df):
+        try:
+            start = time.perf_counter()
+            X = df.drop(columns=[TARGET_COL])
+            y = df[TARGET_COL]
+            cache = self._load_cache()
+            fingerprint = self.data_fingerprint(df) if self.use_cache or self.compare_to_baseline else None
+
+            importances, cached = self._ranking(self.method, X, y, fingerprint, cache)
+            top_features = importances.nlargest(self.num_features).index.tolist()
+            elapsed = time.perf_counter() - start
+
+            self.report = {
+                "method": self.method,
+                "sample_size": self.sample_size,
+                "selection_time_s": elapsed,
+                "from_cache": cached,
+                "selected_features": top_features
+            }
+            if self.compare_to_baseline:
+                baseline, _ = self._ranking("baseline", X, y, fingerprint, cache)
+                baseline_top = baseline.nlargest(self.num_features).index.tolist()
+                overlap = len(set(top_features) & set(baseline_top))
+                self.report.update({
+                    "baseline_features": baseline_top,
+                    "matches_baseline": set(top_features) == set(baseline_top),
+                    "baseline_overlap": overlap / self.num_features
+                })
+            self._save_cache(cache)
+
+            logger.info(
+                f"Feature selection ({self.method}{', cached' if cached else ''}) took {elapsed:.3f}s"
+                + (f", matches baseline: {self.report['matches_baseline']}" if self.compare_to_baseline else "")
+            )
+            return top_features
+        except Exception as e:
+            logger.error(f"Error while ranking features: {e}")
+            raise CustomException(e, sys)
+
+    def save_report(self, file_path):
+        with open(file_path, "w") as f:
+            json.dump(self.report, f, indent=2)
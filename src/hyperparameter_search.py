@@ -0,0 +1,142 @@
+import sys
+import time
+import numpy as np
+import lightgbm as lgb
+from sklearn.model_selection import ParameterSampler, train_test_split
+from src.logger import get_logger
+from src.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+class SuccessiveHalvingSearch:
+    """
+    Successive halving over boosting rounds for LightGBM.
+
+    n_trials configurations are sampled from the search space and trained on
+    one LightGBM Dataset that is binned once and reused for every trial.
+    Each rung grows the round budget by eta (from min_estimators up to
+    max_estimators), continues boosting the surviving boosters instead of
+    restarting them, early-stops on a validation fold and keeps the best
+    1/eta. The search stops early once time_budget_s is spent.
+    """
+    def __init__(self, param_space, config, class_weight=None, num_threads=None):
+        self.param_space = {k: v for k, v in param_space.items() if k != "n_estimators"}
+        self.n_trials = config.get("n_trials", 27)
+        self.min_estimators = config.get("min_estimators", 50)
+        self.max_estimators = config.get("max_estimators", 1000)
+        self.eta = config.get("eta", 3)
+        self.early_stopping_rounds = config.get("early_stopping_rounds", 30)
+        self.validation_fraction = config.get("validation_fraction", 0.2)
+        self.time_budget_s = config.get("time_budget_s")
+        self.metric = config.get("metric", "binary_logloss")
+        self.random_state = config.get("random_state", 42)
+        self.class_weight = class_weight
+        self.num_threads = num_threads
+        self.best_params_ = None
+        self.best_score_ = None
+        self.best_iteration_ = None
+        self.summary_ = {}
+
+    def _base_params(self):
+        params = {
+            "objective": "binary",
+            "metric": self.metric,
+            "verbosity": -1,
+            "seed": self.random_state,
+            # Let every trial use its own min_child_samples on the shared Dataset
+            "feature_pre_filter": False
+        }
+        if self.class_weight == "balanced":
+            params["is_unbalance"] = True
+        if self.num_threads:
+            params["num_threads"] = self.num_threads
+        return params
+
+    def _higher_is_better(self):
+        return self.metric in ("auc", "average_precision")
+
+    def _budgets(self):
+        budgets = []
+        budget = self.min_estimators
+        while budget < self.max_estimators:
+            budgets.append(int(budget))
+            budget *= self.eta
+        budgets.append(int(self.max_estimators))
+        return budgets
+
+    def _out_of_time(self, start):
+        return self.time_budget_s is not None and time.perf_counter() - start > self.time_budget_s
+
+    def fit(self, X, y):
+        try:
+            start = time.perf_counter()
+            X_tr, X_va, y_tr, y_va = train_test_split(
+                X, y, test_size=self.validation_fraction, stratify=y, random_state=self.random_state
+            )
+            base_params = self._base_params()
+            # Binned once here, reused by every trial and rung
+            train_set = lgb.Dataset(X_tr, y_tr, params={"feature_pre_filter": False}, free_raw_data=False)
+            valid_set = lgb.Dataset(X_va, y_va, reference=train_set, free_raw_data=False)
+            train_set.construct()
+            valid_set.construct()
+
+            candidates = [
+                {"params": params, "booster": None, "score": None, "best_iteration": 0, "done": False}
+                for params in ParameterSampler(self.param_space, n_iter=self.n_trials, random_state=self.random_state)
+            ]
+            sign = -1 if self._higher_is_better() else 1
+            trials_run = 0
+            rounds_trained = 0
+
+            for rung, budget in enumerate(self._budgets()):
+                for candidate in candidates:
+                    if candidate["done"] or self._out_of_time(start):
+                        continue
+                    already = candidate["booster"].current_iteration() if candidate["booster"] else 0
+                    booster = lgb.train(
+                        {**base_params, **candidate["params"]},
+                        train_set,
+                        num_boost_round=budget - already,
+                        valid_sets=[valid_set],
+                        init_model=candidate["booster"],
+                        keep_training_booster=True,
+                        callbacks=[lgb.early_stopping(self.early_stopping_rounds, verbose=False)]
+                    )
+                    trials_run += 1
+                    rounds_trained += booster.current_iteration() - already
+                    candidate["booster"] = booster
+                    candidate["score"] = float(booster.best_score["valid_0"][self.metric])
+                    candidate["best_iteration"] = booster.best_iteration or booster.current_iteration()
+                    # Early stopping kicked in: more rounds will not help this one
+                    candidate["done"] = booster.current_iteration() < budget
+
+                scored = [c for c in candidates if c["score"] is not None]
+                if not scored:
+                    break
+                scored.sort(key=lambda c: sign * c["score"])
+                keep = max(1, int(np.ceil(len(scored) / self.eta)))
+                logger.info(
+                    f"Rung {rung} ({budget} rounds): best {self.metric} {scored[0]['score']:.5f}, "
+                    f"keeping {keep} of {len(scored)}"
+                )
+                candidates = scored[:keep]
+                if all(c["done"] for c in candidates) or self._out_of_time(start):
+                    break
+
+            best = candidates[0]
+            self.best_params_ = best["params"]
+            self.best_score_ = best["score"]
+            self.best_iteration_ = max(1, best["best_iteration"])
+            self.summary_ = {
+                "search_time_s": time.perf_counter() - start,
+                "trial_fits": trials_run,
+                "boosting_rounds_trained": rounds_trained,
+                "best_score": self.best_score_,
+                "best_iteration": self.best_iteration_,
+                "hit_time_budget": self._out_of_time(start)
+            }
+            logger.info(f"Successive halving finished: {self.summary_}")
+            return self
+        except Exception as e:
+            logger.error(f"Error during successive halving search: {e}")
+            raise CustomException(e, sys)
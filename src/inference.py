@@ -0,0 +1,200 @@
+# Serving core shared by the Flask and ASGI apps: the resident model, request
+# validation/encoding, scoring and response shaping. Only NumPy and small project
+# modules are imported here. Unpickling the LightGBM model pulls in LightGBM,
+# scikit-learn, SciPy and pandas, so with SLIM_SERVING=1 the apps load the exported
+# NumPy trees instead and none of those are ever imported.
+import os
+import sys
+import json
+import weakref
+import yaml
+import numpy as np
+from src.model_holder import ModelHolder
+from src.prediction_cache import PredictionCache
+from src.drift_monitor import DriftMonitors
+from src.logger import get_logger
+from src.input_schema import SchemaValidator, describe_errors
+from config.input_schema import INPUT_SCHEMA
+
+logger = get_logger(__name__)
+
+MODEL_PATH = "artifacts/model/model.joblib"
+ENCODER_PATH = "artifacts/model/encoder.json"
+MODEL_TREES_PATH = "artifacts/model/model_trees.npz"
+MODEL_META_PATH = "artifacts/model/model_meta.json"
+DRIFT_REFERENCE_PATH = "artifacts/model/drift_reference.json"
+CONFIG_PATH = "config/config.yaml"
+MODEL_POLL_INTERVAL = 5  # seconds between checks for a newer model artifact
+# Score single bookings with the NumPy tree evaluator exported at training time
+USE_COMPILED_TREES = os.environ.get("USE_COMPILED_TREES", "0") == "1"
+# Serve everything from the exported trees and never load the LightGBM model
+SLIM_SERVING = os.environ.get("SLIM_SERVING", "0") == "1"
+
+# Imported by the LightGBM model, never needed by slim serving
+HEAVY_MODULES = ("lightgbm", "sklearn", "scipy", "pandas", "joblib", "mlflow", "imblearn")
+
+# Model is deserialized once per process and hot-swapped when the artifact changes
+if SLIM_SERVING:
+    model_holder = ModelHolder(
+        MODEL_TREES_PATH, ENCODER_PATH, poll_interval=MODEL_POLL_INTERVAL,
+        meta_path=MODEL_META_PATH, model_format="compiled_trees"
+    ).start()
+else:
+    model_holder = ModelHolder(
+        MODEL_PATH, ENCODER_PATH, poll_interval=MODEL_POLL_INTERVAL,
+        trees_path=MODEL_TREES_PATH if USE_COMPILED_TREES else None, meta_path=MODEL_META_PATH
+    ).start()
+
+# Fields that may be left out of a request
+FIELD_DEFAULTS = {field: spec["default"] for field, spec in INPUT_SCHEMA.items() if "default" in spec}
+
+MAX_BATCH_SIZE = 10000
+
+# Scores for repeated bookings, dropped whenever the model version changes
+PREDICTION_CACHE_SIZE = 10000
+PREDICTION_CACHE_TTL = 300  # seconds
+prediction_cache = PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL)
+
+def _read_drift_config():
+    if not os.path.exists(CONFIG_PATH):
+        return {}
+    with open(CONFIG_PATH, "r") as file:
+        return ((yaml.safe_load(file) or {}).get("monitoring") or {}).get("drift") or {}
+
+# Served traffic against the training-time reference, per model version
+drift_monitors = DriftMonitors(DRIFT_REFERENCE_PATH, _read_drift_config())
+
+# One compiled validator per loaded encoder
+_validators = weakref.WeakKeyDictionary()
+
+def get_validator(encoder):
+    validator = _validators.get(encoder)
+    if validator is None:
+        validator = _validators[encoder] = SchemaValidator(INPUT_SCHEMA, encoder)
+    return validator
+
+def preprocess_input(data, encoder):
+    """
+    Validates raw form data against the input schema and encodes it into
+    model-ready features (category codes, log1p columns, feature order).
+    Raises InputValidationError with per-field messages.
+    """
+    return get_validator(encoder).encode(data)
+
+def preprocess_batch(records, encoder):
+    """
+    Batch version of preprocess_input. Returns the feature matrix for the
+    valid rows, their positions in the input and a {position: {field: error}}
+    dict for the rows that failed validation.
+    """
+    return get_validator(encoder).encode_batch(records)
+
+def single_row_model():
+    """Model snapshot for /predict: the compiled trees when USE_COMPILED_TREES is set."""
+    return model_holder.get_compiled() if USE_COMPILED_TREES else model_holder.get()
+
+def predict_proba(model, features):
+    # The LightGBM booster scores plain arrays directly, skipping the sklearn
+    # wrapper's feature-name validation
+    booster = getattr(model, 'booster_', None)
+    if booster is not None and len(model.classes_) == 2:
+        prob = booster.predict(features)
+        return np.column_stack([1 - prob, prob])
+    return model.predict_proba(features)
+
+def describe_prediction(model, encoder, probs, model_meta=None):
+    labels = [encoder.target_label(code) for code in model.classes_]
+    by_label = dict(zip(labels, probs))
+    prediction = labels[int(np.argmax(probs))]
+    # Binary models flag the positive label at the threshold chosen in evaluation
+    threshold = (model_meta or {}).get('decision_threshold')
+    positive = (model_meta or {}).get('positive_label')
+    if threshold is not None and len(labels) == 2 and positive in by_label:
+        negative = labels[1 - labels.index(positive)]
+        prediction = positive if by_label[positive] >= threshold else negative
+    return {
+        'prediction': prediction,
+        'probabilities': {
+            'not_canceled': float(by_label.get('Not_Canceled', 0.0)),
+            'canceled': float(by_label.get('Canceled', 0.0))
+        }
+    }
+
+def observe_drift(model, encoder, model_meta, records, probs):
+    """Counts validated records and their positive-label probability for drift monitoring."""
+    try:
+        labels = [encoder.target_label(code) for code in model.classes_]
+        positive = (model_meta or {}).get('positive_label')
+        column = labels.index(positive) if positive in labels else len(labels) - 1
+        drift_monitors.observe(model_meta['version'], records, np.atleast_2d(probs)[:, column], FIELD_DEFAULTS)
+    except Exception as e:
+        # Monitoring never fails a prediction
+        logger.error(f"Error while recording drift: {e}")
+
+def model_not_ready(model, encoder):
+    if model is None:
+        return 'Model file not found. Please run the training pipeline first.'
+    if encoder is None:
+        return 'Feature encoder not found. Please re-run the training pipeline.'
+    return None
+
+def parse_batch_body(body, mimetype):
+    # Either a JSON array (optionally wrapped as {"records": [...]}) or NDJSON
+    if mimetype in ('application/x-ndjson', 'application/jsonl'):
+        records = []
+        for line in body.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                records.append(ValueError(f"Invalid JSON line: {e}"))
+            if len(records) > MAX_BATCH_SIZE:
+                break
+        return records
+
+    payload = json.loads(body)
+    if isinstance(payload, dict):
+        payload = payload.get('records')
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON array of records or NDJSON lines")
+    return payload
+
+def score_batch(model, encoder, model_meta, records):
+    """Response body for /predict_batch."""
+    processed_data, valid_rows, errors = preprocess_batch(records, encoder)
+
+    results = [None] * len(records)
+    for i, row_errors in errors.items():
+        results[i] = {'success': False, 'error': describe_errors(row_errors), 'errors': row_errors}
+
+    if valid_rows:
+        # One vectorized call for the whole batch
+        probs = predict_proba(model, processed_data)
+        for row, i in enumerate(valid_rows):
+            results[i] = {'success': True, **describe_prediction(model, encoder, probs[row], model_meta)}
+        observe_drift(model, encoder, model_meta, [records[i] for i in valid_rows], probs)
+
+    return {
+        'success': True,
+        'count': len(records),
+        'failed': len(errors),
+        'results': results,
+        'model_version': model_meta['version']
+    }
+
+def process_info():
+    """Baseline footprint of this replica: peak RSS and which heavy modules got imported."""
+    info = {
+        "pid": os.getpid(),
+        "slim_serving": SLIM_SERVING,
+        "heavy_modules_loaded": [name for name in HEAVY_MODULES if name in sys.modules]
+    }
+    try:
+        import resource
+        # ru_maxrss is in KB on Linux
+        info["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        pass
+    return info
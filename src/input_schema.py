@@ -0,0 +1,158 @@
+import math
+import numpy as np
+
+class InputValidationError(ValueError):
+    """A request record failed validation; errors maps field name to message."""
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(describe_errors(errors))
+
+def describe_errors(errors):
+    return "Invalid input: " + "; ".join(f"{field}: {message}" for field, message in errors.items())
+
+def _parse_int(value):
+    if isinstance(value, bool):
+        raise ValueError("must be an integer")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("must be an integer")
+    if not number.is_integer():
+        raise ValueError("must be an integer")
+    return int(number)
+
+def _parse_float(value):
+    if isinstance(value, bool):
+        raise ValueError("must be a number")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("must be a number")
+    if not math.isfinite(number):
+        raise ValueError("must be a finite number")
+    return number
+
+class SchemaValidator:
+    """
+    Validates request records against INPUT_SCHEMA and writes them straight
+    into a float array in model feature order.
+
+    The schema is compiled once per encoder into one step per model feature:
+    parser, default, range and, for every column the encoder treats as
+    categorical, its code table. Category fields look up their allowed
+    values; numeric fields the encoder encodes as categories (e.g. 0/1
+    flags) are parsed and range-checked first, then looked up. Values the
+    encoder never saw in training encode as -1, like before.
+    """
+    def __init__(self, schema, encoder):
+        self.schema = schema
+        self.encoder = encoder
+        self.features = list(encoder.features)
+        self._plan = self._compile()
+
+    def _compile(self):
+        plan = []
+        category_key = self.encoder.category_key
+        for col, table, log1p in self.encoder.compiled_plan():
+            spec = self.schema.get(col)
+            if spec is None:
+                raise ValueError(f"Model feature '{col}' is missing from the input schema")
+            lookup = None
+            not_allowed = None
+            if spec["type"] == "category":
+                if table is None:
+                    raise ValueError(f"Input schema declares '{col}' as a category but the encoder treats it as numeric")
+                not_allowed = f"must be one of {spec['values']}"
+                lookup = {}
+                for value in spec["values"]:
+                    code = float(table.get(category_key(value), -1))
+                    lookup[category_key(value)] = math.log1p(code) if log1p else code
+                table = None
+            elif table is not None:
+                # Parsed numbers go through the code table, log1p applies to the code
+                table = {key: float(code) for key, code in table.items()}
+            plan.append((
+                col,
+                _parse_int if spec["type"] == "int" else _parse_float,
+                lookup,
+                table,
+                spec.get("default"),
+                spec.get("min"),
+                spec.get("max"),
+                log1p,
+                not_allowed
+            ))
+        return plan
+
+    def validate_into(self, record, out):
+        """Writes record into the 1-D float array out; returns {field: message} for every bad field."""
+        if not isinstance(record, dict):
+            return {"_record": "must be a JSON object"}
+        errors = {}
+        category_key = self.encoder.category_key
+        for i, (col, parse, lookup, table, default, lo, hi, log1p, not_allowed) in enumerate(self._plan):
+            value = record.get(col)
+            if value is None or value == "":
+                if default is None:
+                    errors[col] = "is required"
+                    continue
+                value = default
+            if lookup is not None:
+                code = None
+                if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+                    code = lookup.get(value if isinstance(value, str) else category_key(value))
+                if code is None:
+                    errors[col] = not_allowed
+                    continue
+                out[i] = code
+                continue
+            try:
+                number = parse(value)
+            except ValueError as e:
+                errors[col] = str(e)
+                continue
+            if lo is not None and number < lo:
+                errors[col] = f"must be >= {lo}"
+                continue
+            if hi is not None and number > hi:
+                errors[col] = f"must be <= {hi}"
+                continue
+            if table is not None:
+                number = table.get(category_key(number), -1.0)
+            out[i] = math.log1p(number) if log1p else number
+        return errors
+
+    def encode(self, record):
+        """One record as a (1, n_features) array; raises InputValidationError."""
+        row = np.empty((1, len(self._plan)), dtype=np.float64)
+        errors = self.validate_into(record, row[0])
+        if errors:
+            raise InputValidationError(errors)
+        return row
+
+    def encode_batch(self, records):
+        """
+        Feature matrix of the valid records (written in place into one
+        preallocated array), their positions and {position: {field: message}}.
+        """
+        features = np.empty((len(records), len(self._plan)), dtype=np.float64)
+        valid_rows = []
+        errors = {}
+        for i, record in enumerate(records):
+            if isinstance(record, Exception):
+                errors[i] = {"_record": str(record)}
+                continue
+            row_errors = self.validate_into(record, features[len(valid_rows)])
+            if row_errors:
+                errors[i] = row_errors
+                continue
+            valid_rows.append(i)
+        return features[:len(valid_rows)], valid_rows, errors
@@ -1,23 +1,260 @@
 import logging
+import logging.handlers
 import os
+import json
+import time
+import queue
+import atexit
+import random
+import threading
 from datetime import datetime
+import yaml
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, rotation stays per process
+    fcntl = None
 
 LOGS_DIR = "logs"
 os.makedirs(LOGS_DIR, exist_ok=True)
 LOG_FILE_NAME = f"log_{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}.log"
 LOG_FILE_PATH = os.path.join(LOGS_DIR, LOG_FILE_NAME)
+LOG_FORMAT = '[%(asctime)s] %(levelname)s: %(message)s'
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='[%(asctime)s] %(levelname)s: %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE_PATH),
-        logging.StreamHandler()
-    ]
-)
+CONFIG_PATH = "config/config.yaml"
 
-def get_logger(__name__):
-    return logging.getLogger(__name__)
-    
+def _read_logging_config():
+    config = {}
+    if os.path.exists(CONFIG_PATH):
+        with open(CONFIG_PATH, "r") as file:
+            config = dict((yaml.safe_load(file) or {}).get("logging") or {})
+    # Serving processes pick their mode without editing the shared config
+    config["mode"] = os.environ.get("LOG_MODE", config.get("mode", "sync"))
+    config["format"] = os.environ.get("LOG_FORMAT", config.get("format", "text"))
+    return config
+
+# Attributes every LogRecord has; anything else was passed with extra={...}
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "_sampled"}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with extra={...} fields as top-level keys."""
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "pid": record.process
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    Thins out high-frequency loggers before their records are formatted or
+    queued. sample_rates keeps a fraction of a logger's records, rate_limits
+    caps them per second; both apply to child loggers too. Warnings and
+    errors always pass. The decision is made once per record and kept on it,
+    so every handler sharing the filter writes the same records. Counters and
+    rate windows are updated under a lock; loggers without a rule never take it.
+    """
+    def __init__(self, sample_rates=None, rate_limits=None):
+        super().__init__()
+        self.sample_rates = sample_rates or {}
+        self.rate_limits = rate_limits or {}
+        self.dropped = {}
+        self._rules = {}
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _match(rules, name):
+        while name:
+            if name in rules:
+                return rules[name]
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        kept = getattr(record, "_sampled", None)
+        if kept is None:
+            kept = record._sampled = self._decide(record)
+        return kept
+
+    def _decide(self, record):
+        name = record.name
+        rules = self._rules.get(name)
+        if rules is None:
+            rules = self._rules[name] = (self._match(self.sample_rates, name), self._match(self.rate_limits, name))
+        rate, limit = rules
+        if rate is None and limit is None:
+            return True
+        with self._lock:
+            if rate is not None and random.random() >= rate:
+                self.dropped[name] = self.dropped.get(name, 0) + 1
+                return False
+            if limit is not None:
+                now = time.monotonic()
+                window = self._windows.get(name)
+                if window is None or now - window[0] >= 1.0:
+                    window = self._windows[name] = [now, 0]
+                if window[1] >= limit:
+                    self.dropped[name] = self.dropped.get(name, 0) + 1
+                    return False
+                window[1] += 1
+            return True
+
+    def dropped_counts(self):
+        with self._lock:
+            return dict(self.dropped)
+
+class SharedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler that all processes of a deployment can share. Each
+    record is one append, the process that finds the file full rotates it
+    under a file lock, and the others see the new file (checked once a
+    second) and reopen it instead of rotating again.
+    """
+    _checked_at = 0.0
+
+    def _reopen_if_rotated(self):
+        self._checked_at = time.monotonic()
+        try:
+            current = os.stat(self.baseFilename).st_ino
+        except FileNotFoundError:
+            current = None
+        if self.stream is None or current != os.fstat(self.stream.fileno()).st_ino:
+            if self.stream is not None:
+                self.stream.close()
+            self.stream = self._open()
+
+    def shouldRollover(self, record):
+        if self.stream is None or time.monotonic() - self._checked_at >= 1.0:
+            self._reopen_if_rotated()
+        # Size so far only, so the record is not formatted twice
+        return self.maxBytes > 0 and self.stream.seek(0, 2) >= self.maxBytes
 
+    def doRollover(self):
+        with open(f"{self.baseFilename}.lock", "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._reopen_if_rotated()
+                if self.stream.seek(0, 2) >= self.maxBytes:
+                    super().doRollover()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
 
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Only capture what cannot wait (the message and any traceback);
+        # formatting happens in the writer thread
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        # Never block the caller when the writer falls behind
+        if self.queue.qsize() >= self.max_queued:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+_state = {}
+
+def _start_writer():
+    handler = _state["queue_handler"]
+    handler.queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(handler.queue, *_state["sinks"], respect_handler_level=True)
+    listener.start()
+    _state["listener"] = listener
+
+def stop_logging():
+    """Flushes and stops the background writer (async mode). Call before os._exit."""
+    listener = _state.pop("listener", None)
+    if listener is not None:
+        listener.stop()
+
+def configure_logging(config=None):
+    """
+    sync (default): every record is written by the calling thread to a new
+    timestamped file per process and the console.
+    async: records are queued and written by one background thread to a
+    rotating file shared by every process of the deployment (logging.file).
+    """
+    config = config or _read_logging_config()
+    stop_logging()
+    formatter = JsonFormatter() if config.get("format") == "json" else logging.Formatter(LOG_FORMAT)
+    sampling = SamplingFilter(config.get("sample_rates"), config.get("rate_limits"))
+    sinks = [logging.StreamHandler()] if config.get("console", True) else []
+
+    if config.get("mode") == "async":
+        log_file = config.get("file", os.path.join(LOGS_DIR, "app.log"))
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+        sinks.insert(0, SharedRotatingFileHandler(
+            log_file, maxBytes=config.get("max_bytes", 10 * 1024 * 1024), backupCount=config.get("backup_count", 5)
+        ))
+        handler = _QueueHandler(None)
+        handler.dropped = 0
+        handler.max_queued = config.get("queue_size", 10000)
+        _state.update(queue_handler=handler, sinks=sinks)
+        _start_writer()
+        handlers = [handler]
+        # Neither format uses the caller's file/line or thread, skip collecting them per record
+        logging._srcfile = None
+        logging.logThreads = False
+    else:
+        sinks.insert(0, logging.FileHandler(LOG_FILE_PATH))
+        _state.pop("queue_handler", None)
+        handlers = sinks
+
+    for sink in sinks:
+        sink.setFormatter(formatter)
+    for handler in handlers:
+        handler.addFilter(sampling)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(config.get("level", "INFO"))
+    _state.update(mode=config.get("mode"), format=config.get("format"), sampling=sampling)
+
+def _restart_writer_in_child():
+    # A request thread may have held the sampling lock at fork time
+    if "sampling" in _state:
+        _state["sampling"]._lock = threading.Lock()
+    # The writer thread does not survive fork; give the child its own queue and thread
+    if "queue_handler" in _state:
+        _state.pop("listener", None)
+        _start_writer()
+
+def logging_stats():
+    handler = _state.get("queue_handler")
+    return {
+        "mode": _state.get("mode"),
+        "format": _state.get("format"),
+        "queued": handler.queue.qsize() if handler is not None else 0,
+        "dropped_queue_full": handler.dropped if handler is not None else 0,
+        "dropped_sampled": _state["sampling"].dropped_counts() if "sampling" in _state else {}
+    }
+
+configure_logging()
+atexit.register(stop_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_writer_in_child)
+
+def get_logger(__name__):
+    return logging.getLogger(__name__)
@@ -0,0 +1,123 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+class MicroBatcher:
+    """
+    Collects items submitted by concurrent asyncio callers and processes them
+    together. A batch is flushed once it holds max_batch_size items or
+    max_wait_ms after its first item arrived, whichever comes first;
+    process_batch(items) runs on a worker thread (so the event loop keeps
+    accepting requests) and must return one result per item, which resolves
+    each caller's future.
+
+    start() is called by the app's lifespan; without one (e.g. --lifespan off)
+    the first submit starts it on the running event loop. stop() fails every
+    request still queued or in the current batch instead of leaving it waiting.
+    """
+    def __init__(self, process_batch, max_batch_size=64, max_wait_ms=2.0):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.items = 0
+        self._queue = None
+        self._loop = None
+        self._worker = None
+        self._executor = None
+        # Items taken off the queue and not resolved yet
+        self._batch = []
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._batch = []
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="micro-batcher")
+        self._worker = self._loop.create_task(self._run())
+        return self
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        pending = list(self._batch)
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        self._batch = []
+        error = RuntimeError("Micro-batcher stopped before the request was scored")
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(error)
+        if pending:
+            logger.warning(f"Micro-batcher stopped with {len(pending)} requests pending")
+        if self._executor is not None:
+            # Waits for a batch still on the worker thread without blocking the event loop
+            await asyncio.to_thread(self._executor.shutdown, wait=True)
+            self._executor = None
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        # No lifespan started us, or this is a different event loop than the one we run on
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self.start()
+        future = loop.create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        batch = self._batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Callers that gave up (e.g. disconnected) are not scored
+            batch = self._batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                continue
+            try:
+                results = await loop.run_in_executor(self._executor, self.process_batch, [item for item, _ in batch])
+            except Exception as e:
+                logger.error(f"Micro-batch of {len(batch)} items failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            self._batch = []
+
+    def info(self):
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0
+        }
@@ -0,0 +1,263 @@
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from utils.common_functions import load_data
+
+logger = get_logger(__name__)
+
+def predict_proba_chunked(model, X, chunk_size=100000):
+    """predict_proba over row chunks, so a large test set never holds more than one chunk of intermediates."""
+    if chunk_size is None or len(X) <= chunk_size:
+        return model.predict_proba(X)
+    return np.vstack([model.predict_proba(X.iloc[start:start + chunk_size]) for start in range(0, len(X), chunk_size)])
+
+class ModelEvaluator:
+    """
+    Scores the test set once and derives everything from the one probability
+    vector: default-threshold metrics, ROC and PR curves, calibration bins and
+    a cost sweep over every distinct score.
+
+    The sweep weights each booking by its price: a missed cancellation costs
+    false_negative_cost * price (the room stays empty), a booking wrongly
+    flagged as cancelling costs false_positive_cost * price (overbooking it).
+    The cheapest threshold on the validation rows becomes the model's
+    operating threshold, and its threshold_* metrics are measured on the
+    test set it was not picked on.
+    """
+    def __init__(self, config=None):
+        config = config or {}
+        self.chunk_size = config.get("chunk_size", 100000)
+        self.positive_label = config.get("positive_label", "Canceled")
+        self.calibration_bins = config.get("calibration_bins", 10)
+        cost = config.get("cost", {})
+        self.weight_col = cost.get("weight_col", "average price")
+        self.false_negative_cost = cost.get("false_negative_cost", 1.0)
+        self.false_positive_cost = cost.get("false_positive_cost", 1.0)
+
+    def row_weights(self, rows_path, n_rows):
+        """
+        Cost weight of each evaluated row, read from the unencoded rows
+        preprocessing saved next to the processed data (the price before any
+        log1p, whether or not it is a model feature). 1 when unavailable.
+        """
+        if os.path.exists(rows_path):
+            try:
+                rows = load_data(rows_path, columns=[self.weight_col])
+                if len(rows) == n_rows:
+                    return np.clip(rows[self.weight_col].to_numpy(dtype=np.float64), 0, None)
+                logger.warning(f"{rows_path} has {len(rows)} rows for {n_rows} evaluated rows")
+            except CustomException as e:
+                logger.warning(f"Could not read '{self.weight_col}' from {rows_path}: {e}")
+        logger.warning(f"No '{self.weight_col}' for the rows in {rows_path}, weighting every booking equally")
+        return np.ones(n_rows)
+
+    @staticmethod
+    def _class_metrics(y, y_pred, code):
+        # Precision/recall/F1 of one class under the argmax prediction
+        tp = np.sum((y_pred == code) & (y == code))
+        precision = tp / max(np.sum(y_pred == code), 1)
+        recall = tp / max(np.sum(y == code), 1)
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return {"precision": float(precision), "recall": float(recall), "f1": float(f1)}
+
+    @staticmethod
+    def _at_threshold(sweep, threshold):
+        # Sweep row that flags exactly the scores >= threshold
+        return int(np.searchsorted(-sweep["threshold"].to_numpy(), -threshold, side="right")) - 1
+
+    def sweep(self, y_true, scores, weights):
+        """
+        Confusion counts and price-weighted cost at every distinct score used
+        as threshold (flag when score >= threshold), from one descending sort.
+        The first row is the "flag nothing" threshold above every score.
+        """
+        order = np.argsort(-scores, kind="mergesort")
+        scores, y_true, weights = scores[order], y_true[order], weights[order]
+        # Last position of each run of equal scores
+        cut = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+
+        tp = np.r_[0, np.cumsum(y_true)[cut]]
+        fp = np.r_[0, np.cumsum(1 - y_true)[cut]]
+        tp_w = np.r_[0.0, np.cumsum(weights * y_true)[cut]]
+        fp_w = np.r_[0.0, np.cumsum(weights * (1 - y_true))[cut]]
+        positives, negatives = tp[-1], fp[-1]
+        fn, tn = positives - tp, negatives - fp
+        fn_w = tp_w[-1] - tp_w
+
+        flagged = tp + fp
+        return pd.DataFrame({
+            "threshold": np.r_[np.inf, scores[cut]],
+            "tp": tp, "fp": fp, "fn": fn, "tn": tn,
+            "tpr": tp / max(positives, 1),
+            "fpr": fp / max(negatives, 1),
+            "precision": np.divide(tp, flagged, out=np.ones(len(tp)), where=flagged > 0),
+            "accuracy": (tp + tn) / len(scores),
+            "cost": self.false_negative_cost * fn_w + self.false_positive_cost * fp_w
+        })
+
+    def calibration(self, y_true, scores):
+        bins = np.minimum((scores * self.calibration_bins).astype(int), self.calibration_bins - 1)
+        count = np.bincount(bins, minlength=self.calibration_bins)
+        mean_score = np.bincount(bins, weights=scores, minlength=self.calibration_bins)
+        positive = np.bincount(bins, weights=y_true, minlength=self.calibration_bins)
+        filled = count > 0
+        edges = np.linspace(0, 1, self.calibration_bins + 1)
+        return pd.DataFrame({
+            "bin_low": edges[:-1][filled],
+            "bin_high": edges[1:][filled],
+            "count": count[filled],
+            "mean_score": mean_score[filled] / count[filled],
+            "observed_rate": positive[filled] / count[filled]
+        })
+
+    def evaluate(self, model, X, y, encoder=None, weights=None, validation=None):
+        """
+        weights: cost weight per test row (row_weights). validation: optional
+        (X, y, weights) of held-out rows the operating threshold is picked
+        on; without it the 0.5 threshold is kept.
+        """
+        try:
+            classes = list(model.classes_)
+            labels = encoder.target_classes if encoder is not None else []
+            positive_code = labels.index(self.positive_label) if self.positive_label in labels else classes[-1]
+            positive_col = classes.index(positive_code)
+
+            probs = predict_proba_chunked(model, X, self.chunk_size)
+            y = np.asarray(y)
+            scores = probs[:, positive_col]
+            y_true = (y == positive_code).astype(np.float64)
+            if weights is None:
+                logger.warning("No cost weights given, weighting every booking equally")
+                weights = np.ones(len(X))
+
+            y_pred = np.asarray(classes)[probs.argmax(axis=1)]
+            positive_name = labels[positive_code] if 0 <= positive_code < len(labels) else f"class_{positive_code}"
+
+            sweep = self.sweep(y_true, scores, weights)
+            # Trapezoids over the ROC points; average precision as a step sum over recall
+            roc_auc = float(np.sum(np.diff(sweep["fpr"]) * (sweep["tpr"].to_numpy()[1:] + sweep["tpr"].to_numpy()[:-1]) / 2))
+            pr_auc = float(np.sum(np.diff(sweep["tpr"]) * sweep["precision"].to_numpy()[1:]))
+            calibration = self.calibration(y_true, scores)
+            ece = float(np.sum(calibration["count"] * np.abs(calibration["mean_score"] - calibration["observed_rate"])) / len(scores))
+
+            validation_cost = None
+            if validation is not None and len(validation[0]):
+                X_val, y_val, val_weights = validation
+                val_scores = predict_proba_chunked(model, X_val, self.chunk_size)[:, positive_col]
+                val_sweep = self.sweep((np.asarray(y_val) == positive_code).astype(np.float64), val_scores, val_weights)
+                val_best = int(val_sweep["cost"].to_numpy().argmin())
+                threshold = float(min(val_sweep["threshold"].iloc[val_best], 1.0))
+                validation_cost = float(val_sweep["cost"].iloc[val_best])
+                threshold_source = "validation"
+            else:
+                logger.warning("No validation rows to pick the operating threshold on, keeping 0.5")
+                threshold = 0.5
+                threshold_source = "default"
+            best = self._at_threshold(sweep, threshold)
+            # Cost of flagging at the old argmax rule, for comparison
+            default = self._at_threshold(sweep, 0.5)
+
+            # Argmax precision/recall/F1 of encoded class 1 (what earlier runs logged as
+            # precision/recall/f1) and of the positive label, each named after its class
+            metrics = {"accuracy": float(np.mean(y_pred == y))}
+            metric_classes = {}
+            for code in dict.fromkeys([1, positive_code]):
+                name = labels[code] if 0 <= code < len(labels) else f"class_{code}"
+                for metric, value in self._class_metrics(y, y_pred, code).items():
+                    key = f"{name.lower().replace(' ', '_')}_{metric}"
+                    metrics[key] = value
+                    metric_classes[key] = name
+            metrics.update({
+                "roc_auc": roc_auc,
+                "pr_auc": pr_auc,
+                "brier": float(np.mean((scores - y_true) ** 2)),
+                "ece": ece,
+                "decision_threshold": threshold,
+                "threshold_cost": float(sweep["cost"].iloc[best]),
+                "default_threshold_cost": float(sweep["cost"].iloc[default]),
+                "threshold_accuracy": float(sweep["accuracy"].iloc[best]),
+                "threshold_precision": float(sweep["precision"].iloc[best]),
+                "threshold_recall": float(sweep["tpr"].iloc[best])
+            })
+            if validation_cost is not None:
+                metrics["validation_threshold_cost"] = validation_cost
+            # Everything past accuracy and the per-class block scores positive_label
+            for key in metrics:
+                if key != "accuracy" and key not in metric_classes:
+                    metric_classes[key] = positive_name
+            logger.info(
+                f"Operating threshold {threshold:.4f} for '{self.positive_label}' ({threshold_source}): "
+                f"test cost {metrics['threshold_cost']:.0f} vs {metrics['default_threshold_cost']:.0f} at 0.5"
+            )
+            return {
+                "metrics": metrics,
+                "decision_threshold": threshold,
+                "threshold_source": threshold_source,
+                "positive_label": self.positive_label,
+                "metric_classes": metric_classes,
+                "sweep": sweep,
+                "calibration": calibration,
+                # Positive-label probabilities, the reference for prediction drift
+                "scores": scores
+            }
+        except Exception as e:
+            logger.error(f"Error while evaluating model: {e}")
+            raise CustomException(e, sys)
+
+    def save_report(self, report, dir_path):
+        """Writes the curves as CSV, a summary JSON and a plot; returns the directory."""
+        try:
+            os.makedirs(dir_path, exist_ok=True)
+            sweep = report["sweep"]
+            sweep.to_csv(os.path.join(dir_path, "threshold_sweep.csv"), index=False)
+            sweep[["fpr", "tpr", "threshold"]].to_csv(os.path.join(dir_path, "roc_curve.csv"), index=False)
+            sweep[["tpr", "precision", "threshold"]].rename(columns={"tpr": "recall"}).to_csv(
+                os.path.join(dir_path, "pr_curve.csv"), index=False
+            )
+            report["calibration"].to_csv(os.path.join(dir_path, "calibration.csv"), index=False)
+            with open(os.path.join(dir_path, "summary.json"), "w") as f:
+                json.dump({
+                    "positive_label": report["positive_label"],
+                    "decision_threshold": report["decision_threshold"],
+                    "threshold_source": report.get("threshold_source"),
+                    "cost": {
+                        "weight_col": self.weight_col,
+                        "false_negative_cost": self.false_negative_cost,
+                        "false_positive_cost": self.false_positive_cost
+                    },
+                    "metrics": report["metrics"],
+                    # Class each metric is measured for (accuracy covers both)
+                    "metric_classes": report.get("metric_classes", {})
+                }, f, indent=2)
+            self._plot(report, os.path.join(dir_path, "curves.png"))
+            return dir_path
+        except Exception as e:
+            logger.error(f"Error while saving evaluation report: {e}")
+            raise CustomException(e, sys)
+
+    def _plot(self, report, file_path):
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        sweep, calibration, metrics = report["sweep"], report["calibration"], report["metrics"]
+        curve = sweep.iloc[1:]
+        fig, axes = plt.subplots(1, 4, figsize=(20, 4.5))
+        axes[0].plot(sweep["fpr"], sweep["tpr"])
+        axes[0].plot([0, 1], [0, 1], linestyle="--", color="grey")
+        axes[0].set(title=f"ROC (AUC {metrics['roc_auc']:.3f})", xlabel="False positive rate", ylabel="True positive rate")
+        axes[1].plot(sweep["tpr"], sweep["precision"])
+        axes[1].set(title=f"Precision-recall (AP {metrics['pr_auc']:.3f})", xlabel="Recall", ylabel="Precision")
+        axes[2].plot([0, 1], [0, 1], linestyle="--", color="grey")
+        axes[2].plot(calibration["mean_score"], calibration["observed_rate"], marker="o")
+        axes[2].set(title=f"Calibration (ECE {metrics['ece']:.3f})", xlabel="Mean predicted", ylabel="Observed rate")
+        axes[3].plot(curve["threshold"], curve["cost"])
+        axes[3].axvline(report["decision_threshold"], color="red", linestyle="--")
+        axes[3].set(title="Price-weighted cost", xlabel="Threshold", ylabel="Cost")
+        fig.tight_layout()
+        fig.savefig(file_path)
+        plt.close(fig)
@@ -0,0 +1,160 @@
+import io
+import os
+import sys
+import json
+import hashlib
+import threading
+from datetime import datetime
+from src.logger import get_logger
+from src.feature_encoder import FeatureEncoder
+from src.tree_export import CompiledTrees
+from src.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+class ModelHolder:
+    """
+    Keeps one deserialized model resident in the process and hot-swaps it when
+    the artifact on disk changes. Readers always get a consistent snapshot, so
+    in-flight requests keep scoring with the model they started with.
+    """
+    def __init__(self, model_path, encoder_path=None, poll_interval=5.0, trees_path=None, meta_path=None,
+                 model_format="joblib"):
+        self.model_path = model_path
+        self.encoder_path = encoder_path
+        self.trees_path = trees_path
+        self.meta_path = meta_path
+        # joblib: the pickled LightGBM model; compiled_trees: model_path is the exported .npz
+        self.model_format = model_format
+        self.poll_interval = poll_interval
+        # (model, encoder, info, compiled trees) replaced as a single reference so a swap is atomic
+        self._state = None
+        self._file_stat = None
+        self._reload_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watcher = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.model_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _read_stable(self):
+        # Read the whole file and make sure it did not change underneath us,
+        # otherwise we could deserialize a half-written artifact.
+        before = self._stat()
+        if before is None:
+            return None, None
+        with open(self.model_path, "rb") as f:
+            payload = f.read()
+        after = self._stat()
+        if before != after or len(payload) != before[1]:
+            return None, None
+        return payload, before
+
+    def load(self):
+        try:
+            with self._reload_lock:
+                payload, file_stat = self._read_stable()
+                if payload is None:
+                    return False
+
+                version = hashlib.sha256(payload).hexdigest()[:12]
+                current = self._state
+                if current is not None and current[2]["version"] == version:
+                    # Same content re-written (e.g. touched), nothing to swap
+                    self._file_stat = file_stat
+                    return False
+
+                if self.model_format == "compiled_trees":
+                    model = CompiledTrees.load(io.BytesIO(payload))
+                else:
+                    # Deferred: the pickled model imports LightGBM, sklearn, SciPy and pandas anyway
+                    import joblib
+                    model = joblib.load(io.BytesIO(payload))
+                # Encoder is written before the model, so it matches this payload
+                encoder = None
+                if self.encoder_path and os.path.exists(self.encoder_path):
+                    encoder = FeatureEncoder.load(self.encoder_path)
+                # Same for the compiled trees, when serving opted into them
+                trees = None
+                if self.trees_path and os.path.exists(self.trees_path):
+                    trees = CompiledTrees.load(self.trees_path)
+                info = {
+                    "version": version,
+                    "loaded_at": datetime.now().isoformat(timespec="seconds"),
+                    "model_path": self.model_path,
+                    "model_format": self.model_format,
+                    "size_bytes": file_stat[1]
+                }
+                # Operating threshold picked at evaluation time, written before the model too
+                if self.meta_path and os.path.exists(self.meta_path):
+                    with open(self.meta_path, "r") as f:
+                        meta = json.load(f)
+                    if meta.get("decision_threshold") is not None:
+                        info["decision_threshold"] = meta["decision_threshold"]
+                        info["positive_label"] = meta.get("positive_label")
+                self._state = (model, encoder, info, trees)
+                self._file_stat = file_stat
+                logger.info(f"Loaded model version {version} from {self.model_path}")
+                return True
+        except Exception as e:
+            logger.error(f"Error while loading model from {self.model_path}: {e}")
+            raise CustomException(e, sys)
+
+    def maybe_reload(self):
+        file_stat = self._stat()
+        if file_stat is None or file_stat == self._file_stat:
+            return False
+        return self.load()
+
+    def get(self):
+        state = self._state
+        if state is None:
+            return None, None, None
+        return state[:3]
+
+    def get_compiled(self):
+        """Like get(), with the compiled trees as the model when they are loaded."""
+        state = self._state
+        if state is None:
+            return None, None, None
+        model, encoder, info, trees = state
+        return (trees if trees is not None else model), encoder, info
+
+    def info(self):
+        state = self._state
+        if state is None:
+            return {"loaded": False, "model_path": self.model_path}
+        return {
+            "loaded": True,
+            "encoder_loaded": state[1] is not None,
+            "compiled_trees_loaded": state[3] is not None,
+            **state[2]
+        }
+
+    def _watch(self):
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.maybe_reload()
+            except Exception as e:
+                # Keep serving the current model, try again on the next poll
+                logger.error(f"Model reload failed: {e}")
+
+    def start(self):
+        if self._stat() is not None:
+            self.load()
+        else:
+            logger.warning(f"Model file not found at {self.model_path}, waiting for it to appear")
+        if self.poll_interval and self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+            self._watcher.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
@@ -0,0 +1,186 @@
+import os
+import sys
+import time
+import pickle
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.thread_budget import ThreadBudget
+from config.path_config import *
+from utils.common_functions import load_data
+
+logger = get_logger(__name__)
+
+LATENCY_ROWS = 200
+
+# Set once per worker process by the pool initializer, so the data is sent
+# to each worker once rather than with every candidate
+_data = None
+
+def _init_worker(X_train, y_train, X_test, y_test):
+    global _data
+    _data = (X_train, y_train, X_test, y_test)
+
+def _score_in_worker(name, estimator, latency_rows):
+    return score_candidate(name, estimator, *_data, latency_rows=latency_rows)
+
+def score_candidate(name, estimator, X_train, y_train, X_test, y_test, latency_rows=LATENCY_ROWS):
+    """Fits one candidate and returns its leaderboard row: metrics, fit time, latency and size."""
+    start = time.perf_counter()
+    estimator.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = estimator.predict(X_test)
+    batch_time = time.perf_counter() - start
+
+    # Serving scores one booking per request, so time single-row calls too
+    rows = [X_test.iloc[[i]] for i in range(min(latency_rows, len(X_test)))]
+    timings = []
+    for row in rows:
+        start = time.perf_counter()
+        estimator.predict(row)
+        timings.append(time.perf_counter() - start)
+
+    roc_auc = np.nan
+    if hasattr(estimator, "predict_proba"):
+        roc_auc = roc_auc_score(y_test, estimator.predict_proba(X_test)[:, 1])
+
+    return {
+        "model": name,
+        "accuracy": accuracy_score(y_test, y_pred),
+        "precision": precision_score(y_test, y_pred, average="weighted"),
+        "recall": recall_score(y_test, y_pred, average="weighted"),
+        "f1": f1_score(y_test, y_pred, average="weighted"),
+        "roc_auc": roc_auc,
+        "fit_time_s": fit_time,
+        "batch_us_per_row": batch_time / len(X_test) * 1e6,
+        "single_row_us": float(np.median(timings)) * 1e6 if timings else np.nan,
+        "model_size_kb": len(pickle.dumps(estimator, protocol=pickle.HIGHEST_PROTOCOL)) / 1024
+    }
+
+def evaluate_candidates(candidates, X_train, y_train, X_test, y_test, workers=1, latency_rows=LATENCY_ROWS):
+    """
+    Scores {name: estimator} in a process pool and returns one row per
+    candidate (in completion order). A candidate that fails gets an error
+    instead of metrics, the others still finish.
+    """
+    rows = []
+    # spawn: forking after LightGBM/OpenMP has started threads can hang the children
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker, initargs=(X_train, y_train, X_test, y_test)
+    ) as pool:
+        futures = {
+            pool.submit(_score_in_worker, name, estimator, latency_rows): name
+            for name, estimator in candidates.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                row = future.result()
+                logger.info(
+                    f"{name}: accuracy {row['accuracy']:.4f}, fit {row['fit_time_s']:.1f}s, "
+                    f"{row['single_row_us']:.0f}us/row single, {row['model_size_kb']:.0f}KB"
+                )
+            except Exception as e:
+                logger.error(f"Candidate {name} failed: {e}")
+                row = {"model": name, "error": str(e)}
+            rows.append(row)
+    return rows
+
+class ModelLeaderboard:
+    """
+    Compares the candidate classifiers from config.yaml (leaderboard.candidates)
+    on the processed train/test artifacts. Latency and size sit next to the
+    metrics, since a model is only as good as what serving can afford.
+    """
+    def __init__(self, config):
+        self.config = config.get("leaderboard", {})
+        self.thread_budget = ThreadBudget(config.get("compute"))
+        self.sort_by = self.config.get("sort_by", "accuracy")
+        self.latency_rows = self.config.get("latency_rows", LATENCY_ROWS)
+
+    def build_candidates(self, threads):
+        candidates = {}
+        for spec in self.config.get("candidates", []):
+            module_name, class_name = spec["class"].rsplit(".", 1)
+            try:
+                estimator_class = getattr(importlib.import_module(module_name), class_name)
+            except ImportError as e:
+                # Optional libraries (e.g. xgboost) only join when installed
+                logger.warning(f"Skipping {spec['name']}: {e}")
+                continue
+            estimator = estimator_class(**(spec.get("params") or {}))
+            if "n_jobs" in estimator.get_params():
+                estimator.set_params(n_jobs=threads)
+            candidates[spec["name"]] = estimator
+        return candidates
+
+    def rank(self, rows):
+        leaderboard = pd.DataFrame(rows)
+        if self.sort_by in leaderboard.columns:
+            # Lower is better for the cost columns
+            ascending = self.sort_by in ("fit_time_s", "batch_us_per_row", "single_row_us", "model_size_kb")
+            leaderboard = leaderboard.sort_values(self.sort_by, ascending=ascending, na_position="last")
+        leaderboard.insert(0, "rank", range(1, len(leaderboard) + 1))
+        return leaderboard.reset_index(drop=True)
+
+    def log_to_mlflow(self, leaderboard, candidate_params):
+        import mlflow
+
+        mlflow.set_tracking_uri("file:./mlruns")
+        with mlflow.start_run(run_name="leaderboard"):
+            mlflow.set_tag("stage", "leaderboard")
+            mlflow.log_param("sort_by", self.sort_by)
+            for row in leaderboard.to_dict("records"):
+                with mlflow.start_run(run_name=row["model"], nested=True):
+                    mlflow.set_tags({"stage": "leaderboard", "candidate": row["model"], "rank": row["rank"]})
+                    mlflow.log_params(candidate_params.get(row["model"], {}))
+                    if isinstance(row.get("error"), str):
+                        mlflow.set_tag("error", row["error"])
+                        continue
+                    for name, value in row.items():
+                        if name not in ("model", "rank", "error") and pd.notna(value):
+                            mlflow.log_metric(name, float(value))
+            mlflow.log_artifact(LEADERBOARD_PATH, artifact_path="leaderboard")
+
+    def run(self):
+        try:
+            if not self.config.get("enabled", False):
+                logger.info("Leaderboard disabled (leaderboard.enabled), skipping")
+                return None
+
+            train = load_data(PROCESSED_TRAIN_PATH)
+            test = load_data(PROCESSED_TEST_PATH)
+            X_train, y_train = train.drop(columns=["booking status"]), train["booking status"]
+            X_test, y_test = test.drop(columns=["booking status"]), test["booking status"]
+
+            n_candidates = len(self.config.get("candidates", []))
+            workers, threads = self.thread_budget.split(max(n_candidates, 1))
+            candidates = self.build_candidates(threads)
+            logger.info(f"Scoring {len(candidates)} candidates with {workers} worker processes")
+            rows = evaluate_candidates(
+                candidates, X_train, y_train, X_test, y_test,
+                workers=workers, latency_rows=self.latency_rows
+            )
+
+            leaderboard = self.rank(rows)
+            os.makedirs(os.path.dirname(LEADERBOARD_PATH), exist_ok=True)
+            leaderboard.to_csv(LEADERBOARD_PATH, index=False)
+            logger.info(f"Leaderboard saved to {LEADERBOARD_PATH}\n{leaderboard.to_string(index=False)}")
+
+            candidate_params = {
+                spec["name"]: {"class": spec["class"], **(spec.get("params") or {})}
+                for spec in self.config.get("candidates", [])
+            }
+            self.log_to_mlflow(leaderboard, candidate_params)
+            return leaderboard
+        except Exception as e:
+            logger.error(f"Error while building the model leaderboard: {e}")
+            raise CustomException(e, sys)
@@ -1,12 +1,26 @@
 import os
 import sys
+import json
+import time
+import numpy as np
 import pandas as pd
+import shutil
 import joblib
 import lightgbm as lgb
 from sklearn.model_selection import RandomizedSearchCV
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 from src.logger import get_logger
 from src.custom_exception import CustomException
+from src import stage_metrics
+from src.stage_metrics import profile_stage
+from src.class_balancing import load_class_weight
+from src.hyperparameter_search import SuccessiveHalvingSearch
+from src.thread_budget import ThreadBudget
+from src.tree_export import CompiledTrees, single_row_latency
+from src.model_evaluation import ModelEvaluator
+from src.feature_encoder import FeatureEncoder
+from src.data_profiler import DataProfile
+from src.drift_monitor import build_drift_reference, write_json
+from config.model_params import LIGHTGBM_PARAMS, RANDOM_SEARCH_PARAMS
 from config.path_config import *
 from utils.common_functions import load_data
 import mlflow
@@ -18,6 +32,16 @@ class ModelTraining:
     def __init__(self, config):
         self.config = config
         self.model_path = MODEL_PATH
+        self.best_params = {}
+        self.search_summary = {}
+        self.thread_budget = ThreadBudget(config.get("compute"))
+        self.incremental_config = config.get("model_training", {}).get("incremental", {})
+        self.compiled_config = config.get("model_training", {}).get("compiled_trees", {})
+        self.evaluator = ModelEvaluator(config.get("model_training", {}).get("evaluation"))
+        self.drift_config = config.get("model_training", {}).get("drift_reference", {})
+        # Validation rows and test cost weights for evaluate_model, loaded in run()
+        self.validation = None
+        self.test_weights = None
         
     def load_data(self):
         try:
@@ -35,56 +59,204 @@ class ModelTraining:
             logger.error("Error while loading processed data")
             raise CustomException(e, sys)
 
+    def load_evaluation_data(self, n_test):
+        """Held-out validation rows (X, y, cost weights) and the cost weights of the test rows."""
+        try:
+            validation = None
+            if os.path.exists(PROCESSED_VALIDATION_PATH):
+                val = load_data(PROCESSED_VALIDATION_PATH)
+                validation = (
+                    val.drop(columns=["booking status"]),
+                    val["booking status"],
+                    self.evaluator.row_weights(VALIDATION_ROWS_PATH, len(val))
+                )
+            return validation, self.evaluator.row_weights(TEST_ROWS_PATH, n_test)
+        except Exception as e:
+            logger.error("Error while loading evaluation data")
+            raise CustomException(e, sys)
+
+    @profile_stage("train_model")
     def train_model(self, X_train, y_train):
         try:
-            logger.info("Training LightGBM model")
-            # Using basic params or defaults since config structure might vary
-            model = lgb.LGBMClassifier(random_state=42)
-            
-            # Simple hyperparameter optimization
-            param_grid = {
-                'n_estimators': [50, 100],
-                'learning_rate': [0.01, 0.1],
-                'num_leaves': [31, 50]
-            }
-            
-            random_search = RandomizedSearchCV(
-                estimator=model,
-                param_distributions=param_grid,
-                n_iter=3,
-                cv=2,
-                random_state=42,
-                n_jobs=-1
+            # When preprocessing balanced via class weights instead of resampling,
+            # the weighting happens here.
+            class_weight = load_class_weight(BALANCING_REPORT_PATH)
+            search_config = self.config.get("model_training", {}).get("search", {})
+            method = search_config.get("method", "successive_halving")
+            logger.info(f"Training LightGBM model with {method} search")
+
+            if method == "random":
+                # Parallel CV fits share the cores instead of each LightGBM taking all of them
+                search_params = dict(RANDOM_SEARCH_PARAMS)
+                workers, threads = self.thread_budget.split(search_params["n_iter"] * search_params["cv"])
+                search_params.update(n_jobs=workers, refit=False)
+                random_search = RandomizedSearchCV(
+                    estimator=lgb.LGBMClassifier(random_state=42, class_weight=class_weight, verbose=-1, n_jobs=threads),
+                    param_distributions=LIGHTGBM_PARAMS,
+                    **search_params
+                )
+                random_search.fit(X_train, y_train)
+                self.best_params = random_search.best_params_
+                self.search_summary = {"best_score": random_search.best_score_}
+            else:
+                # Trials run one after another, so each gets every core
+                search = SuccessiveHalvingSearch(
+                    LIGHTGBM_PARAMS, search_config, class_weight=class_weight,
+                    num_threads=self.thread_budget.total_cores
+                )
+                search.fit(X_train, y_train)
+                self.best_params = {**search.best_params_, "n_estimators": search.best_iteration_}
+                self.search_summary = search.summary_
+            logger.info(f"Best parameters: {self.best_params}")
+
+            # Refit the winner on the full training set (at its early-stopped size for successive halving)
+            model = lgb.LGBMClassifier(
+                random_state=42, class_weight=class_weight, verbose=-1,
+                n_jobs=self.thread_budget.total_cores, **self.best_params
             )
-            
-            random_search.fit(X_train, y_train)
-            logger.info(f"Best parameters: {random_search.best_params_}")
-            return random_search.best_estimator_
+            model.fit(X_train, y_train)
+            return model
         except Exception as e:
             logger.error(f"Error while training model: {e}")
             raise CustomException(e, sys)
 
+    @profile_stage("evaluate_model", rows_arg="X_test")
     def evaluate_model(self, model, X_test, y_test):
+        """Metrics and curves from one scoring pass over the test set, operating threshold from the validation rows."""
         try:
             logger.info("Evaluating model")
-            y_pred = model.predict(X_test)
-            metrics = {
-                "accuracy": accuracy_score(y_test, y_pred),
-                "precision": precision_score(y_test, y_pred),
-                "recall": recall_score(y_test, y_pred),
-                "f1": f1_score(y_test, y_pred)
-            }
-            logger.info(f"Metrics: {metrics}")
-            return metrics
+            encoder = FeatureEncoder.load(ENCODER_PATH) if os.path.exists(ENCODER_PATH) else None
+            report = self.evaluator.evaluate(model, X_test, y_test, encoder, self.test_weights, self.validation)
+            logger.info(f"Metrics: {report['metrics']}")
+            return report
         except Exception as e:
             logger.error("Error evaluating model")
             raise CustomException(e, sys)
 
-    def save_model(self, model):
+    @staticmethod
+    def row_hashes(X, y):
+        return pd.util.hash_pandas_object(X.assign(**{y.name: y}), index=False).to_numpy()
+
+    def load_previous(self):
+        """The last saved model with its encoder state, metadata and seen-row hashes, or None."""
+        try:
+            paths = (self.model_path, MODEL_ENCODER_PATH, MODEL_META_PATH, SEEN_ROWS_PATH)
+            if not all(os.path.exists(path) for path in paths):
+                return None
+            with open(MODEL_ENCODER_PATH, "r") as f:
+                encoder_state = json.load(f)
+            with open(MODEL_META_PATH, "r") as f:
+                meta = json.load(f)
+            return {
+                "model": joblib.load(self.model_path),
+                "encoder": encoder_state,
+                "meta": meta,
+                "seen_rows": np.load(SEEN_ROWS_PATH)
+            }
+        except Exception as e:
+            logger.error(f"Error while loading the previous model: {e}")
+            raise CustomException(e, sys)
+
+    def incremental_plan(self, previous):
+        """Whether to continue boosting the previous model, and why (not)."""
+        if not self.incremental_config.get("enabled", False):
+            return False, "incremental training disabled"
+        if previous is None:
+            return False, "no previous model"
+        with open(ENCODER_PATH, "r") as f:
+            # New categories shift the codes and a new skew decision changes a column,
+            # either way the old trees split on different values
+            if json.load(f) != previous["encoder"]:
+                return False, "feature encoding changed"
+        max_updates = self.incremental_config.get("max_incremental_updates", 30)
+        if previous["meta"].get("incremental_updates", 0) >= max_updates:
+            return False, f"{max_updates} incremental updates since the last full retrain"
+        return True, "continuing from the previous model"
+
+    @profile_stage("update_model", rows_arg="X_new")
+    def update_model(self, model, X_new, y_new):
+        try:
+            if len(X_new) == 0:
+                logger.info("No new training rows, keeping the previous model")
+                return model
+            params = model.get_params()
+            params.update(
+                n_estimators=self.incremental_config.get("n_estimators", 100),
+                n_jobs=self.thread_budget.total_cores
+            )
+            if self.incremental_config.get("learning_rate"):
+                params["learning_rate"] = self.incremental_config["learning_rate"]
+            logger.info(f"Adding {params['n_estimators']} boosting rounds on {len(X_new)} new rows")
+            updated = lgb.LGBMClassifier(**params)
+            updated.fit(X_new, y_new, init_model=model.booster_)
+            return updated
+        except Exception as e:
+            logger.error(f"Error while updating model: {e}")
+            raise CustomException(e, sys)
+
+    def compile_trees(self, model, X_test):
+        """Flattens the model for NumPy serving, or None if it does not reproduce predict_proba."""
+        if not self.compiled_config.get("export", True):
+            return None, {}
+        try:
+            compiled = CompiledTrees.from_model(model)
+        except CustomException as e:
+            logger.warning(f"Model not exported as compiled trees: {e}")
+            return None, {}
+        report = {"max_abs_diff": compiled.max_abs_diff(model, X_test)}
+        for name, value in single_row_latency(model, compiled, X_test).items():
+            report[f"{name}_us_per_row"] = value
+        logger.info(f"Compiled trees: {report}")
+        if report["max_abs_diff"] > self.compiled_config.get("tolerance", 1e-9):
+            logger.warning("Compiled trees disagree with predict_proba beyond tolerance, not exporting them")
+            return None, report
+        return compiled, report
+
+    def drift_reference(self, evaluation):
+        """Bins and expected proportions for online drift monitoring, or None without a data profile."""
+        if not os.path.exists(TRAIN_DATA_PROFILE_PATH):
+            logger.warning(f"No data profile at {TRAIN_DATA_PROFILE_PATH}, not saving a drift reference")
+            return None
+        try:
+            features = self.drift_config.get("features") or FeatureEncoder.load(ENCODER_PATH).features
+            return build_drift_reference(
+                DataProfile.load(TRAIN_DATA_PROFILE_PATH), features, evaluation["scores"],
+                bins=self.drift_config.get("bins", 10), max_categories=self.drift_config.get("max_categories", 50)
+            )
+        except Exception as e:
+            logger.error(f"Error while building drift reference: {e}")
+            raise CustomException(e, sys)
+
+    def save_model(self, model, meta=None, seen_rows=None, compiled=None, drift_reference=None):
         try:
             os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
+            # The encoder, drift reference and metadata go first, then the compiled trees, so a watcher
+            # reloading on the model file (or on the trees, for slim serving) always
+            # picks up the ones it was trained with
+            if os.path.exists(ENCODER_PATH):
+                shutil.copy(ENCODER_PATH, f"{MODEL_ENCODER_PATH}.tmp")
+                os.replace(f"{MODEL_ENCODER_PATH}.tmp", MODEL_ENCODER_PATH)
+            if drift_reference is not None:
+                write_json(drift_reference, DRIFT_REFERENCE_PATH)
+            elif os.path.exists(DRIFT_REFERENCE_PATH):
+                os.remove(DRIFT_REFERENCE_PATH)
+            if meta is not None:
+                with open(f"{MODEL_META_PATH}.tmp", "w") as f:
+                    json.dump(meta, f, indent=2)
+                os.replace(f"{MODEL_META_PATH}.tmp", MODEL_META_PATH)
+            if compiled is not None:
+                compiled.save(MODEL_TREES_PATH)
+            elif os.path.exists(MODEL_TREES_PATH):
+                os.remove(MODEL_TREES_PATH)
+            if seen_rows is not None:
+                with open(f"{SEEN_ROWS_PATH}.tmp", "wb") as f:
+                    np.save(f, seen_rows)
+                os.replace(f"{SEEN_ROWS_PATH}.tmp", SEEN_ROWS_PATH)
             logger.info(f"Saving model to {self.model_path}")
-            joblib.dump(model, self.model_path)
+            # Write next to the target and rename so serving never sees a partial file
+            tmp_path = f"{self.model_path}.tmp"
+            joblib.dump(model, tmp_path)
+            os.replace(tmp_path, self.model_path)
         except Exception as e:
             logger.error("Error saving model")
             raise CustomException(e, sys)
@@ -96,13 +268,79 @@ class ModelTraining:
             
             with mlflow.start_run():
                 X_train, y_train, X_test, y_test = self.load_data()
-                model = self.train_model(X_train, y_train)
-                metrics = self.evaluate_model(model, X_test, y_test)
-                self.save_model(model)
+                self.validation, self.test_weights = self.load_evaluation_data(len(X_test))
+                train_hashes = self.row_hashes(X_train, y_train)
+                previous = self.load_previous()
+                incremental, reason = self.incremental_plan(previous)
+
+                if incremental:
+                    new_rows = ~np.isin(train_hashes, previous["seen_rows"])
+                    mlflow.log_metric("incremental.new_rows", int(new_rows.sum()))
+                    model = self.update_model(previous["model"], X_train[new_rows], y_train[new_rows])
+                    evaluation = self.evaluate_model(model, X_test, y_test)
+                    metrics = evaluation["metrics"]
+                    previous_metrics = self.evaluate_model(previous["model"], X_test, y_test)["metrics"]
+                    for name, value in previous_metrics.items():
+                        mlflow.log_metric(f"previous_model.{name}", value)
+
+                    metric = self.incremental_config.get("metric", "accuracy")
+                    drop = previous_metrics[metric] - metrics[metric]
+                    if drop > self.incremental_config.get("max_metric_drop", 0.01):
+                        # Keep what the rejected update scored next to the full retrain
+                        for name, value in metrics.items():
+                            mlflow.log_metric(f"incremental_candidate.{name}", value)
+                        incremental, reason = False, f"{metric} dropped by {drop:.4f} after the incremental update"
+                        logger.info(f"Falling back to a full retrain: {reason}")
+
+                if incremental:
+                    self.best_params = previous["meta"].get("best_params", {})
+                    seen_rows = np.union1d(previous["seen_rows"], train_hashes)
+                    updates = previous["meta"].get("incremental_updates", 0) + int(new_rows.any())
+                else:
+                    model = self.train_model(X_train, y_train)
+                    evaluation = self.evaluate_model(model, X_test, y_test)
+                    metrics = evaluation["metrics"]
+                    seen_rows = np.unique(train_hashes)
+                    updates = 0
+
+                training_mode = "incremental" if incremental else "full"
+                logger.info(f"Training mode: {training_mode} ({reason})")
+                meta = {
+                    "training_mode": training_mode,
+                    "reason": reason,
+                    "incremental_updates": updates,
+                    "rows_seen": int(len(seen_rows)),
+                    "best_params": {k: v.item() if hasattr(v, "item") else v for k, v in self.best_params.items()},
+                    "metrics": metrics,
+                    # Serving flags positive_label when its probability reaches decision_threshold
+                    "positive_label": evaluation["positive_label"],
+                    "decision_threshold": evaluation["decision_threshold"],
+                    "threshold_source": evaluation["threshold_source"],
+                    "trained_at": time.time()
+                }
+                compiled, compiled_report = self.compile_trees(model, X_test)
+                evaluation_dir = self.evaluator.save_report(evaluation, EVALUATION_DIR)
+                drift_reference = self.drift_reference(evaluation)
+                self.save_model(model, meta, seen_rows, compiled, drift_reference)
                 
                 # Log to MLflow
+                mlflow.set_tags({"training_mode": training_mode, "training_reason": reason,
+                                 "threshold_source": evaluation["threshold_source"]})
                 for name, value in metrics.items():
                     mlflow.log_metric(name, value)
+                mlflow.log_params(self.best_params)
+                for name, value in self.search_summary.items():
+                    mlflow.log_metric(f"search.{name}", float(value))
+                for name, value in compiled_report.items():
+                    mlflow.log_metric(f"compiled_trees.{name}", value)
+                # Timing/memory of every stage that ran in this process
+                stage_metrics.log_to_mlflow(mlflow)
+                mlflow.log_artifacts(evaluation_dir, artifact_path="evaluation")
+                if drift_reference is not None:
+                    mlflow.log_artifact(DRIFT_REFERENCE_PATH, artifact_path="monitoring")
+                for report_path in (FEATURE_SELECTION_REPORT_PATH, BALANCING_REPORT_PATH):
+                    if os.path.exists(report_path):
+                        mlflow.log_artifact(report_path, artifact_path="preprocessing")
                 
                 mlflow.sklearn.log_model(model, "model")
                 logger.info("Model training pipeline complete")
@@ -0,0 +1,173 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+from datetime import datetime
+from src.logger import get_logger
+from src.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+HASH_INDEX_FILE = "hash_index.json"
+MANIFEST_FILE = "manifest.json"
+
+class StageCache:
+    """
+    Content-addressed cache for pipeline stages. A stage's fingerprint covers
+    its input files, its config sections and its source code; outputs are kept
+    under <cache_dir>/<stage>/<fingerprint>/ so any previously seen
+    combination can be restored instead of recomputed.
+    """
+    def __init__(self, cache_dir, max_entries_per_stage=3):
+        self.cache_dir = cache_dir
+        self.max_entries_per_stage = max_entries_per_stage
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index_path = os.path.join(self.cache_dir, HASH_INDEX_FILE)
+        self._hash_index = self._load_hash_index()
+
+    def _load_hash_index(self):
+        if os.path.exists(self._index_path):
+            with open(self._index_path, "r") as f:
+                return json.load(f)
+        return {}
+
+    def _save_hash_index(self):
+        tmp_path = f"{self._index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._hash_index, f)
+        os.replace(tmp_path, self._index_path)
+
+    def _file_digest(self, file_path):
+        # Re-hash only when size or mtime changed since the last time we looked
+        st = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        cached = self._hash_index.get(key)
+        if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+            return cached["sha256"]
+
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self._hash_index[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest.hexdigest()}
+        return digest.hexdigest()
+
+    def path_digest(self, path):
+        if os.path.isdir(path):
+            digest = hashlib.sha256()
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    file_path = os.path.join(root, name)
+                    digest.update(os.path.relpath(file_path, path).encode())
+                    digest.update(self._file_digest(file_path).encode())
+            return digest.hexdigest()
+        if os.path.exists(path):
+            return self._file_digest(path)
+        return None
+
+    def fingerprint(self, stage, inputs, config, code_files):
+        try:
+            payload = {
+                "stage": stage,
+                "inputs": {path: self.path_digest(path) for path in inputs},
+                "config": config,
+                "code": {path: self.path_digest(path) for path in code_files}
+            }
+            self._save_hash_index()
+            return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        except Exception as e:
+            logger.error(f"Error while fingerprinting stage {stage}: {e}")
+            raise CustomException(e, sys)
+
+    def _entry_dir(self, stage, fingerprint):
+        return os.path.join(self.cache_dir, stage, fingerprint)
+
+    def restore(self, stage, fingerprint, outputs):
+        """
+        Returns True when the stage can be skipped: either the current outputs
+        already are the cached ones, or they were copied back from the cache.
+        """
+        try:
+            entry_dir = self._entry_dir(stage, fingerprint)
+            manifest_path = os.path.join(entry_dir, MANIFEST_FILE)
+            if not os.path.exists(manifest_path):
+                return False
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+            if not set(manifest["outputs"]) <= set(outputs):
+                return False
+
+            for path in outputs:
+                # Optional output the cached run did not produce, drop any newer copy
+                if path not in manifest["outputs"] and os.path.isdir(path):
+                    shutil.rmtree(path)
+                elif path not in manifest["outputs"] and os.path.exists(path):
+                    os.remove(path)
+            for path, entry in manifest["outputs"].items():
+                if self.path_digest(path) == entry["sha256"]:
+                    continue
+                cached_path = os.path.join(entry_dir, entry["file"])
+                self._copy(cached_path, path)
+                logger.info(f"Restored {path} from stage cache")
+            self._save_hash_index()
+            os.utime(manifest_path)
+            return True
+        except Exception as e:
+            logger.error(f"Error while restoring stage {stage} from cache: {e}")
+            raise CustomException(e, sys)
+
+    def store(self, stage, fingerprint, outputs):
+        try:
+            entry_dir = self._entry_dir(stage, fingerprint)
+            tmp_dir = f"{entry_dir}.tmp"
+            if os.path.exists(tmp_dir):
+                shutil.rmtree(tmp_dir)
+            os.makedirs(tmp_dir)
+
+            manifest = {"stage": stage, "created_at": datetime.now().isoformat(timespec="seconds"), "outputs": {}}
+            for i, path in enumerate(outputs):
+                if not os.path.exists(path):
+                    continue
+                name = f"{i}_{os.path.basename(path)}"
+                self._copy(path, os.path.join(tmp_dir, name))
+                manifest["outputs"][path] = {"file": name, "sha256": self.path_digest(path)}
+            with open(os.path.join(tmp_dir, MANIFEST_FILE), "w") as f:
+                json.dump(manifest, f, indent=2)
+
+            if os.path.exists(entry_dir):
+                shutil.rmtree(entry_dir)
+            os.replace(tmp_dir, entry_dir)
+            self._save_hash_index()
+            self._evict(stage)
+            logger.info(f"Cached outputs of stage {stage} under {fingerprint}")
+        except Exception as e:
+            logger.error(f"Error while caching stage {stage}: {e}")
+            raise CustomException(e, sys)
+
+    def _evict(self, stage):
+        stage_dir = os.path.join(self.cache_dir, stage)
+        entries = [
+            os.path.join(stage_dir, name) for name in os.listdir(stage_dir)
+            if os.path.exists(os.path.join(stage_dir, name, MANIFEST_FILE))
+        ]
+        entries.sort(key=lambda d: os.path.getmtime(os.path.join(d, MANIFEST_FILE)), reverse=True)
+        for old_entry in entries[self.max_entries_per_stage:]:
+            shutil.rmtree(old_entry)
+
+    @staticmethod
+    def _copy(src, dst):
+        # Copy beside the target and swap it in, so readers such as the
+        # serving model watcher never see a partially copied file
+        os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+        tmp_dst = f"{dst}.tmp"
+        if os.path.isdir(src):
+            if os.path.exists(tmp_dst):
+                shutil.rmtree(tmp_dst)
+            shutil.copytree(src, tmp_dst, copy_function=shutil.copy)
+            if os.path.exists(dst):
+                shutil.rmtree(dst)
+        else:
+            shutil.copy(src, tmp_dst)
+        os.replace(tmp_dst, dst)
@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import time
+import cProfile
+import inspect
+import threading
+import functools
+from contextlib import contextmanager
+from src.logger import get_logger
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = get_logger(__name__)
+
+_settings = {"enabled": True, "cprofile": False, "sample_interval": 0.01, "profile_dir": "artifacts/profiles"}
+_records = {}
+_lock = threading.Lock()
+
+def configure(profiling_config=None, profile_dir=None):
+    if profiling_config:
+        _settings.update({k: v for k, v in profiling_config.items() if k in _settings})
+    if profile_dir:
+        _settings["profile_dir"] = profile_dir
+
+def _current_rss():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        # ru_maxrss is the process-wide peak (KiB on Linux, bytes on macOS)
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+class _PeakRssSampler(threading.Thread):
+    def __init__(self, interval):
+        super().__init__(name="rss-sampler", daemon=True)
+        self.interval = interval
+        self.peak = _current_rss()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, _current_rss())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, _current_rss())
+        return self.peak
+
+@contextmanager
+def track_stage(name, rows=None):
+    """
+    Records wall time, CPU time, peak RSS and rows/sec for the wrapped block.
+    The yielded dict can be updated with the number of rows once known.
+    """
+    stage = {"rows": rows}
+    if not _settings["enabled"]:
+        yield stage
+        return
+
+    sampler = _PeakRssSampler(_settings["sample_interval"])
+    sampler.start()
+    profiler = cProfile.Profile() if _settings["cprofile"] else None
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield stage
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        peak_rss = sampler.stop()
+        _record(name, wall, cpu, peak_rss, stage.get("rows"), profiler)
+
+def profile_stage(name, rows_arg=None, rows_attr=None):
+    """
+    Decorator form of track_stage. Rows are len() of the argument named
+    rows_arg (default: the first argument after self), or the value of
+    self.<rows_attr> after the call.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        params = list(signature.parameters)
+        arg_name = rows_arg or (params[1] if len(params) > 1 else None)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rows = None
+            if rows_attr is None and arg_name is not None:
+                value = signature.bind_partial(*args, **kwargs).arguments.get(arg_name)
+                rows = len(value) if hasattr(value, "__len__") else None
+            with track_stage(name, rows) as stage:
+                result = func(*args, **kwargs)
+                if rows_attr is not None:
+                    stage["rows"] = getattr(args[0], rows_attr, None)
+            return result
+        return wrapper
+    return decorator
+
+def _record(name, wall, cpu, peak_rss, rows, profiler):
+    with _lock:
+        record = _records.setdefault(name, {
+            "calls": 0, "wall_time_s": 0.0, "cpu_time_s": 0.0, "peak_rss_mb": 0.0, "rows": 0
+        })
+        record["calls"] += 1
+        record["wall_time_s"] += wall
+        record["cpu_time_s"] += cpu
+        record["peak_rss_mb"] = max(record["peak_rss_mb"], peak_rss / (1024 * 1024))
+        if rows:
+            record["rows"] += int(rows)
+        record["rows_per_s"] = record["rows"] / record["wall_time_s"] if record["wall_time_s"] > 0 else 0.0
+
+        if profiler is not None:
+            os.makedirs(_settings["profile_dir"], exist_ok=True)
+            prof_path = os.path.join(_settings["profile_dir"], f"{name}_{record['calls']}.prof")
+            profiler.dump_stats(prof_path)
+            record.setdefault("profiles", []).append(prof_path)
+
+    logger.info(
+        f"Stage {name}: wall {wall:.3f}s, cpu {cpu:.3f}s, peak rss {peak_rss / (1024 * 1024):.1f} MB"
+        + (f", {rows / wall:.0f} rows/s" if rows and wall > 0 else "")
+    )
+
+def get_records():
+    with _lock:
+        return json.loads(json.dumps(_records))
+
+def reset():
+    with _lock:
+        _records.clear()
+
+def log_to_mlflow(mlflow):
+    """Logs every recorded stage as metrics plus a JSON summary on the active run."""
+    records = get_records()
+    if not records:
+        return
+    for name, record in records.items():
+        for key in ("wall_time_s", "cpu_time_s", "peak_rss_mb", "rows_per_s"):
+            mlflow.log_metric(f"{name}.{key}", record[key])
+
+    os.makedirs(_settings["profile_dir"], exist_ok=True)
+    summary_path = os.path.join(_settings["profile_dir"], "stage_metrics.json")
+    with open(summary_path, "w") as f:
+        json.dump(records, f, indent=2)
+    mlflow.log_artifact(summary_path, artifact_path="profiling")
+    for record in records.values():
+        for prof_path in record.get("profiles", []):
+            mlflow.log_artifact(prof_path, artifact_path="profiling")
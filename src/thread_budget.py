@@ -0,0 +1,47 @@
+import os
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+def available_cores():
+    """Cores this process may actually use: CPU affinity, capped by a cgroup CPU quota."""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max", "r") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            cores = min(cores, max(1, -(-int(quota) // int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cores)
+
+class ThreadBudget:
+    """
+    Splits a fixed number of cores between parallel fits and the threads
+    each fit uses, so workers x threads never exceeds the machine.
+
+    Nested n_jobs=-1 (one joblib worker per core, each LightGBM also taking
+    every core) runs cores^2 threads; here each worker gets
+    total_cores // workers threads instead.
+    """
+    def __init__(self, config=None):
+        config = config or {}
+        self.total_cores = config.get("total_cores") or available_cores()
+        self.search_workers = config.get("search_workers")
+
+    def split(self, n_tasks):
+        """(workers, threads_per_worker) for n_tasks independent fits."""
+        workers = self.search_workers or self.total_cores
+        workers = max(1, min(workers, n_tasks, self.total_cores))
+        threads = max(1, self.total_cores // workers)
+        logger.info(f"Thread budget: {workers} workers x {threads} threads for {n_tasks} fits on {self.total_cores} cores")
+        return workers, threads
+
+    def resolve(self, n_jobs):
+        """Turn an sklearn-style n_jobs (None or -1 for all) into a thread count within the budget."""
+        if n_jobs is None or n_jobs < 1:
+            return self.total_cores
+        return min(n_jobs, self.total_cores)
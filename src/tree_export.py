@@ -0,0 +1,191 @@
+import os
+import sys
+import time
+import numpy as np
+from src.logger import get_logger
+from src.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+MISSING_TYPES = {"None": 0, "Zero": 1, "NaN": 2}
+# LightGBM treats |x| <= kZeroThreshold as zero for missing_type Zero
+ZERO_THRESHOLD = 1e-35
+
+class CompiledTrees:
+    """
+    A binary LightGBM model flattened into flat node arrays and scored with
+    NumPy, without the sklearn/LightGBM wrappers.
+
+    Every node of every tree lives in the same arrays: split feature,
+    threshold, left/right child and leaf value. Leaves point to themselves,
+    so all trees advance together for max_depth steps and the raw score is
+    the sum of the leaves reached. Drop-in for the model in serving: it has
+    classes_ and predict_proba, and scoring needs neither sklearn nor
+    LightGBM.
+    """
+    ARRAYS = ("feature", "threshold", "left", "right", "default_left", "missing_type", "value", "roots")
+
+    def __init__(self, feature, threshold, left, right, default_left, missing_type, value, roots,
+                 max_depth, sigmoid, classes, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.missing_type = missing_type
+        self.value = value
+        self.max_depth = int(max_depth)
+        self.sigmoid = float(sigmoid)
+        self.classes_ = np.asarray(classes)
+        self.n_features = int(n_features)
+        # Node i's children at 2i (left) and 2i + 1 (right), so a step is one take
+        self._children = np.column_stack([left, right]).ravel().astype(np.intp)
+        self._feature = feature.astype(np.intp)
+        self.roots = roots.astype(np.intp)
+        self._has_zero_rule = bool((missing_type == 1).any())
+
+    @classmethod
+    def from_model(cls, model):
+        """Flattens a fitted binary LGBMClassifier."""
+        try:
+            dump = model.booster_.dump_model()
+            objective = dump.get("objective", "")
+            if not objective.startswith("binary") or len(model.classes_) != 2:
+                raise ValueError(f"Only binary models can be compiled, got objective '{objective}'")
+            sigmoid = 1.0
+            for part in objective.split():
+                if part.startswith("sigmoid:"):
+                    sigmoid = float(part.split(":")[1])
+
+            nodes = {name: [] for name in cls.ARRAYS if name != "roots"}
+            roots = []
+            max_depth = 0
+
+            def add_node():
+                for values in nodes.values():
+                    values.append(0)
+                return len(nodes["feature"]) - 1
+
+            for tree in dump["tree_info"]:
+                stack = [(tree["tree_structure"], add_node(), 0)]
+                roots.append(stack[0][1])
+                while stack:
+                    node, index, depth = stack.pop()
+                    max_depth = max(max_depth, depth)
+                    if "leaf_value" in node:
+                        nodes["feature"][index] = 0
+                        nodes["left"][index] = nodes["right"][index] = index
+                        nodes["value"][index] = node["leaf_value"]
+                        continue
+                    if node["decision_type"] != "<=":
+                        raise ValueError(f"Unsupported split '{node['decision_type']}' (categorical features)")
+                    left, right = add_node(), add_node()
+                    nodes["feature"][index] = node["split_feature"]
+                    nodes["threshold"][index] = node["threshold"]
+                    nodes["default_left"][index] = node["default_left"]
+                    nodes["missing_type"][index] = MISSING_TYPES[node["missing_type"]]
+                    nodes["left"][index], nodes["right"][index] = left, right
+                    stack.append((node["left_child"], left, depth + 1))
+                    stack.append((node["right_child"], right, depth + 1))
+
+            return cls(
+                feature=np.asarray(nodes["feature"], dtype=np.int32),
+                threshold=np.asarray(nodes["threshold"], dtype=np.float64),
+                left=np.asarray(nodes["left"], dtype=np.int32),
+                right=np.asarray(nodes["right"], dtype=np.int32),
+                default_left=np.asarray(nodes["default_left"], dtype=bool),
+                missing_type=np.asarray(nodes["missing_type"], dtype=np.int8),
+                value=np.asarray(nodes["value"], dtype=np.float64),
+                roots=np.asarray(roots, dtype=np.int32),
+                max_depth=max_depth,
+                sigmoid=sigmoid,
+                classes=model.classes_,
+                n_features=dump["max_feature_idx"] + 1
+            )
+        except Exception as e:
+            logger.error(f"Error while compiling model trees: {e}")
+            raise CustomException(e, sys)
+
+    def _go_right_missing(self, x, node):
+        # Same missing-value rules as LightGBM's numerical decision
+        missing = self.missing_type.take(node)
+        is_nan = np.isnan(x)
+        x = np.where(is_nan & (missing != 2), 0.0, x)
+        use_default = ((missing == 1) & (np.abs(x) <= ZERO_THRESHOLD)) | ((missing == 2) & is_nan)
+        return np.where(use_default, ~self.default_left.take(node), x > self.threshold.take(node))
+
+    def raw_score(self, X):
+        X = np.asarray(X, dtype=np.float64).reshape(-1, self.n_features)
+        plain = not (self._has_zero_rule or np.isnan(X).any())
+        children, feature, threshold = self._children, self._feature, self.threshold
+        if len(X) == 1:
+            # One booking: 1-D takes only, the shortest path through NumPy
+            row = X[0]
+            node = self.roots
+            for _ in range(self.max_depth):
+                x = row.take(feature.take(node))
+                go_right = x > threshold.take(node) if plain else self._go_right_missing(x, node)
+                node = children.take(2 * node + go_right)
+            return np.array([self.value.take(node).sum()])
+        rows = np.arange(len(X))[:, None]
+        node = np.tile(self.roots, (len(X), 1))
+        for _ in range(self.max_depth):
+            x = X[rows, feature.take(node)]
+            go_right = x > threshold.take(node) if plain else self._go_right_missing(x, node)
+            node = children.take(2 * node + go_right)
+        return self.value.take(node).sum(axis=1)
+
+    def predict_proba(self, X):
+        prob = 1.0 / (1.0 + np.exp(-self.sigmoid * self.raw_score(X)))
+        return np.column_stack([1 - prob, prob])
+
+    def predict(self, X):
+        return self.classes_[(self.predict_proba(X)[:, 1] > 0.5).astype(int)]
+
+    def max_abs_diff(self, model, X):
+        """Largest probability difference against the LightGBM model on X."""
+        return float(np.max(np.abs(self.predict_proba(X) - model.predict_proba(X))))
+
+    def save(self, file_path):
+        try:
+            tmp_path = f"{file_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f, **{name: getattr(self, name) for name in self.ARRAYS},
+                    max_depth=self.max_depth, sigmoid=self.sigmoid,
+                    classes=self.classes_, n_features=self.n_features
+                )
+            os.replace(tmp_path, file_path)
+            logger.info(f"Compiled trees saved to {file_path} ({len(self.roots)} trees, {len(self.value)} nodes)")
+        except Exception as e:
+            logger.error(f"Error while saving compiled trees: {e}")
+            raise CustomException(e, sys)
+
+    @classmethod
+    def load(cls, file_path):
+        try:
+            with np.load(file_path) as data:
+                return cls(**{name: data[name] for name in data.files})
+        except Exception as e:
+            logger.error(f"Error while loading compiled trees from {file_path}: {e}")
+            raise CustomException(e, sys)
+
+def single_row_latency(model, compiled, X, n_rows=200):
+    """
+    Mean microseconds to score one row of the X DataFrame: sklearn
+    predict_proba on a one-row frame, the raw booster and the compiled trees.
+    """
+    X = X.iloc[:n_rows]
+    values = X.to_numpy(dtype=np.float64)
+    scorers = {
+        "predict_proba": lambda i: model.predict_proba(X.iloc[i:i + 1]),
+        "booster": lambda i: model.booster_.predict(values[i:i + 1]),
+        "compiled_trees": lambda i: compiled.predict_proba(values[i:i + 1])
+    }
+    latency = {}
+    for name, score in scorers.items():
+        start = time.perf_counter()
+        for i in range(len(X)):
+            score(i)
+        latency[name] = (time.perf_counter() - start) / len(X) * 1e6
+    return latency
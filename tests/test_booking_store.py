@@ -0,0 +1,86 @@
+import os
+import numpy as np
+import pandas as pd
+from config.path_config import ARTIFACT_EXT, STORE_SPLIT_DIR, STORE_SPLIT_PATH
+from src.booking_store import BookingStore, key_hashes
+from src.data_ingestion import DataIngestion
+from utils.common_functions import load_data
+
+def bookings(ids, month="1"):
+    return pd.DataFrame({
+        "Booking_ID": [f"INN{i:05d}" for i in ids],
+        "date of reservation": [f"{month}/15/2018"] * len(ids),
+        "lead time": list(ids)
+    })
+
+def open_store(root, max_index_runs=8):
+    return BookingStore({"max_index_runs": max_index_runs}, root=str(root))
+
+def stored_hashes(store):
+    return np.sort(np.concatenate([np.asarray(run) for run in store._index_runs()]))
+
+def test_append_skips_duplicates_within_and_across_batches(tmp_path):
+    store = open_store(tmp_path)
+    summary = store.append([bookings([1, 2, 2]), bookings([3, 1]), bookings([])])
+    assert summary["rows_added"] == 3 and summary["duplicates"] == 2
+
+    summary = store.append(bookings([2, 3, 4, 4]))
+    assert summary["rows_added"] == 1 and summary["duplicates"] == 3
+    assert store.append(bookings([1, 4]))["rows_added"] == 0
+    assert sorted(store.read()["Booking_ID"]) == [f"INN{i:05d}" for i in [1, 2, 3, 4]]
+    assert store.last_seq == 3
+
+def test_merge_keeps_the_largest_run_until_the_rest_outgrow_it(tmp_path):
+    store = open_store(tmp_path, max_index_runs=2)
+    store.append(bookings(range(100)))
+    store.append(bookings([100]))
+    assert len(store.manifest["index_runs"]) == 2
+
+    # Third run: the two small ones merge, the large one is kept as is
+    store.append(bookings([101]))
+    runs = store.manifest["index_runs"]
+    assert runs[0] == os.path.join("index", "run-000001.npy") and runs[1].endswith("-merged.npy")
+    assert sorted(os.listdir(tmp_path / "index")) == ["run-000001.npy", "run-000003-merged.npy"]
+
+    # Once the merged runs hold at least as many keys, everything merges into one
+    store.append(bookings(range(200, 300)))
+    assert len(store.manifest["index_runs"]) == 1
+    expected = np.sort(key_hashes(bookings([*range(102), *range(200, 300)])["Booking_ID"]))
+    np.testing.assert_array_equal(stored_hashes(store), expected)
+
+def test_dedup_after_merges_and_reopen(tmp_path):
+    store = open_store(tmp_path, max_index_runs=2)
+    for start in range(0, 50, 10):
+        store.append(bookings(range(start, start + 10)))
+    assert len(store.manifest["index_runs"]) <= 2
+
+    store = open_store(tmp_path, max_index_runs=2)
+    summary = store.append(bookings(range(45, 55)))
+    assert summary["rows_added"] == 5
+    assert store.contains(bookings([0, 49, 54, 55])["Booking_ID"]).tolist() == [True, True, True, False]
+    assert store.rows == 55
+
+def test_store_split_only_rewrites_changed_partitions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = {"data_ingestion": {"train_ratio": 0.8, "mode": "store", "store": {}}}
+    ingestion = DataIngestion(config)
+    store = open_store(tmp_path / "store")
+    store.append(pd.concat([bookings(range(50), "1"), bookings(range(50, 100), "2")]))
+    ingestion.split_from_store(store)
+    assert ingestion.rows_ingested == 100
+
+    january = [os.path.join(STORE_SPLIT_DIR, side, f"2018-01{ARTIFACT_EXT}") for side in ["train", "test"]]
+    written = [os.stat(path).st_mtime_ns for path in january]
+
+    store.append(bookings(range(100, 120), "2"))
+    monkeypatch.setattr(DataIngestion, "ingest_to_store", lambda self: (store, 20))
+    ingestion.run_store()
+    # Only February (50 old + 20 new rows) was split again
+    assert ingestion.rows_ingested == 70
+    assert [os.stat(path).st_mtime_ns for path in january] == written
+
+    train_paths, test_paths = DataIngestion.split_paths(config)
+    assert len(train_paths) == len(test_paths) == 2
+    rows = pd.concat([load_data(path) for path in train_paths + test_paths])
+    assert sorted(rows["lead time"]) == list(range(120))
+    assert os.path.exists(STORE_SPLIT_PATH)
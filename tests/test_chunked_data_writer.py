@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.common_functions import ChunkedDataWriter, load_data
+
+FORMATS = ["csv", "parquet", "feather", "npy"]
+
+def write_chunks(path, chunks):
+    with ChunkedDataWriter(str(path)) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_int_column_with_later_nan_is_promoted_to_float(tmp_path, fmt):
+    chunks = [pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}),
+              pd.DataFrame({"a": [np.nan, 3.0], "b": ["z", "x"]})]
+    writer = write_chunks(tmp_path / f"out.{fmt}", chunks)
+
+    df = load_data(str(tmp_path / f"out.{fmt}"))
+    assert writer.rows == 4
+    assert df["a"].dtype == np.float64
+    np.testing.assert_array_equal(df["a"].to_numpy(), [1.0, 2.0, np.nan, 3.0])
+    assert df["b"].tolist() == ["x", "y", "z", "x"]
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_fractional_values_after_int_chunks_are_kept(tmp_path, fmt):
+    chunks = [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3]}), pd.DataFrame({"a": [2.5]})]
+    write_chunks(tmp_path / f"out.{fmt}", chunks)
+
+    df = load_data(str(tmp_path / f"out.{fmt}"))
+    np.testing.assert_array_equal(df["a"].to_numpy(), [1.0, 2.0, 3.0, 2.5])
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_later_narrower_chunk_keeps_the_wider_dtype(tmp_path, fmt):
+    chunks = [pd.DataFrame({"a": [0.5, np.nan]}), pd.DataFrame({"a": [4]})]
+    write_chunks(tmp_path / f"out.{fmt}", chunks)
+
+    df = load_data(str(tmp_path / f"out.{fmt}"))
+    assert df["a"].dtype == np.float64
+    np.testing.assert_array_equal(df["a"].to_numpy(), [0.5, np.nan, 4.0])
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather", "npy"])
+def test_numbers_then_text_become_text(tmp_path, fmt):
+    chunks = [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": ["x", None]})]
+    write_chunks(tmp_path / f"out.{fmt}", chunks)
+
+    df = load_data(str(tmp_path / f"out.{fmt}"))
+    assert df["a"].iloc[:3].tolist() == ["1", "2", "x"]
+    assert pd.isna(df["a"].iloc[3])
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_empty_chunks_do_not_fix_the_dtypes(tmp_path, fmt):
+    empty = pd.DataFrame({"a": pd.Series([], dtype=object)})
+    writer = write_chunks(tmp_path / f"out.{fmt}", [empty, pd.DataFrame({"a": [1, 2]}), empty])
+
+    df = load_data(str(tmp_path / f"out.{fmt}"))
+    assert writer.rows == 2
+    assert df["a"].tolist() == [1, 2]
+
+def test_npy_numeric_columns_stay_memory_mapped(tmp_path):
+    path = str(tmp_path / "out.npy")
+    write_chunks(path, [pd.DataFrame({"a": [1.5, 2.5], "b": [1, 2], "c": ["x", "y"]})])
+
+    df = load_data(path)
+    for i, col in enumerate(["a", "b"]):
+        # The column's memory is a map of its .npy file, not a copy
+        values = df[col].to_numpy()
+        while values is not None and not isinstance(values, np.memmap):
+            values = values.base
+        assert values is not None and values.filename == str(tmp_path / "out.npy" / f"{i}.npy")
+    assert df["c"].tolist() == ["x", "y"]
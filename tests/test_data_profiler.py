@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_profiler import ColumnProfile, DataProfiler
+
+def chunked_profile(series, chunk_size, quantile_bins=1024):
+    profile = ColumnProfile("numeric", quantile_bins)
+    for start in range(0, len(series), chunk_size):
+        profile.merge(ColumnProfile.from_series(series.iloc[start:start + chunk_size], "numeric", quantile_bins))
+    return profile
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 250, 5000])
+def test_chunked_moments_and_quantiles_match_pandas(chunk_size):
+    rng = np.random.default_rng(0)
+    # Skewed with repeated values, so the bins stay exact
+    series = pd.Series(np.round(rng.lognormal(3, 1, 5000)))
+    chunked = chunked_profile(series, chunk_size)
+    full = ColumnProfile.from_series(series, "numeric")
+
+    for profile in (chunked, full):
+        assert profile.exact and profile.count == len(series)
+        assert profile.mean == pytest.approx(series.mean(), rel=1e-12)
+        assert profile.std == pytest.approx(series.std(), rel=1e-9)
+        assert profile.skew == pytest.approx(series.skew(), rel=1e-9)
+        for q in [0, 0.01, 0.25, 0.5, 0.9, 0.99, 1]:
+            assert profile.quantile(q) == pytest.approx(series.quantile(q), rel=1e-12)
+    np.testing.assert_array_equal(chunked.values, full.values)
+    np.testing.assert_array_equal(chunked.weights, full.weights)
+
+def test_merge_order_and_nulls_do_not_change_the_profile():
+    rng = np.random.default_rng(1)
+    series = pd.Series(rng.exponential(10, 3000)).round(1)
+    series[rng.choice(3000, 100, replace=False)] = np.nan
+    forward = chunked_profile(series, 400)
+    backward = chunked_profile(series[::-1].reset_index(drop=True), 400)
+
+    for profile in (forward, backward):
+        assert profile.nulls == 100 and profile.count == 2900
+        assert profile.skew == pytest.approx(series.skew(), rel=1e-9)
+        assert profile.quantile(0.5) == pytest.approx(series.quantile(0.5), rel=1e-12)
+    assert forward.m3 == pytest.approx(backward.m3, rel=1e-9)
+
+def test_binned_quantiles_stay_close_to_pandas():
+    rng = np.random.default_rng(2)
+    series = pd.Series(rng.normal(100, 15, 20000))
+    profile = chunked_profile(series, 3000, quantile_bins=256)
+    assert not profile.exact
+    # Moments do not depend on the bins
+    assert profile.skew == pytest.approx(series.skew(), rel=1e-9)
+    for q in [0.05, 0.25, 0.5, 0.75, 0.95]:
+        assert profile.quantile(q) == pytest.approx(series.quantile(q), abs=0.5)
+
+def test_profile_frame_matches_single_chunk():
+    df = pd.DataFrame({"lead time": np.arange(1000) % 97, "room type": ["Room_Type 1", "Room_Type 2"] * 500})
+    profiler = DataProfiler({"data_profile": {"chunk_size": 64}})
+    chunked = profiler.profile_frame(df)
+    full = DataProfiler({"data_profile": {"chunk_size": 10 ** 6}}).profile_frame(df)
+    chunked, full = chunked.summary(), full.summary()
+    assert chunked["room type"] == full["room type"]
+    numeric, expected = chunked["lead time"], full["lead time"]
+    assert numeric.pop("quantiles") == pytest.approx(expected.pop("quantiles"), rel=1e-12)
+    assert numeric == pytest.approx(expected, rel=1e-9)
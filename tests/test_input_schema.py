@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from config.input_schema import INPUT_SCHEMA
+from src.feature_encoder import FeatureEncoder
+from src.input_schema import SchemaValidator, InputValidationError
+
+FEATURES = ["lead time", "car parking space", "repeated", "room type", "average price"]
+
+def fitted_encoder(df):
+    encoder = FeatureEncoder(["car parking space", "repeated", "room type"],
+                             ["lead time", "average price", "repeated"], skew_threshold=5)
+    encoder.fit(df)
+    encoder.set_features(FEATURES)
+    return encoder
+
+def test_integer_categories_use_the_encoder_code_table():
+    # Only 1 was seen for car parking space, so 1 encodes as code 0 and 0 as unknown
+    df = pd.DataFrame({
+        "lead time": [10, 20, 30], "car parking space": [1, 1, 1], "repeated": [0, 1, 0],
+        "room type": ["Room_Type 4", "Room_Type 1", "Room_Type 4"], "average price": [80.0, 95.5, 120.0]
+    })
+    encoder = fitted_encoder(df)
+    validator = SchemaValidator(INPUT_SCHEMA, encoder)
+
+    row = validator.encode({"lead time": 5, "car parking space": "1", "repeated": 1,
+                            "room type": "Room_Type 1", "average price": 99})[0]
+    np.testing.assert_array_equal(row, [5, 0, 1, 0, 99])
+    assert validator.encode({"lead time": 5, "car parking space": 0, "repeated": 0,
+                             "room type": "Room_Type 7", "average price": 99})[0].tolist() == [5, -1, 0, -1, 99]
+
+def test_validator_matches_transform_and_encode_record():
+    df = pd.DataFrame({
+        "lead time": [0, 3, 7, 400, 2, 1], "car parking space": [0, 1, 0, 0, 1, 0], "repeated": [0, 0, 0, 1, 0, 0],
+        "room type": ["Room_Type 1", "Room_Type 2", "Room_Type 1", "Room_Type 6", "Room_Type 1", "Room_Type 2"],
+        "average price": [50.0, 60.0, 70.0, 80.0, 90.0, 100.0]
+    })
+    encoder = fitted_encoder(df)
+    validator = SchemaValidator(INPUT_SCHEMA, encoder)
+    records = df.to_dict("records")
+
+    expected = encoder.transform(df)[FEATURES].to_numpy(dtype=float)
+    features, valid_rows, errors = validator.encode_batch(records)
+    assert not errors and valid_rows == list(range(len(records)))
+    np.testing.assert_allclose(features, expected)
+    np.testing.assert_allclose([encoder.encode_record(r) for r in records], expected)
+
+def test_out_of_range_flag_is_rejected_before_lookup():
+    df = pd.DataFrame({"lead time": [1, 2, 3], "car parking space": [0, 1, 0], "repeated": [0, 1, 0],
+                       "room type": ["Room_Type 1"] * 3, "average price": [1.0, 2.0, 3.0]})
+    validator = SchemaValidator(INPUT_SCHEMA, fitted_encoder(df))
+    with pytest.raises(InputValidationError) as e:
+        validator.encode({"lead time": 1, "car parking space": 2, "repeated": 0,
+                          "room type": "Room_Type 1", "average price": 1})
+    assert e.value.errors == {"car parking space": "must be <= 1"}
@@ -0,0 +1,46 @@
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import logging
+from src.logger import SamplingFilter
+
+def test_sampling_decides_once_per_record_across_handlers():
+    sampling = SamplingFilter(rate_limits={"werkzeug": 10})
+    sinks = [io.StringIO(), io.StringIO()]
+    logger = logging.getLogger("werkzeug.test_sampling")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handlers = [logging.StreamHandler(sink) for sink in sinks]
+    for handler in handlers:
+        handler.addFilter(sampling)
+        logger.addHandler(handler)
+    try:
+        for i in range(100):
+            logger.info(f"request {i}")
+    finally:
+        for handler in handlers:
+            logger.removeHandler(handler)
+
+    first, second = (sink.getvalue().splitlines() for sink in sinks)
+    assert len(first) == 10 and first == second
+    assert sampling.dropped == {"werkzeug.test_sampling": 90}
+
+def test_rate_limit_holds_under_concurrent_threads():
+    sampling = SamplingFilter(rate_limits={"werkzeug": 50})
+    records = [logging.LogRecord("werkzeug", logging.INFO, "", 0, "request", None, None) for _ in range(8000)]
+    barrier = threading.Barrier(8)
+
+    def decide(chunk):
+        barrier.wait()
+        return sum(sampling.filter(record) for record in chunk)
+
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            kept = sum(pool.map(decide, [records[i::8] for i in range(8)]))
+    finally:
+        sys.setswitchinterval(0.005)
+    # Every record lands in one or two one-second windows
+    assert kept <= 100
+    assert kept + sampling.dropped_counts()["werkzeug"] == len(records)
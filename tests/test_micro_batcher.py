@@ -0,0 +1,39 @@
+import asyncio
+import threading
+import pytest
+from src.micro_batcher import MicroBatcher
+
+def test_submit_starts_the_batcher_without_lifespan():
+    batcher = MicroBatcher(lambda items: [item * 2 for item in items], max_wait_ms=1)
+
+    async def requests():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    # Each asyncio.run is a new event loop, as TestClient without a with block uses
+    assert asyncio.run(requests()) == [i * 2 for i in range(10)]
+    assert asyncio.run(requests()) == [i * 2 for i in range(10)]
+    assert batcher.items == 20
+
+def test_stop_fails_queued_and_in_flight_requests():
+    release = threading.Event()
+
+    def slow_batch(items):
+        release.wait(5)
+        return items
+
+    batcher = MicroBatcher(slow_batch, max_batch_size=2, max_wait_ms=1)
+
+    async def scenario():
+        batcher.start()
+        tasks = [asyncio.ensure_future(batcher.submit(i)) for i in range(5)]
+        # Let the first batch reach the worker thread
+        await asyncio.sleep(0.05)
+        stopping = asyncio.ensure_future(batcher.stop())
+        await asyncio.sleep(0.05)
+        release.set()
+        await stopping
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 1)
+
+    results = asyncio.run(scenario())
+    assert len(results) == 5
+    assert all(isinstance(result, RuntimeError) for result in results)
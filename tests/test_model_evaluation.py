@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+import pytest
+from src.model_evaluation import ModelEvaluator
+
+class FixedScores:
+    """Classifier stand-in returning preset P(class 1) per row."""
+    classes_ = np.array([0, 1])
+
+    def __init__(self, p1):
+        self.p1 = np.asarray(p1, dtype=float)
+
+    def predict_proba(self, X):
+        p1 = self.p1[X.index.to_numpy()]
+        return np.column_stack([1 - p1, p1])
+
+def test_metrics_are_named_after_the_class_they_score(tmp_path):
+    # Encoded 0 = Canceled (the positive label), 1 = Not_Canceled
+    encoder = SimpleNamespace(target_classes=["Canceled", "Not_Canceled"])
+    y = np.array([0, 0, 0, 1, 1, 1, 1, 1])
+    model = FixedScores([0.1, 0.2, 0.7, 0.9, 0.8, 0.3, 0.6, 0.9])
+    X = pd.DataFrame({"x": np.zeros(len(y))})
+    evaluator = ModelEvaluator()
+    report = evaluator.evaluate(model, X, y, encoder=encoder)
+    metrics, classes = report["metrics"], report["metric_classes"]
+
+    assert "precision" not in metrics and "recall" not in metrics
+    # Argmax: Canceled predicted for rows 0, 1, 5
+    assert metrics["not_canceled_precision"] == pytest.approx(4 / 5)
+    assert metrics["not_canceled_recall"] == pytest.approx(4 / 5)
+    assert metrics["canceled_precision"] == pytest.approx(2 / 3)
+    assert metrics["canceled_recall"] == pytest.approx(2 / 3)
+    # No validation rows: the 0.5 threshold flags the same rows as argmax
+    assert metrics["threshold_recall"] == pytest.approx(metrics["canceled_recall"])
+    assert classes["not_canceled_recall"] == "Not_Canceled"
+    assert classes["canceled_recall"] == classes["threshold_recall"] == classes["decision_threshold"] == "Canceled"
+    assert "accuracy" not in classes
+
+    evaluator.save_report(report, str(tmp_path))
+    summary = pd.read_json(tmp_path / "summary.json", typ="series")
+    assert summary["metric_classes"]["threshold_precision"] == "Canceled"
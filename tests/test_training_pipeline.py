@@ -0,0 +1,42 @@
+import ast
+import os
+import sys
+import pytest
+from pipeline.training_pipeline import STAGES, SHARED_CODE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Only logging and error wrapping, nothing a stage's outputs depend on
+NOT_FINGERPRINTED = {"src/logger.py", "src/custom_exception.py"}
+
+def repo_imports(path):
+    with open(os.path.join(ROOT, path)) as f:
+        tree = ast.parse(f.read())
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module:
+            names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+        elif isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        else:
+            continue
+        for name in names:
+            file_path = name.replace(".", "/") + ".py"
+            if name.split(".")[0] in ("src", "config", "utils") and os.path.exists(os.path.join(ROOT, file_path)):
+                modules.add(file_path)
+    return modules
+
+def closure(path):
+    seen, todo = set(), [path]
+    while todo:
+        current = todo.pop()
+        if current not in seen:
+            seen.add(current)
+            todo.extend(repo_imports(current))
+    return seen
+
+@pytest.mark.parametrize("name", list(STAGES))
+def test_stage_code_covers_every_module_it_imports(name):
+    stage = STAGES[name]
+    module = sys.modules[stage["component"].__module__].__file__
+    imported = closure(os.path.relpath(module, ROOT)) - NOT_FINGERPRINTED
+    assert imported - set(stage["code"] + SHARED_CODE) == set()
@@ -1,5 +1,8 @@
 import os
 import sys
+import json
+import shutil
+import numpy as np
 import pandas as pd
 import yaml
 from src.logger import get_logger
@@ -19,13 +22,351 @@ def read_yaml(file_path):
         logger.error(f"Error while reading config file: {e}")
         raise CustomException(e, sys)
 
-def load_data(file_path):
+NPY_META_FILE = "columns.json"
+
+def _data_format(file_path):
+    ext = os.path.splitext(file_path)[1].lower()
+    formats = {".csv": "csv", ".parquet": "parquet", ".feather": "feather", ".npy": "npy"}
+    if ext not in formats:
+        raise Exception(f"Unsupported data file extension: {file_path}")
+    return formats[ext]
+
+def _save_npy(df, dir_path):
+    # One .npy per column; string columns are stored as integer codes plus
+    # their categories so every file stays memory-mappable
+    if os.path.isdir(dir_path):
+        shutil.rmtree(dir_path)
+    os.makedirs(dir_path)
+    columns = []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        entry = {"name": col, "file": f"{i}.npy"}
+        if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(series.dtype):
+            categorical = pd.Categorical(series)
+            entry["categories"] = categorical.categories.tolist()
+            values = categorical.codes
+        else:
+            values = series.to_numpy()
+        entry["dtype"] = str(series.dtype)
+        np.save(os.path.join(dir_path, entry["file"]), values)
+        columns.append(entry)
+    with open(os.path.join(dir_path, NPY_META_FILE), "w") as f:
+        json.dump({"rows": len(df), "columns": columns}, f)
+
+def _load_npy(dir_path, columns=None, mmap=True):
+    with open(os.path.join(dir_path, NPY_META_FILE), "r") as f:
+        meta = json.load(f)
+    data = {}
+    for entry in meta["columns"]:
+        if columns is not None and entry["name"] not in columns:
+            continue
+        values = np.load(os.path.join(dir_path, entry["file"]), mmap_mode="r" if mmap else None)
+        if "categories" in entry:
+            # Text columns are decoded from their codes, so they cannot stay mapped
+            values = pd.Categorical.from_codes(values, categories=entry["categories"])
+            if entry["dtype"] != "category":
+                values = np.asarray(values, dtype=object)
+        data[entry["name"]] = values
+    # copy=False keeps numeric columns as views of the (read-only) memory maps
+    return pd.DataFrame(data, copy=False)
+
+def load_data(file_path, columns=None):
     try:
         if not os.path.exists(file_path):
             raise Exception(f"File not found: {file_path}")
-        df = pd.read_csv(file_path)
+        data_format = _data_format(file_path)
+        if data_format == "parquet":
+            df = pd.read_parquet(file_path, columns=columns)
+        elif data_format == "feather":
+            df = pd.read_feather(file_path, columns=columns)
+        elif data_format == "npy":
+            df = _load_npy(file_path, columns=columns)
+        else:
+            df = pd.read_csv(file_path, usecols=columns)
         logger.info(f"Data loaded successfully from {file_path}")
         return df
     except Exception as e:
         logger.error(f"Error while loading data from {file_path}: {e}")
         raise CustomException(e, sys)
+
+def iter_data_chunks(file_path, chunk_size, columns=None):
+    """Yields a data artifact as DataFrames of at most chunk_size rows, never loading it whole."""
+    try:
+        if not os.path.exists(file_path):
+            raise Exception(f"File not found: {file_path}")
+        data_format = _data_format(file_path)
+        if data_format == "csv":
+            yield from pd.read_csv(file_path, chunksize=chunk_size, usecols=columns)
+        elif data_format == "parquet":
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size, columns=columns):
+                yield batch.to_pandas()
+        elif data_format == "feather":
+            import pyarrow as pa
+            reader = pa.ipc.open_file(pa.memory_map(file_path, "r"))
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for start in range(0, batch.num_rows, chunk_size):
+                    yield batch.slice(start, chunk_size).to_pandas()
+        else:
+            df = _load_npy(file_path, columns=columns)
+            for start in range(0, len(df), chunk_size):
+                yield df.iloc[start:start + chunk_size]
+    except Exception as e:
+        logger.error(f"Error while reading chunks from {file_path}: {e}")
+        raise CustomException(e, sys)
+
+def save_data(df, file_path):
+    try:
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        data_format = _data_format(file_path)
+        if data_format == "parquet":
+            df.to_parquet(file_path, index=False)
+        elif data_format == "feather":
+            df.reset_index(drop=True).to_feather(file_path)
+        elif data_format == "npy":
+            _save_npy(df, file_path)
+        else:
+            df.to_csv(file_path, index=False)
+        logger.info(f"Data saved successfully to {file_path}")
+    except Exception as e:
+        logger.error(f"Error while saving data to {file_path}: {e}")
+        raise CustomException(e, sys)
+
+def _common_dtype(a, b):
+    """Smallest dtype both can be stored as (object when they do not mix, e.g. numbers and text)."""
+    try:
+        return np.result_type(a, b)
+    except TypeError:
+        return np.dtype(object)
+
+def _text_code(codes, value):
+    # -1 is the Categorical code for a missing value, as in _save_npy
+    if value is None or value != value:
+        return -1
+    return codes.setdefault(value, len(codes))
+
+class ChunkedDataWriter:
+    """
+    Appends DataFrame chunks to one artifact in any supported format, so
+    large splits can be written incrementally with bounded memory.
+    Column dtypes are promoted to what the chunks have in common (an int
+    column that later holds NaN becomes float, as pd.concat would make it),
+    rewriting the rows already written when the stored type has to widen.
+    """
+    COPY_BLOCK_ROWS = 1_000_000
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.data_format = _data_format(file_path)
+        self.rows = 0
+        self._dtypes = None
+        self._writer = None
+        self._schema = None
+        self._npy_columns = None
+        # First chunk when it is empty, written on close if nothing else comes
+        self._empty = None
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        if os.path.isdir(file_path):
+            shutil.rmtree(file_path)
+        elif os.path.exists(file_path):
+            os.remove(file_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, df):
+        try:
+            if len(df) == 0:
+                # Empty chunks carry no values to type the columns by
+                if self._dtypes is None and self._empty is None:
+                    self._empty = df
+                return
+            if self._dtypes is None:
+                self._dtypes = df.dtypes
+            else:
+                df = self._conform(df)
+            self._write_chunk(df)
+        except Exception as e:
+            logger.error(f"Error while writing chunk to {self.file_path}: {e}")
+            raise CustomException(e, sys)
+
+    def _conform(self, df):
+        promoted = {}
+        for col in df.columns:
+            written = self._dtypes[col]
+            if df[col].dtype != written:
+                common = _common_dtype(written, df[col].dtype)
+                if common != written:
+                    promoted[col] = common
+        if promoted:
+            logger.info(f"Promoting {promoted} in {self.file_path}")
+            self._promote(promoted)
+            dtypes = self._dtypes.copy()
+            for col, dtype in promoted.items():
+                dtypes[col] = dtype
+            self._dtypes = dtypes
+        df = df.copy()
+        for col in df.columns:
+            dtype = self._dtypes[col]
+            if df[col].dtype == dtype:
+                continue
+            if dtype == object:
+                # Numbers in a text column are stored as their text
+                df[col] = df[col].astype(str).where(df[col].notna(), None)
+            else:
+                df[col] = df[col].astype(dtype)
+        return df
+
+    def _promote(self, promoted):
+        if self.data_format in ("parquet", "feather"):
+            self._promote_arrow(promoted)
+        elif self.data_format == "npy":
+            self._promote_npy(promoted)
+
+    def _promote_arrow(self, promoted):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = self._schema
+        for col, dtype in promoted.items():
+            arrow_type = pa.string() if dtype == object else pa.from_numpy_dtype(dtype)
+            i = schema.get_field_index(col)
+            schema = schema.set(i, schema.field(i).with_type(arrow_type))
+        self._writer.close()
+        old_path = f"{self.file_path}.promote"
+        os.replace(self.file_path, old_path)
+        self._schema = schema
+        self._writer = self._open_arrow_writer()
+        if self.data_format == "parquet":
+            batches = pq.ParquetFile(old_path).iter_batches(batch_size=self.COPY_BLOCK_ROWS)
+        else:
+            reader = pa.ipc.open_file(pa.memory_map(old_path, "r"))
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        for batch in batches:
+            self._writer.write_table(pa.Table.from_batches([batch]).cast(schema))
+        os.remove(old_path)
+
+    def _promote_npy(self, promoted):
+        for entry in self._npy_columns:
+            if entry["name"] not in promoted:
+                continue
+            dtype = promoted[entry["name"]]
+            part_path = os.path.join(self.file_path, entry["file"] + ".part")
+            old_path = f"{part_path}.promote"
+            os.replace(part_path, old_path)
+            codes = {} if dtype == object else None
+            with open(part_path, "ab") as f:
+                for start in range(0, self.rows, self.COPY_BLOCK_ROWS):
+                    count = min(self.COPY_BLOCK_ROWS, self.rows - start)
+                    values = np.fromfile(old_path, dtype=entry["array_dtype"], count=count,
+                                         offset=start * entry["array_dtype"].itemsize)
+                    if codes is not None:
+                        values = np.fromiter((_text_code(codes, None if v != v else str(v)) for v in values.tolist()),
+                                             dtype=np.int32, count=count)
+                    else:
+                        values = values.astype(dtype)
+                    f.write(np.ascontiguousarray(values).tobytes())
+            os.remove(old_path)
+            entry["dtype"] = str(dtype)
+            entry["codes"] = codes
+            entry["array_dtype"] = np.dtype(np.int32) if codes is not None else np.dtype(dtype)
+
+    def _write_chunk(self, df):
+        if self.data_format == "csv":
+            df.to_csv(self.file_path, mode="a", header=self.rows == 0, index=False)
+        elif self.data_format in ("parquet", "feather"):
+            self._write_arrow(df)
+        else:
+            self._write_npy(df)
+        self.rows += len(df)
+
+    def _open_arrow_writer(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if self.data_format == "parquet":
+            return pq.ParquetWriter(self.file_path, self._schema)
+        # Feather v2 is the Arrow IPC file format, which can be streamed
+        return pa.ipc.new_file(self.file_path, self._schema)
+
+    def _write_arrow(self, df):
+        import pyarrow as pa
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._open_arrow_writer()
+        else:
+            table = table.cast(self._schema)
+        self._writer.write_table(table)
+
+    def _write_npy(self, df):
+        if self._npy_columns is None:
+            os.makedirs(self.file_path)
+            self._npy_columns = []
+            for i, col in enumerate(df.columns):
+                series = df[col]
+                is_text = series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+                self._npy_columns.append({
+                    "name": col,
+                    "file": f"{i}.npy",
+                    "dtype": str(series.dtype),
+                    "codes": {} if is_text else None,
+                    "array_dtype": np.dtype(np.int32) if is_text else series.to_numpy().dtype
+                })
+        for entry in self._npy_columns:
+            series = df[entry["name"]]
+            if entry["codes"] is not None:
+                codes = entry["codes"]
+                values = np.fromiter((_text_code(codes, v) for v in series), dtype=np.int32, count=len(series))
+            else:
+                values = series.to_numpy().astype(entry["array_dtype"], copy=False)
+            with open(os.path.join(self.file_path, entry["file"] + ".part"), "ab") as f:
+                f.write(np.ascontiguousarray(values).tobytes())
+
+    def _finish_npy(self):
+        if self._npy_columns is None:
+            return
+        columns = []
+        for entry in self._npy_columns:
+            part_path = os.path.join(self.file_path, entry["file"] + ".part")
+            out = np.lib.format.open_memmap(
+                os.path.join(self.file_path, entry["file"]), mode="w+",
+                dtype=entry["array_dtype"], shape=(self.rows,)
+            )
+            # Copy the raw column into the .npy file in blocks
+            for start in range(0, self.rows, self.COPY_BLOCK_ROWS):
+                count = min(self.COPY_BLOCK_ROWS, self.rows - start)
+                out[start:start + count] = np.fromfile(
+                    part_path, dtype=entry["array_dtype"], count=count,
+                    offset=start * entry["array_dtype"].itemsize
+                )
+            out.flush()
+            del out
+            os.remove(part_path)
+            column = {"name": entry["name"], "file": entry["file"], "dtype": entry["dtype"]}
+            if entry["codes"] is not None:
+                column["categories"] = list(entry["codes"])
+            columns.append(column)
+        with open(os.path.join(self.file_path, NPY_META_FILE), "w") as f:
+            json.dump({"rows": self.rows, "columns": columns}, f)
+
+    def close(self):
+        try:
+            if self._dtypes is None and self._empty is not None:
+                self._dtypes = self._empty.dtypes
+                self._write_chunk(self._empty)
+                self._empty = None
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            elif self.data_format == "npy":
+                self._finish_npy()
+                self._npy_columns = None
+            logger.info(f"Wrote {self.rows} rows to {self.file_path}")
+        except Exception as e:
+            logger.error(f"Error while closing {self.file_path}: {e}")
+            raise CustomException(e, sys)